@@ -0,0 +1,82 @@
+import re
+import unicodedata
+from typing import Dict, List, Tuple
+
+from backend.schemas.place import PLACE_FIELDS, Place
+from backend.utils.geo import haversine_km
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def _name_key(name: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", name or "")
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", stripped.casefold()).split())
+
+
+class DeduplicationAgent:
+    """
+    Collapses the same POI returned by several category searches
+    into one candidate before any per-place enrichment.
+    """
+
+    # Same normalized name within this distance is the same place
+    # even when the provider ids differ
+    MAX_DUPLICATE_DISTANCE_KM = 0.075
+
+    def merge(self, places: List[Place]) -> Tuple[List[Place], int]:
+        """
+        Returns (unique places in first-seen order, duplicates merged).
+        The first copy is kept; later copies contribute their
+        categories and fill any fields the first one lacks.
+        """
+        unique: List[Place] = []
+        by_id: Dict[str, Place] = {}
+        by_name: Dict[str, List[Place]] = {}
+        merged = 0
+
+        for place in places:
+            place_id = place.place_id
+            name_key = _name_key(place.name)
+
+            kept = by_id.get(place_id) if place_id else None
+            if kept is None and name_key:
+                kept = next(
+                    (
+                        other for other in by_name.get(name_key, [])
+                        if haversine_km(
+                            place.latitude, place.longitude,
+                            other.latitude, other.longitude
+                        ) <= self.MAX_DUPLICATE_DISTANCE_KM
+                    ),
+                    None
+                )
+
+            if kept is not None:
+                self._absorb(kept, place)
+                if place_id:
+                    by_id.setdefault(place_id, kept)
+                merged += 1
+                continue
+
+            unique.append(place)
+            if place_id:
+                by_id[place_id] = place
+            if name_key:
+                by_name.setdefault(name_key, []).append(place)
+
+        return unique, merged
+
+    @staticmethod
+    def _absorb(kept: Place, duplicate: Place):
+        categories = list(kept.categories or [])
+        for category in duplicate.categories or []:
+            if category not in categories:
+                categories.append(category)
+        kept.categories = categories
+
+        for field in PLACE_FIELDS:
+            if getattr(kept, field) is None:
+                value = getattr(duplicate, field)
+                if value is not None:
+                    setattr(kept, field, value)
@@ -1,5 +1,20 @@
-from typing import Dict, Optional, List
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Optional, Union
+from backend.schemas.place import Place
 from backend.schemas.user_intent import UserIntent
+from backend.schemas.visited import VisitedSet
+
+
+@dataclass(frozen=True)
+class ExplanationContext:
+    """
+    Per-request inputs to explanations, built once and shared by
+    every place explained for that request.
+    """
+    visited: VisitedSet = VisitedSet()
+    descriptor_fragment: Optional[str] = None
+    affinity: Dict[str, float] = field(default_factory=dict)
+
 
 class ExplanationAgent:
     """
@@ -7,33 +22,51 @@ class ExplanationAgent:
     grounded in intent, place attributes, and user preferences.
     """
 
-    def generate_explanation(
+    def build_context(
         self,
-        place: Dict,
         intent: UserIntent,
         user_preferences: Optional[Dict] = None,
-        visited_places: Optional[List[str]] = None
-    ) -> str:
+        visited_places: Optional[Union[VisitedSet, Iterable[str]]] = None
+    ) -> ExplanationContext:
+        descriptor_fragment = None
+        if intent.descriptors:
+            descriptor_fragment = f"it matches your preference for {', '.join(intent.descriptors[:2])}"
+
+        affinity = {}
+        if user_preferences and "place_type_affinity" in user_preferences:
+            affinity = dict(user_preferences["place_type_affinity"] or {})
+
+        # Plain name lists are the legacy preferences["visited_places"]
+        if not isinstance(visited_places, VisitedSet):
+            visited_places = VisitedSet().with_names(visited_places)
+
+        return ExplanationContext(
+            visited=visited_places,
+            descriptor_fragment=descriptor_fragment,
+            affinity=affinity
+        )
+
+    def explain(self, place: Place, context: ExplanationContext) -> str:
         parts = []
 
         # Unique place check
-        if visited_places and place["name"] in visited_places:
+        if place in context.visited:
             parts.append("you have already visited this place before")
         else:
             parts.append("this is a new place you haven't been to yet")
 
         # Travel time
-        travel_time = place.get("travel_time")
+        travel_time = place.travel_time
         if travel_time is not None:
             parts.append(f"it is about {travel_time} minutes away considering traffic")
 
         # Rating
-        rating = place.get("rating")
+        rating = place.rating
         if rating:
             parts.append(f"it has a rating of {rating}")
 
         # Crowd
-        crowd = place.get("crowd_level")
+        crowd = place.crowd_level
         if crowd == "low":
             parts.append("it is usually quiet at this time")
         elif crowd == "medium":
@@ -42,12 +75,24 @@ class ExplanationAgent:
             parts.append("it can be crowded right now")
 
         # Preference alignment
-        if intent.descriptors:
-            parts.append(f"it matches your preference for {', '.join(intent.descriptors[:2])}")
+        if context.descriptor_fragment:
+            parts.append(context.descriptor_fragment)
 
-        if user_preferences and "place_type_affinity" in user_preferences:
-            affinity = user_preferences["place_type_affinity"].get(place.get("category"))
-            if affinity:
-                parts.append(f"your affinity for {place['category']} boosted this recommendation")
+        if context.affinity.get(place.category):
+            parts.append(f"your affinity for {place.category} boosted this recommendation")
 
         return "I recommended this place because " + ", ".join(parts) + "."
+
+    def generate_explanation(
+        self,
+        place: Place,
+        intent: UserIntent,
+        user_preferences: Optional[Dict] = None,
+        visited_places: Optional[Union[VisitedSet, Iterable[str]]] = None
+    ) -> str:
+        """
+        One-off explanation; batches should build_context once and
+        call explain per place.
+        """
+        context = self.build_context(intent, user_preferences, visited_places)
+        return self.explain(place, context)
@@ -1,36 +1,69 @@
 import os
 from dotenv import load_dotenv
-from google import genai
+
+from backend.utils.providers import provider
 
 # Load environment variables
 load_dotenv()
 
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 
-if not GEMINI_API_KEY:
-    raise RuntimeError("GEMINI_API_KEY not found in .env")
+def _create_client():
+    """
+    Builds the Gemini client. The SDK import is deferred to here
+    because google.genai is slow to import.
+    """
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY not found in .env")
+
+    from google import genai
+    return genai.Client(api_key=api_key)
+
 
-# Create client
-client = genai.Client(api_key=GEMINI_API_KEY)
+gemini_client = provider("gemini", _create_client)
+
+
+def get_client():
+    return gemini_client.get()
 
 # Supported text model
 MODEL_NAME = "gemini-2.5-flash"
 
+GENERATION_CONFIG = {
+    "temperature": 0.2,
+    "top_p": 0.9,
+    "max_output_tokens": 512,
+    "response_mime_type": "application/json"
+}
+
 def call_gemini(prompt: str) -> str:
     """
     Calls Gemini using the new google.genai SDK
     and enforces JSON-only structured output.
     """
 
-    response = client.models.generate_content(
-        model="gemini-2.5-flash",
+    response = get_client().models.generate_content(
+        model=MODEL_NAME,
+        contents=prompt,
+        config=GENERATION_CONFIG
+    )
+
+    if not response.text:
+        raise RuntimeError("Empty response from Gemini")
+
+    return response.text.strip()
+
+
+async def call_gemini_async(prompt: str) -> str:
+    """
+    Async variant of call_gemini.
+    Uses the SDK's aio surface, which keeps a pooled async HTTP client.
+    """
+
+    response = await get_client().aio.models.generate_content(
+        model=MODEL_NAME,
         contents=prompt,
-        config={
-            "temperature": 0.2,
-            "top_p": 0.9,
-            "max_output_tokens": 512,
-            "response_mime_type": "application/json"
-        }
+        config=GENERATION_CONFIG
     )
 
     if not response.text:
@@ -0,0 +1,261 @@
+"""
+Memoization for IntentExtractionAgent.
+
+Queries are normalized (case-folded, accent-stripped, punctuation and
+stop-words removed) so "Quiet café nearby" and "quiet cafe" share one
+entry. An optional MinHash tier over character 3-grams (off unless
+INTENT_CACHE_SIMILARITY is set) also matches near-duplicate phrasings
+without any embedding model; its hits are confirmed with the exact
+Jaccard and must share every content word and number.
+"""
+import hashlib
+import os
+import random
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
+
+from backend.schemas.user_intent import UserIntent
+from backend.utils.cache import CacheBackend, make_cache
+
+# Function words that never change intent. Negations ("no", "not",
+# "without") are deliberately absent: they flip meaning.
+STOP_WORDS = frozenset({
+    "a", "an", "the", "i", "me", "my", "we", "us", "our", "you",
+    "want", "wanna", "need", "looking", "look", "find", "show", "give",
+    "get", "some", "any", "place", "places", "spot", "somewhere",
+    "please", "for", "to", "of", "in", "at", "on", "with", "and",
+    "is", "are", "be", "can", "could", "would", "like", "let", "go",
+    "nearby", "near", "around", "here"
+})
+
+# Tokens (after normalize_query) that negate what follows. MinHash
+# similarity barely notices them, so "smoking not allowed" and
+# "no smoking allowed" would share an entry: queries containing any
+# of them only use the exact tier.
+NEGATIONS = frozenset({
+    "no", "not", "nor", "never", "none", "without", "non", "cannot",
+    "cant", "dont", "don", "doesn", "isn", "aren", "avoid", "except"
+})
+
+# Words that carry a quantity ("for two", "under 2000")
+NUMBER_WORDS = frozenset({
+    "one", "two", "three", "four", "five", "six", "seven", "eight",
+    "nine", "ten", "dozen", "hundred", "thousand", "lakh", "k"
+})
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def normalize_query(query: str) -> str:
+    """
+    Canonical form of a user query used as the cache key.
+    """
+    decomposed = unicodedata.normalize("NFKD", query)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    tokens = _NON_WORD.sub(" ", stripped.casefold()).split()
+    return " ".join(t for t in tokens if t not in STOP_WORDS)
+
+
+def has_negation(key: str) -> bool:
+    return not NEGATIONS.isdisjoint(key.split())
+
+
+def number_tokens(key: str) -> Set[str]:
+    return {t for t in key.split() if t in NUMBER_WORDS or any(c.isdigit() for c in t)}
+
+
+class MinHashIndex:
+    """
+    LSH index over MinHash signatures of character n-grams.
+    Bounded: the oldest keys are dropped past `maxsize`.
+    """
+
+    _PRIME = (1 << 61) - 1
+
+    def __init__(
+        self,
+        num_perm: int = 64,
+        bands: int = 16,
+        ngram: int = 3,
+        maxsize: int = 4096
+    ):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.ngram = ngram
+        self.maxsize = maxsize
+
+        rng = random.Random(1729)   # fixed so signatures are stable across workers
+        self._perms = [
+            (rng.randrange(1, self._PRIME), rng.randrange(0, self._PRIME))
+            for _ in range(num_perm)
+        ]
+
+        self._signatures: "OrderedDict[str, Tuple[int, ...]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, Tuple[int, ...]], Set[str]] = {}
+        self._lock = threading.Lock()
+
+    def _shingles(self, text: str) -> Set[int]:
+        padded = f" {text} "
+        grams = {
+            padded[i:i + self.ngram]
+            for i in range(max(1, len(padded) - self.ngram + 1))
+        }
+        return {
+            int.from_bytes(hashlib.blake2b(g.encode(), digest_size=8).digest(), "big")
+            for g in grams
+        }
+
+    def signature(self, text: str) -> Tuple[int, ...]:
+        shingles = self._shingles(text)
+        return tuple(
+            min((a * h + b) % self._PRIME for h in shingles)
+            for a, b in self._perms
+        )
+
+    def _band_keys(self, signature: Tuple[int, ...]) -> List[Tuple[int, Tuple[int, ...]]]:
+        return [
+            (band, signature[band * self.rows:(band + 1) * self.rows])
+            for band in range(self.bands)
+        ]
+
+    def add(self, key: str):
+        signature = self.signature(key)
+
+        with self._lock:
+            if key in self._signatures:
+                self._signatures.move_to_end(key)
+                return
+
+            self._signatures[key] = signature
+            for band_key in self._band_keys(signature):
+                self._buckets.setdefault(band_key, set()).add(key)
+
+            while len(self._signatures) > self.maxsize:
+                old_key, old_signature = self._signatures.popitem(last=False)
+                self._remove_locked(old_key, old_signature)
+
+    def remove(self, key: str):
+        with self._lock:
+            signature = self._signatures.pop(key, None)
+            if signature is not None:
+                self._remove_locked(key, signature)
+
+    def _remove_locked(self, key: str, signature: Tuple[int, ...]):
+        for band_key in self._band_keys(signature):
+            bucket = self._buckets.get(band_key)
+            if bucket:
+                bucket.discard(key)
+                if not bucket:
+                    del self._buckets[band_key]
+
+    def jaccard(self, a: str, b: str) -> float:
+        """
+        Exact Jaccard similarity of the two texts' shingle sets.
+        """
+        x, y = self._shingles(a), self._shingles(b)
+        return len(x & y) / len(x | y) if x or y else 1.0
+
+    def most_similar(self, text: str, threshold: float) -> Optional[str]:
+        """
+        Indexed key with the highest estimated Jaccard similarity
+        to `text`, if it reaches `threshold`.
+        """
+        signature = self.signature(text)
+
+        with self._lock:
+            candidates: Set[str] = set()
+            for band_key in self._band_keys(signature):
+                candidates |= self._buckets.get(band_key, set())
+
+            best_key, best_score = None, threshold
+            for candidate in candidates:
+                other = self._signatures[candidate]
+                score = sum(x == y for x, y in zip(signature, other)) / self.num_perm
+                if score >= best_score:
+                    best_key, best_score = candidate, score
+
+        return best_key
+
+
+class IntentCache:
+    """
+    Two-tier cache of extracted intents: exact match on the
+    normalized query, then (optionally) MinHash near-duplicates.
+    Negated queries never take part in the near-duplicate tier, and
+    a near-duplicate only counts if it has the same content words and
+    numbers ("north"/"south indian", "under 2000"/"5000" are misses).
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 4096,
+        ttl_s: float = 6 * 3600,
+        similarity_threshold: Optional[float] = None,
+        backend: Optional[CacheBackend] = None
+    ):
+        self.exact = backend or make_cache("intent", maxsize=maxsize, ttl=ttl_s)
+        self.similarity_threshold = similarity_threshold
+        self.similar = MinHashIndex(maxsize=maxsize) if similarity_threshold else None
+
+        self._lock = threading.Lock()
+        self.similar_hits = 0
+
+    @classmethod
+    def from_env(cls) -> "IntentCache":
+        threshold = float(os.getenv("INTENT_CACHE_SIMILARITY") or 0)
+        return cls(
+            maxsize=int(os.getenv("INTENT_CACHE_SIZE", "4096")),
+            ttl_s=float(os.getenv("INTENT_CACHE_TTL_S", str(6 * 3600))),
+            similarity_threshold=threshold or None
+        )
+
+    def get(self, query: str) -> Optional[UserIntent]:
+        key = normalize_query(query)
+        if not key:
+            return None
+
+        intent = self.exact.get(key)
+
+        if intent is None and self.similar is not None and not has_negation(key):
+            match = self.similar.most_similar(key, self.similarity_threshold)
+            if match is not None and not self._same_request(key, match):
+                match = None
+            if match is not None:
+                intent = self.exact.get(match)
+                if intent is None:
+                    # Expired or evicted from the exact tier
+                    self.similar.remove(match)
+                else:
+                    with self._lock:
+                        self.similar_hits += 1
+
+        return intent.model_copy(deep=True) if intent is not None else None
+
+    def _same_request(self, key: str, match: str) -> bool:
+        # MinHash over 64 permutations is only an estimate (about
+        # +/-0.06 at the threshold); confirm it, then require the
+        # words that change meaning to agree
+        return (
+            number_tokens(key) == number_tokens(match)
+            and set(key.split()) == set(match.split())
+            and self.similar.jaccard(key, match) >= self.similarity_threshold
+        )
+
+    def set(self, query: str, intent: UserIntent):
+        key = normalize_query(query)
+        if not key:
+            return
+
+        self.exact.set(key, intent.model_copy(deep=True))
+        if self.similar is not None and not has_negation(key):
+            self.similar.add(key)
+
+    def stats(self) -> Dict:
+        return {**self.exact.stats.snapshot(), "similar_hits": self.similar_hits}
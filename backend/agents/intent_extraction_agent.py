@@ -1,6 +1,11 @@
+import os
 import re
+import threading
+from typing import Dict, Optional
 from backend.schemas.user_intent import UserIntent
-from backend.agents.gemini_client import call_gemini
+from backend.agents.gemini_client import call_gemini, call_gemini_async
+from backend.agents.intent_cache import IntentCache
+from backend.agents.intent_rules import RuleBasedIntentMatcher
 
 
 def extract_json(text: str) -> str:
@@ -29,10 +34,45 @@ def fallback_intent() -> UserIntent:
     )
 
 
+class IntentPathStats:
+    """
+    Counts which path served each extraction:
+    rules (local matcher), cache, llm, or fallback (LLM output unusable).
+    """
+
+    PATHS = ("rules", "cache", "llm", "fallback")
+
+    def __init__(self):
+        self.counts = {path: 0 for path in self.PATHS}
+        self._lock = threading.Lock()
+
+    def record(self, path: str):
+        with self._lock:
+            self.counts[path] += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            total = sum(self.counts.values())
+            return {
+                "total": total,
+                **{
+                    path: {
+                        "count": count,
+                        "rate": round(count / total, 3) if total else None
+                    }
+                    for path, count in self.counts.items()
+                }
+            }
+
+
+intent_path_stats = IntentPathStats()
+
+
 class IntentExtractionAgent:
     """
     Converts natural language user input into structured intent.
-    This is the ONLY LLM-powered agent in the system.
+    This is the ONLY LLM-powered agent in the system; trivial queries
+    are answered by a local rule matcher before Gemini is considered.
     """
 
     SYSTEM_PROMPT = """
@@ -64,8 +104,28 @@ Rules:
 - Do NOT add explanations, markdown, or comments
 """
 
-    def extract(self, user_query: str) -> UserIntent:
-        prompt = f"""
+    def __init__(
+        self,
+        cache: Optional[IntentCache] = None,
+        use_cache: Optional[bool] = None,
+        rules: Optional[RuleBasedIntentMatcher] = None
+    ):
+        if use_cache is None:
+            use_cache = os.getenv("INTENT_CACHE_ENABLED", "1") != "0"
+
+        # Escalates to the LLM unless the matcher explains enough of
+        # the query; tune INTENT_RULES_THRESHOLD with path_stats.
+        self.rules = rules or RuleBasedIntentMatcher(
+            threshold=float(os.getenv("INTENT_RULES_THRESHOLD", "0.75"))
+        )
+        self.stats = intent_path_stats
+
+        # Successful extractions are memoized on the normalized query;
+        # fallback intents are never cached.
+        self.cache = (cache or IntentCache.from_env()) if use_cache else None
+
+    def build_prompt(self, user_query: str) -> str:
+        return f"""
 {self.SYSTEM_PROMPT}
 
 Return JSON strictly in this format:
@@ -83,8 +143,7 @@ User query:
 "{user_query}"
 """
 
-        raw_output = call_gemini(prompt)
-
+    def _try_parse(self, raw_output: str) -> Optional[UserIntent]:
         try:
             json_text = extract_json(raw_output)
             return UserIntent.model_validate_json(json_text)
@@ -92,4 +151,58 @@ User query:
         except Exception as e:
             # IMPORTANT: never crash the system
             # Log raw_output in real systems
+            return None
+
+    def parse_output(self, raw_output: str) -> UserIntent:
+        return self._try_parse(raw_output) or fallback_intent()
+
+    def _local(self, user_query: str, bypass_cache: bool) -> Optional[UserIntent]:
+        """
+        Rule matcher first, then the cache; None means ask the LLM.
+        """
+        intent = self.rules.extract(user_query)
+        if intent is not None:
+            self.stats.record("rules")
+            return intent
+
+        if self.cache is None or bypass_cache:
+            return None
+
+        intent = self.cache.get(user_query)
+        if intent is not None:
+            self.stats.record("cache")
+        return intent
+
+    def _remember(self, user_query: str, raw_output: str) -> UserIntent:
+        intent = self._try_parse(raw_output)
+        if intent is None:
+            self.stats.record("fallback")
             return fallback_intent()
+
+        self.stats.record("llm")
+        if self.cache is not None:
+            self.cache.set(user_query, intent)
+        return intent
+
+    def extract(self, user_query: str, bypass_cache: bool = False) -> UserIntent:
+        local = self._local(user_query, bypass_cache)
+        if local is not None:
+            return local
+
+        raw_output = call_gemini(self.build_prompt(user_query))
+        return self._remember(user_query, raw_output)
+
+    async def aextract(self, user_query: str, bypass_cache: bool = False) -> UserIntent:
+        """
+        Async variant of extract; does not block the event loop
+        while Gemini is generating.
+        """
+        local = self._local(user_query, bypass_cache)
+        if local is not None:
+            return local
+
+        raw_output = await call_gemini_async(self.build_prompt(user_query))
+        return self._remember(user_query, raw_output)
+
+    def path_stats(self) -> Dict:
+        return self.stats.snapshot()
@@ -0,0 +1,177 @@
+"""
+Deterministic fast path for intent extraction.
+
+Short, unambiguous queries ("cafe", "bar near me", "quiet cafe for
+dinner") are mapped straight to a UserIntent with one compiled regex.
+Anything the rules cannot fully account for is left to the LLM.
+"""
+import re
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+from backend.agents.planner_agent import PlannerAgent
+from backend.schemas.user_intent import UserIntent
+
+# phrase -> place type (must stay inside PlannerAgent.ALLOWED_CATEGORIES)
+CATEGORY_PHRASES: Dict[str, str] = {
+    "cafe": "cafe", "cafes": "cafe", "coffee": "cafe", "coffee shop": "cafe",
+    "espresso": "cafe", "latte": "cafe", "cappuccino": "cafe",
+    "restaurant": "restaurant", "restaurants": "restaurant",
+    "dinner": "restaurant", "lunch": "restaurant", "brunch": "restaurant",
+    "food": "restaurant", "eat": "restaurant", "dine": "restaurant",
+    "bar": "bar", "bars": "bar", "pub": "bar", "pubs": "bar",
+    "drinks": "bar", "beer": "bar", "cocktails": "bar",
+    "lounge": "lounge", "lounges": "lounge",
+    "bakery": "bakery", "bakeries": "bakery", "pastry": "bakery",
+    "pastries": "bakery", "croissant": "bakery", "bread": "bakery",
+    "fast food": "fast_food", "burger": "fast_food", "burgers": "fast_food",
+    "pizza": "fast_food", "fries": "fast_food",
+    "food court": "food_court", "food courts": "food_court",
+    "ice cream": "ice_cream", "gelato": "ice_cream",
+}
+
+# Meal words imply a restaurant only when nothing more specific was
+# named: "cafe for dinner" is a cafe, "dinner" alone is a restaurant
+GENERIC_CATEGORY_PHRASES = frozenset({"dinner", "lunch", "brunch", "food", "eat", "dine"})
+
+# phrase -> time_of_day (values PopularityAgent understands)
+TIME_PHRASES: Dict[str, str] = {
+    "morning": "morning", "breakfast": "morning",
+    "lunch": "lunch", "noon": "lunch",
+    "afternoon": "afternoon",
+    "evening": "evening", "dinner": "evening",
+    "night": "night", "tonight": "night", "late night": "night",
+}
+
+# descriptor phrase -> preference projection
+DESCRIPTOR_PHRASES: Dict[str, Dict[str, float]] = {
+    "quiet": {"crowd_quietness": 0.8},
+    "calm": {"crowd_quietness": 0.8},
+    "peaceful": {"crowd_quietness": 0.8},
+    "not crowded": {"crowd_quietness": 0.8},
+    "not too crowded": {"crowd_quietness": 0.8},
+    "less crowded": {"crowd_quietness": 0.7},
+    "lively": {"crowd_quietness": 0.2},
+    "good food": {"food_quality": 0.8},
+    "great food": {"food_quality": 0.8},
+    "amazing food": {"food_quality": 0.9},
+    "best": {"food_quality": 0.8},
+    "top rated": {"food_quality": 0.8},
+    "highly rated": {"food_quality": 0.8},
+    "close by": {"travel_tolerance": 0.2},
+    "walking distance": {"travel_tolerance": 0.1},
+    "quick": {"travel_tolerance": 0.3},
+}
+
+BOOKING_PHRASES = ("book", "book a table", "reserve", "reservation", "table for")
+
+# Words that carry no intent and may be ignored when measuring coverage
+FILLER_WORDS = frozenset({
+    "a", "an", "the", "i", "me", "my", "we", "us", "our", "want", "need",
+    "looking", "find", "show", "get", "some", "any", "good", "nice",
+    "place", "places", "spot", "somewhere", "please", "for", "to", "of",
+    "in", "at", "on", "with", "and", "or", "is", "are", "near", "nearby",
+    "around", "here", "now", "today", "go", "grab", "have", "this",
+})
+
+NEGATIONS = frozenset({"no", "not", "without", "except", "avoid", "dont", "never"})
+
+_NON_WORD = re.compile(r"[^\w]+")
+
+
+def _normalize(query: str) -> str:
+    decomposed = unicodedata.normalize("NFKD", query)
+    stripped = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(_NON_WORD.sub(" ", stripped.casefold().replace("'", "")).split())
+
+
+class RuleBasedIntentMatcher:
+    """
+    Keyword/phrase matcher producing a UserIntent plus a confidence.
+    Confidence is the share of meaningful tokens the rules explained;
+    a query with no recognised place type never qualifies.
+    """
+
+    def __init__(self, threshold: float = 0.75):
+        self.threshold = threshold
+
+        phrases = (
+            set(CATEGORY_PHRASES) | set(TIME_PHRASES)
+            | set(DESCRIPTOR_PHRASES) | set(BOOKING_PHRASES)
+        )
+        # Longest first so "fast food" wins over "food"
+        alternation = "|".join(
+            re.escape(p) for p in sorted(phrases, key=len, reverse=True)
+        )
+        self._pattern = re.compile(rf"\b(?:{alternation})\b")
+
+        unknown = set(CATEGORY_PHRASES.values()) - PlannerAgent.ALLOWED_CATEGORIES
+        if unknown:
+            raise ValueError(f"Rule categories not allowed by planner: {unknown}")
+
+    def match(self, user_query: str) -> Tuple[Optional[UserIntent], float]:
+        text = _normalize(user_query)
+
+        place_types: List[str] = []
+        generic_types: List[str] = []
+        descriptors: List[str] = []
+        preferences: Dict[str, float] = {}
+        time_of_day: Optional[str] = None
+        booking_required = False
+        covered = [False] * len(text)
+
+        for m in self._pattern.finditer(text):
+            phrase = m.group(0)
+            covered[m.start():m.end()] = [True] * (m.end() - m.start())
+
+            category = CATEGORY_PHRASES.get(phrase)
+            target = generic_types if phrase in GENERIC_CATEGORY_PHRASES else place_types
+            if category and category not in target:
+                target.append(category)
+
+            if phrase in TIME_PHRASES and time_of_day is None:
+                time_of_day = TIME_PHRASES[phrase]
+
+            if phrase in DESCRIPTOR_PHRASES:
+                descriptors.append(phrase)
+                for dim, value in DESCRIPTOR_PHRASES[phrase].items():
+                    preferences[dim] = max(preferences.get(dim, 0.0), value)
+
+            if phrase in BOOKING_PHRASES:
+                booking_required = True
+
+        uncovered = [
+            m.group(0) for m in re.finditer(r"\S+", text)
+            if not covered[m.start()]
+        ]
+
+        # Negations outside a known phrase ("no bars", "not pizza")
+        # change meaning in ways the rules do not model
+        if any(t in NEGATIONS for t in uncovered):
+            return None, 0.0
+
+        place_types = place_types or generic_types
+        meaningful = [t for t in text.split() if t not in FILLER_WORDS]
+        unexplained = [t for t in uncovered if t not in FILLER_WORDS]
+
+        if not place_types or not meaningful:
+            return None, 0.0
+
+        confidence = 1 - len(unexplained) / len(meaningful)
+
+        intent = UserIntent(
+            descriptors=descriptors,
+            preferences=preferences,
+            place_types=place_types,
+            constraints=[],
+            time_of_day=time_of_day,
+            booking_required=booking_required
+        )
+        return intent, confidence
+
+    def extract(self, user_query: str) -> Optional[UserIntent]:
+        """
+        Intent if the rules are confident enough, otherwise None.
+        """
+        intent, confidence = self.match(user_query)
+        return intent if confidence >= self.threshold else None
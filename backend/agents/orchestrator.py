@@ -1,16 +1,124 @@
-from typing import Dict, Optional, List
+import asyncio
+import logging
+import math
+import os
+import threading
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional, List, Set, Tuple, Union
 
+from backend.agents.intent_cache import normalize_query
 from backend.agents.intent_extraction_agent import IntentExtractionAgent
 from backend.agents.planner_agent import PlannerAgent
 from backend.agents.traffic_agent import TrafficAgent
 from backend.agents.popularity_agent import PopularityAgent
 from backend.agents.scoring_agent import ScoringAgent
-from backend.agents.explanation_agent import ExplanationAgent
+from backend.agents.explanation_agent import ExplanationAgent, ExplanationContext
+from backend.agents.deduplication_agent import DeduplicationAgent
+from backend.agents.spatial_filter_agent import SpatialFilterAgent
 
-from backend.mcp_servers.maps_mcp import MapboxMCP
+from backend.mcp_servers.maps_mcp import LatLng, MapboxMCP
+from backend.schemas.place import Place
+from backend.schemas.user_intent import UserIntent
+from backend.schemas.visited import VisitedSet
+from backend.utils.aio import run_sync
+from backend.utils.cache import make_cache
+from backend.utils.singleflight import AsyncSingleFlight
+from backend.utils.tracing import span
 
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from backend.db.crud import get_user_preferences
+from backend.db import async_crud
+from backend.db.crud import get_cached_preferences, get_visited_set
+
+logger = logging.getLogger(__name__)
+
+
+class RankingStats:
+    """
+    How much per-place enrichment branch-and-bound ranking skipped.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.candidates = 0
+        self.enriched = 0
+        self._lock = threading.Lock()
+
+    def record(self, candidates: int, enriched: int):
+        with self._lock:
+            self.requests += 1
+            self.candidates += candidates
+            self.enriched += enriched
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            avoided = self.candidates - self.enriched
+            return {
+                "requests": self.requests,
+                "candidates": self.candidates,
+                "enriched": self.enriched,
+                "enrichment_calls_avoided": avoided,
+                "avoided_rate": round(avoided / self.candidates, 3) if self.candidates else None
+            }
+
+
+ranking_stats = RankingStats()
+
+
+class SharedCandidateSet:
+    """
+    Non-personalized half of a recommendation for one (query, place):
+    intent, plan and the filtered candidates, shared by coalesced
+    requests. Candidates are never re-scored or explained here; the
+    only change they see is routing (travel + traffic), applied at
+    most once per place. Per-user work runs on copies.
+    """
+
+    def __init__(
+        self,
+        intent: UserIntent,
+        plan: Dict,
+        origin: LatLng,
+        candidates: List[Place],
+        timed_out: List[str],
+        duplicates_merged: int,
+        out_of_radius: int,
+        failed: Optional[List[str]] = None
+    ):
+        self.intent = intent
+        self.plan = plan
+        self.origin = origin
+        self.candidates = candidates
+        self.timed_out = timed_out
+        self.failed = failed or []
+        self.duplicates_merged = duplicates_merged
+        self.out_of_radius = out_of_radius
+
+        self._routed: Set[int] = set()
+        self._routing = AsyncSingleFlight()
+
+    async def enrich(
+        self,
+        indices: List[int],
+        route: Callable[[List[Place], LatLng], Awaitable[None]]
+    ):
+        """
+        Routes the candidates at `indices` that nobody has routed yet.
+        Concurrent requests asking for the same places share one call.
+        """
+        pending = [i for i in indices if i not in self._routed]
+        if not pending:
+            return
+
+        async def fetch(owned: List[int]) -> List[None]:
+            await route([self.candidates[i] for i in owned], self.origin)
+            self._routed.update(owned)
+            return [None] * len(owned)
+
+        await self._routing.do_many(pending, fetch)
+
+    def copies(self, indices: List[int]) -> List[Place]:
+        return [self.candidates[i].copy() for i in indices]
+
 
 class OrchestratorAgent:
     """
@@ -18,105 +126,577 @@ class OrchestratorAgent:
     to produce final recommendations.
     """
 
-    def __init__(self):
+    MAX_RESULTS = 10
+
+    # Largest page a caller may ask for (offset/limit paging)
+    MAX_PAGE_SIZE = 50
+
+    RANKING_MODES = ("bound", "exhaustive")
+
+    # Rounds span whole matrix requests (one chunk costs the same
+    # latency half full), and the maps client sends a round's chunks
+    # concurrently: the first round covers k, later ones this many
+    ENRICH_BATCH_SIZE = MapboxMCP.MATRIX_MAX_DESTINATIONS
+    ENRICH_ROUND_CHUNKS = 2
+
+    # Identical requests (same normalized query, origin within ~110 m)
+    # share one candidate set while in flight and for this long after
+    COALESCE_WINDOW_S = float(os.getenv("RECOMMEND_COALESCE_WINDOW_S", "2"))
+    COALESCE_PRECISION = 3
+
+    def __init__(
+        self,
+        search_concurrency: int = 4,
+        search_deadline_s: float = 6.0,
+        ranking_mode: Optional[str] = None
+    ):
         self.intent_agent = IntentExtractionAgent()
         self.maps = MapboxMCP()
 
+        # Per-category searches fan out concurrently, at most
+        # search_concurrency at a time; the deadline covers the
+        # whole search stage, not each call.
+        self.search_concurrency = search_concurrency
+        self.search_deadline_s = search_deadline_s
+
+        # "exhaustive" enriches everything in one concurrent round.
+        # "bound" enriches in upper-bound order and stops once nothing
+        # left can reach the top k: fewer matrix calls, in sequential
+        # rounds, so it pays off only when bounds differ (ratings, crowd,
+        # affinity) and quota matters more than latency.
+        self.ranking_mode = ranking_mode or os.getenv("RANKING_MODE", "exhaustive")
+        if self.ranking_mode not in self.RANKING_MODES:
+            raise ValueError(f"Unknown ranking mode: {self.ranking_mode}")
+
         self.planner = PlannerAgent()
+        self.dedup = DeduplicationAgent()
+        self.spatial = SpatialFilterAgent()
         self.traffic = TrafficAgent()
         self.popularity = PopularityAgent()
         self.scoring = ScoringAgent()
         self.explainer = ExplanationAgent()
 
+        self._plan_flight = AsyncSingleFlight("recommend_plans")
+        self._recent_plans = make_cache(
+            "recommend_plans",
+            maxsize=256,
+            ttl=self.COALESCE_WINDOW_S,
+            shared=False
+        )
+        self._candidate_flight = AsyncSingleFlight("recommend_candidates")
+        self._recent_candidates = make_cache(
+            "recommend_candidates",
+            maxsize=256,
+            ttl=self.COALESCE_WINDOW_S,
+            shared=False
+        )
+
     def get_recommendations(
         self,
         user_query: str,
         latitude: float,
         longitude: float,
         db: Session,
-        user_id: Optional[str] = None
+        user_id: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+        ) -> Dict:
+        """
+        Sync entry point for scripts and sync callers.
+        Thin wrapper over aget_recommendations.
+        """
+        return run_sync(
+            self.aget_recommendations(
+                user_query=user_query,
+                latitude=latitude,
+                longitude=longitude,
+                db=db,
+                user_id=user_id,
+                offset=offset,
+                limit=limit
+            )
+        )
+
+    async def aget_recommendations(
+        self,
+        user_query: str,
+        latitude: float,
+        longitude: float,
+        db: Union[AsyncSession, Session],
+        user_id: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
         ) -> Dict:
+        """
+        Ranked results[offset:offset + limit] (MAX_RESULTS by default).
+        Only that page is routed as far as ranking needs and explained;
+        a later page is a follow-up call that reuses the coalesced
+        candidate set while it is still fresh.
+        """
+        offset, limit = self._page(offset, limit)
+
+        # 1️⃣ + 3️⃣ + 4️⃣ Shared stages (coalesced), alongside 2️⃣
+        shared, (user_preferences, visited) = await asyncio.gather(
+            self._shared_candidates(user_query, latitude, longitude),
+            self._load_user(db, user_id)
+        )
 
+        # 5️⃣ Filter out visited places (memory-based personalization)
+        visited, new_indices = self._unvisited(shared, user_preferences, visited)
 
-        # 1️⃣ Natural language → structured intent
-        intent = self.intent_agent.extract(user_query)
+        # 6️⃣ Enrich (travel + traffic), as far as ranking needs
+        enriched: List[int] = []
+        async for enriched, _ in self._routing_rounds(
+            shared, new_indices, user_preferences, k=offset + limit
+        ):
+            pass
 
-        # 2️⃣ Load user preferences (from DB)
-        user_preferences = None
-        if user_id:
-            pref_record = get_user_preferences(db, user_id)
-            if pref_record:
-                user_preferences = pref_record.preferences
+        # 7️⃣ Score and rank, then 8️⃣ explain the returned page only
+        page = self._rank_page(shared, new_indices, enriched, user_preferences, offset, limit)
+        self._explain(page, self.explainer.build_context(shared.intent, user_preferences, visited))
 
-        visited_places = user_preferences.get("visited_places", []) if user_preferences else []
+        return self._summary(shared, user_preferences, new_indices, enriched, page, offset, limit)
 
-        # 3️⃣ Planner decides search strategy
-        plan = self.planner.create_plan(
-            intent=intent,
-            latitude=latitude,
-            longitude=longitude
+    async def astream_recommendations(
+        self,
+        user_query: str,
+        latitude: float,
+        longitude: float,
+        db: Union[AsyncSession, Session],
+        user_id: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None
+    ) -> AsyncIterator[Dict]:
+        """
+        Same pipeline as aget_recommendations, yielded as it goes:
+          plan        - parsed intent and search strategy
+          provisional - top results scored before any routing
+          update      - re-ranked as travel-time rounds come back
+          final       - the aget_recommendations response
+        """
+        offset, limit = self._page(offset, limit)
+
+        # 1️⃣ + 3️⃣ Intent and plan first
+        intent, plan = await self._shared_plan(user_query, latitude, longitude)
+        yield {"event": "plan", "intent": intent.model_dump(), "strategy_used": dict(plan)}
+
+        # 4️⃣ Search (alongside 2️⃣ preferences)
+        shared, (user_preferences, visited) = await asyncio.gather(
+            self._shared_candidates(user_query, latitude, longitude, planned=(intent, plan)),
+            self._load_user(db, user_id)
         )
 
-        all_places: List[Dict] = []
+        # 5️⃣ Visited filter
+        visited, new_indices = self._unvisited(shared, user_preferences, visited)
 
-        # 4️⃣ Fetch places via Maps MCP
-        for category in plan["place_types"]:
-            places = self.maps.search_places(
-                lat=latitude,
-                lng=longitude,
-                category=category,
-                limit=10
-            )
-            all_places.extend(places)
+        yield {
+            "event": "provisional",
+            "results": self.scoring.rank_places(
+                shared.copies(new_indices),
+                intent=intent,
+                user_preferences=user_preferences,
+                top_k=offset + limit
+            )[offset:]
+        }
+
+        # 6️⃣ Routing rounds; each one but the last becomes an update
+        # (the last is covered by the final event)
+        enriched: List[int] = []
+        async for enriched, last in self._routing_rounds(
+            shared, new_indices, user_preferences, k=offset + limit
+        ):
+            if not last:
+                yield {
+                    "event": "update",
+                    "results": self._rank_routed(
+                        shared, new_indices, enriched, user_preferences, top_k=offset + limit
+                    )[offset:]
+                }
+
+        # 7️⃣ + 8️⃣
+        page = self._rank_page(shared, new_indices, enriched, user_preferences, offset, limit)
+        self._explain(page, self.explainer.build_context(intent, user_preferences, visited))
+
+        yield {
+            "event": "final",
+            **self._summary(shared, user_preferences, new_indices, enriched, page, offset, limit)
+        }
+
+    def _page(self, offset: int, limit: Optional[int]) -> Tuple[int, int]:
+        limit = self.MAX_RESULTS if limit is None else limit
+        return max(0, offset), min(max(1, limit), self.MAX_PAGE_SIZE)
+
+    def _unvisited(
+        self,
+        shared: SharedCandidateSet,
+        user_preferences: Optional[Dict],
+        visited: VisitedSet
+    ) -> Tuple[VisitedSet, List[int]]:
+        # Names from the legacy preferences list still count as visits
+        visited = visited.with_names(
+            user_preferences.get("visited_places") if user_preferences else None
+        )
+        with span("filter"):
+            new_indices = [
+                i for i, p in enumerate(shared.candidates)
+                if p not in visited
+            ]
+        return visited, new_indices
 
-        enriched_places: List[Dict] = []
+    def _rank_routed(
+        self,
+        shared: SharedCandidateSet,
+        indices: List[int],
+        enriched: List[int],
+        user_preferences: Optional[Dict],
+        top_k: int
+    ) -> List[Place]:
+        # Back in candidate order so ties break exactly as the
+        # exhaustive path; scores go on per-request copies
+        return self.scoring.rank_places(
+            shared.copies([indices[j] for j in sorted(enriched)]),
+            intent=shared.intent,
+            user_preferences=user_preferences,
+            top_k=top_k
+        )
 
-        # 5️⃣ Enrich each place
-        for place in all_places:
-            travel = self.maps.get_travel_time(
-                origin_lat=latitude,
-                origin_lng=longitude,
-                dest_lat=place["latitude"],
-                dest_lng=place["longitude"]
+    def _rank_page(
+        self,
+        shared: SharedCandidateSet,
+        indices: List[int],
+        enriched: List[int],
+        user_preferences: Optional[Dict],
+        offset: int,
+        limit: int
+    ) -> List[Place]:
+        with span("score"):
+            ranked_places = self._rank_routed(
+                shared, indices, enriched, user_preferences, top_k=offset + limit
             )
-            place["distance_km"] = travel["distance_km"]
-            place["travel_time"] = travel["travel_time"]
+        ranking_stats.record(candidates=len(indices), enriched=len(enriched))
+        return ranked_places[offset:]
+
+    def _explain(self, places: List[Place], context: ExplanationContext):
+        """
+        Post-selection stage: only the places actually returned.
+        """
+        with span("explain"):
+            for place in places:
+                place.explanation = self.explainer.explain(place, context)
+
+    def _summary(
+        self,
+        shared: SharedCandidateSet,
+        user_preferences: Optional[Dict],
+        indices: List[int],
+        enriched: List[int],
+        page: List[Place],
+        offset: int,
+        limit: int
+    ) -> Dict:
+        return {
+            "intent": shared.intent.model_dump(),
+            "strategy_used": dict(shared.plan),
+            "user_preferences_used": bool(user_preferences),
+            "total_found": len(indices),
+            "timed_out_categories": list(shared.timed_out),
+            "failed_categories": list(shared.failed),
+            "duplicates_merged": shared.duplicates_merged,
+            "out_of_radius": shared.out_of_radius,
+            "enrichment_calls_avoided": len(indices) - len(enriched),
+            "offset": offset,
+            "next_offset": offset + limit if offset + limit < len(indices) else None,
+            "results": page
+        }
+
+    async def _load_user(
+        self,
+        db: Union[AsyncSession, Session, None],
+        user_id: Optional[str]
+    ) -> Tuple[Optional[Dict], VisitedSet]:
+        # One session cannot run two queries at once: sequential
+        preferences = await self._load_preferences(db, user_id)
+        visited = await self._load_visited(db, user_id)
+
+        # Nothing else reads the DB; return the connection to the
+        # pool instead of holding it through routing
+        if isinstance(db, AsyncSession):
+            await db.commit()
+
+        return preferences, visited
+
+    async def _load_preferences(
+        self,
+        db: Union[AsyncSession, Session, None],
+        user_id: Optional[str]
+    ) -> Optional[Dict]:
+        # No session (scripts, benchmarks) means no stored preferences
+        if not user_id or db is None:
+            return None
+        with span("preferences"):
+            if isinstance(db, AsyncSession):
+                return await async_crud.get_cached_preferences(db, user_id)
+            return await asyncio.to_thread(get_cached_preferences, db, user_id)
+
+    async def _load_visited(
+        self,
+        db: Union[AsyncSession, Session, None],
+        user_id: Optional[str]
+    ) -> VisitedSet:
+        # No session (scripts, benchmarks) means no stored history
+        if not user_id or db is None:
+            return VisitedSet()
+        with span("visited"):
+            if isinstance(db, AsyncSession):
+                return await async_crud.get_visited_set(db, user_id)
+            return await asyncio.to_thread(get_visited_set, db, user_id)
+
+    def _coalesce_key(self, user_query: str, latitude: float, longitude: float) -> str:
+        q = self.COALESCE_PRECISION
+        query = normalize_query(user_query) or user_query.strip().casefold()
+        return f"{query}|{latitude:.{q}f},{longitude:.{q}f}"
+
+    async def _shared_plan(
+        self,
+        user_query: str,
+        latitude: float,
+        longitude: float
+    ) -> Tuple[UserIntent, Dict]:
+        """
+        Intent and plan, coalesced like the candidate set.
+        """
+        key = self._coalesce_key(user_query, latitude, longitude)
+
+        recent = self._recent_plans.get(key)
+        if recent is not None:
+            return recent
+
+        async def build() -> Tuple[UserIntent, Dict]:
+            # 1️⃣ Natural language → structured intent
+            with span("intent"):
+                intent = await self.intent_agent.aextract(user_query)
+
+            # 3️⃣ Planner decides search strategy
+            with span("plan"):
+                plan = self.planner.create_plan(
+                    intent=intent,
+                    latitude=latitude,
+                    longitude=longitude
+                )
+
+            self._recent_plans.set(key, (intent, plan))
+            return intent, plan
+
+        return await self._plan_flight.do(key, build)
+
+    async def _shared_candidates(
+        self,
+        user_query: str,
+        latitude: float,
+        longitude: float,
+        planned: Optional[Tuple[UserIntent, Dict]] = None
+    ) -> SharedCandidateSet:
+        """
+        Candidate set for this request, reusing one that an identical
+        request is building or built within COALESCE_WINDOW_S.
+        """
+        key = self._coalesce_key(user_query, latitude, longitude)
+
+        recent = self._recent_candidates.get(key)
+        if recent is not None:
+            with span("candidates", reused=True):
+                return recent
 
-            traffic = self.traffic.analyze_traffic(place)
-            place.update(traffic)
+        async def build() -> SharedCandidateSet:
+            intent, plan = planned or await self._shared_plan(user_query, latitude, longitude)
+            shared = await self._build_candidates(intent, plan, latitude, longitude)
+            self._recent_candidates.set(key, shared)
+            return shared
 
-            pop = self.popularity.estimate_crowd(
-                place=place,
-                time_of_day=intent.time_of_day
+        with span("candidates", reused=False):
+            return await self._candidate_flight.do(key, build)
+
+    async def _build_candidates(
+        self,
+        intent: UserIntent,
+        plan: Dict,
+        latitude: float,
+        longitude: float
+    ) -> SharedCandidateSet:
+
+        # 4️⃣ Fetch places via Maps MCP (concurrently, per category)
+        with span("search"):
+            all_places, timed_out, failed = await self._search_categories(
+                categories=plan["place_types"],
+                latitude=latitude,
+                longitude=longitude
             )
-            place["crowd_level"] = pop["crowd_level"]
-            place["crowd_confidence"] = pop["confidence"]
 
-            enriched_places.append(place)
+        # Overlapping categories return the same POI more than once;
+        # merge before paying for enrichment on every copy
+        with span("dedup"):
+            all_places, duplicates_merged = self.dedup.merge(all_places)
 
-        # 6️⃣ Filter out visited places (memory-based personalization)
-        new_places = [p for p in enriched_places if p["name"] not in visited_places]
+        # Only the nearest in-radius candidates go on to network
+        # enrichment, which bounds Mapbox calls per request
+        with span("spatial_filter"):
+            all_places, out_of_radius = self.spatial.filter(
+                all_places,
+                latitude=latitude,
+                longitude=longitude,
+                radius_km=plan["radius_km"],
+                max_candidates=plan.get("max_candidates")
+            )
+
+        # Crowd estimates only need search fields, so every candidate
+        # gets one before routing
+        with span("crowd"):
+            for place in all_places:
+                pop = self.popularity.estimate_crowd(
+                    place=place,
+                    time_of_day=intent.time_of_day
+                )
+                place.crowd_level = pop["crowd_level"]
+                place.crowd_confidence = pop["confidence"]
 
-        # 7️⃣ Score + rank (intent + preferences)
-        ranked_places = self.scoring.rank_places(
-            new_places,
+        return SharedCandidateSet(
             intent=intent,
-            user_preferences=user_preferences
+            plan=plan,
+            origin=(latitude, longitude),
+            candidates=all_places,
+            timed_out=timed_out,
+            duplicates_merged=duplicates_merged,
+            out_of_radius=out_of_radius,
+            failed=failed
         )
 
-        # 8️⃣ Add explanations
-        for place in ranked_places:
-            place["explanation"] = self.explainer.generate_explanation(
-                place=place,
-                intent=intent,
-                user_preferences=user_preferences,
-                visited_places=visited_places
+    async def _enrich(self, places: List[Place], origin: LatLng):
+        """
+        Travel times (one batched matrix call) plus traffic.
+        """
+        if not places:
+            return
+
+        with span("enrich"):
+            travel_times = await self.maps.aget_travel_times(
+                origin=origin,
+                destinations=[(p.latitude, p.longitude) for p in places]
             )
 
-        return {
-            "intent": intent.model_dump(),
-            "strategy_used": plan,
-            "user_preferences_used": bool(user_preferences),
-            "total_found": len(ranked_places),
-            "results": ranked_places[:10]
+            for place, travel in zip(places, travel_times):
+                place.distance_km = travel["distance_km"]
+                place.travel_time = travel["travel_time"]
+
+                traffic = self.traffic.analyze_traffic(place)
+                place.traffic_level = traffic["traffic_level"]
+                place.travel_time = traffic["travel_time"]
+                place.travel_score = traffic["travel_score"]
+
+    async def _routing_rounds(
+        self,
+        shared: SharedCandidateSet,
+        indices: List[int],
+        user_preferences: Optional[Dict],
+        k: int
+    ) -> AsyncIterator[Tuple[List[int], bool]]:
+        """
+        Routes shared.candidates[indices] as far as a top-k ranking
+        needs and yields, as soon as each round is back, the
+        positions in `indices` routed so far and whether that round
+        was the last.
+
+        "exhaustive" routes everything in one round. "bound" is a
+        branch-and-bound top-k: candidates are routed in order of
+        their optimistic score, and routing stops once the k-th best
+        real score is strictly above every remaining bound, so no
+        skipped place could have made (or tied into) the top k. The
+        bound takes every place's travel term at its best, so results
+        are identical to "exhaustive"; only rating, affinity and crowd
+        differences let it stop early.
+        """
+        if self.ranking_mode == "exhaustive" or len(indices) <= k:
+            await shared.enrich(indices, self._enrich)
+            yield list(range(len(indices))), True
+            return
+
+        intent = shared.intent
+        places = [shared.candidates[i] for i in indices]
+
+        bounds = self.scoring.upper_bounds(places, intent, user_preferences=user_preferences)
+        order = sorted(range(len(places)), key=lambda j: -bounds[j])
+
+        enriched: List[int] = []
+        chunk = self.ENRICH_BATCH_SIZE
+        round_size = math.ceil(k / chunk) * chunk
+
+        while len(enriched) < len(places):
+            batch = order[len(enriched):len(enriched) + round_size]
+            await shared.enrich([indices[j] for j in batch], self._enrich)
+            enriched.extend(batch)
+            round_size = self.ENRICH_ROUND_CHUNKS * chunk
+
+            last = len(enriched) == len(places)
+            if not last:
+                scores = self.scoring.score_places(
+                    [places[j] for j in enriched], intent, user_preferences=user_preferences
+                )
+                kth_best = sorted(scores, reverse=True)[k - 1]
+                last = kth_best > bounds[order[len(enriched)]]
+
+            yield list(enriched), last
+            if last:
+                break
+
+    async def _search_categories(
+        self,
+        categories: List[str],
+        latitude: float,
+        longitude: float
+    ) -> Tuple[List[Place], List[str], List[str]]:
+        """
+        Runs search_places for every category concurrently.
+        Categories that miss the deadline or fail are dropped so the
+        request still returns whatever arrived; both are reported
+        (timed out, failed) so callers can tell them from "no results".
+        """
+        semaphore = asyncio.Semaphore(self.search_concurrency)
+
+        async def search(category: str) -> List[Dict]:
+            async with semaphore:
+                return await self.maps.asearch_places(
+                    lat=latitude,
+                    lng=longitude,
+                    category=category,
+                    limit=10
+                )
+
+        tasks = {
+            asyncio.create_task(search(category)): category
+            for category in categories
         }
+
+        if not tasks:
+            return [], [], []
+
+        done, not_done = await asyncio.wait(tasks, timeout=self.search_deadline_s)
+
+        for task in not_done:
+            task.cancel()
+
+        all_places: List[Place] = []
+        timed_out: List[str] = []
+        failed: List[str] = []
+
+        # Keep plan order so ranking ties stay deterministic
+        for task, category in tasks.items():
+            if task not in done:
+                timed_out.append(category)
+            elif task.exception() is not None:
+                logger.error(
+                    "Search for %s failed", category, exc_info=task.exception()
+                )
+                failed.append(category)
+            else:
+                all_places.extend(Place.from_dict(p) for p in task.result())
+
+        return all_places, timed_out, failed
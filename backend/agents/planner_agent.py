@@ -1,4 +1,5 @@
-from typing import Dict
+import os
+from typing import Dict, Optional
 from backend.schemas.user_intent import UserIntent
 
 
@@ -20,6 +21,12 @@ class PlannerAgent:
         "ice_cream"
     }
 
+    # Candidates kept for network enrichment after the spatial filter
+    MAX_CANDIDATES = int(os.getenv("PLAN_MAX_CANDIDATES", "25"))
+
+    def __init__(self, max_candidates: Optional[int] = None):
+        self.max_candidates = max_candidates or self.MAX_CANDIDATES
+
     def create_plan(
         self,
         intent: UserIntent,
@@ -60,6 +67,7 @@ class PlannerAgent:
         return {
             "place_types": place_types,
             "radius_km": radius_km,
+            "max_candidates": self.max_candidates,
             "priorities": priorities,
             "booking_likely": booking_likely
         }
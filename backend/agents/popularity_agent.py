@@ -1,5 +1,7 @@
 from typing import Dict, Optional
 
+from backend.schemas.place import Place
+
 class PopularityAgent:
     """
     Estimates how crowded a place is.
@@ -7,17 +9,17 @@ class PopularityAgent:
 
     def estimate_crowd(
         self,
-        place: Dict,
+        place: Place,
         time_of_day: Optional[str] = None
     ) -> Dict:
 
         score = 0.0
 
-        popular_times = place.get("popular_times")
+        popular_times = place.popular_times
         if popular_times is not None:
             score += popular_times / 100
 
-        rating_count = place.get("user_ratings_total")
+        rating_count = place.user_ratings_total
         if rating_count:
             if rating_count > 2000:
                 score += 0.4
@@ -1,6 +1,15 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional, Union
+
+import numpy as np
+
+from backend.schemas.place import Place
 from backend.schemas.user_intent import UserIntent
 
+CROWD_LOW = 1
+CROWD_MEDIUM = 2
+CROWD_CODES = {"low": CROWD_LOW, "medium": CROWD_MEDIUM}
+
+
 class ScoringAgent:
     """
     Scores places using intent-driven weights
@@ -9,24 +18,28 @@ class ScoringAgent:
 
     def score_place(
         self,
-        place: Dict,
+        place: Union[Place, Mapping],
         intent: UserIntent,
         user_preferences: Optional[Dict] = None
     ) -> float:
+        # Dict-shaped places (the pre-Place API) are still accepted
+        if not isinstance(place, Place):
+            place = Place.from_dict(place)
+
         score = 0.0
         prefs = intent.preferences
 
         # -----------------
         # Rating score
         # -----------------
-        rating = place.get("rating")
+        rating = place.rating
         if rating:
             score += (rating / 5.0) * prefs.get("food_quality", 0.5) * 0.4
 
         # -----------------
         # Travel score
         # -----------------
-        travel_time = place.get("travel_time")
+        travel_time = place.travel_time
         if travel_time:
             travel_score = max(0, 1 - (travel_time / 30))
             score += travel_score * (1 - prefs.get("travel_tolerance", 0.5)) * 0.3
@@ -36,7 +49,7 @@ class ScoringAgent:
         # -----------------
         if user_preferences:
             affinity = user_preferences.get("place_type_affinity", {})
-            place_type = place.get("category")
+            place_type = place.category
 
             if place_type:
                 boost = affinity.get(place_type, 0.0)
@@ -45,7 +58,7 @@ class ScoringAgent:
         # -----------------
         # Crowd score
         # -----------------
-        crowd = place.get("crowd_level")
+        crowd = place.crowd_level
         if crowd == "low":
             score += prefs.get("crowd_quietness", 0.5) * 0.2
         elif crowd == "medium":
@@ -53,18 +66,129 @@ class ScoringAgent:
 
         return round(min(score, 1.0), 2)
 
-    def rank_places(
+    def _columns(self, places: List[Place], user_preferences: Optional[Dict]):
+        """
+        Packs the fields score_place reads into float64/int8 columns.
+        Missing or falsy values become 0, which the masks skip.
+        """
+        affinity = (user_preferences or {}).get("place_type_affinity", {})
+
+        rating = np.fromiter((p.rating or 0.0 for p in places), np.float64, len(places))
+        travel = np.fromiter((p.travel_time or 0.0 for p in places), np.float64, len(places))
+        crowd = np.fromiter((CROWD_CODES.get(p.crowd_level, 0) for p in places), np.int8, len(places))
+        boost = np.fromiter(
+            (affinity.get(p.category, 0.0) if p.category else 0.0 for p in places),
+            np.float64,
+            len(places)
+        )
+        return rating, travel, crowd, boost
+
+    def score_places(
         self,
-        places: List[Dict],
+        places: List[Place],
         intent: UserIntent,
         user_preferences: Optional[Dict] = None
-    ) -> List[Dict]:
+    ) -> List[float]:
+        """
+        Columnar score_place: same terms, same operation order, so
+        every score is bit-identical to the per-place formula.
+        """
+        if not places:
+            return []
+
+        return self._score_columns(
+            *self._columns(places, user_preferences),
+            intent=intent,
+            user_preferences=user_preferences
+        )
+
+    def upper_bounds(
+        self,
+        places: List[Place],
+        intent: UserIntent,
+        user_preferences: Optional[Dict] = None
+    ) -> List[float]:
+        """
+        Optimistic scores for places not yet routed: rating, affinity
+        and crowd are exact, travel takes its best case (an instant
+        trip). Never below the score the place gets once enriched.
+        """
+        if not places:
+            return []
+
+        rating, _, crowd, boost = self._columns(places, user_preferences)
+
+        if 1 - intent.preferences.get("travel_tolerance", 0.5) > 0:
+            # A zero time skips the travel term, so bound it just above 0
+            travel = np.full(len(places), 1e-9)
+        else:
+            # Travel can only lower the score; its best case is no term
+            travel = np.zeros(len(places))
+
+        return self._score_columns(
+            rating, travel, crowd, boost,
+            intent=intent,
+            user_preferences=user_preferences
+        )
+
+    @staticmethod
+    def _score_columns(
+        rating: np.ndarray,
+        travel: np.ndarray,
+        crowd: np.ndarray,
+        boost: np.ndarray,
+        intent: UserIntent,
+        user_preferences: Optional[Dict]
+    ) -> List[float]:
+        prefs = intent.preferences
+
+        # Skipped terms add 0.0, which leaves the running sum unchanged
+        score = np.zeros(len(rating))
+        score += np.where(rating != 0, (rating / 5.0) * prefs.get("food_quality", 0.5) * 0.4, 0.0)
+        travel_score = np.maximum(0.0, 1 - (travel / 30))
+        score += np.where(travel != 0, travel_score * (1 - prefs.get("travel_tolerance", 0.5)) * 0.3, 0.0)
+        if user_preferences:
+            score += boost * 0.1
+        score += np.where(
+            crowd == CROWD_LOW,
+            prefs.get("crowd_quietness", 0.5) * 0.2,
+            np.where(crowd == CROWD_MEDIUM, 0.1, 0.0)
+        )
+
+        # Python's round (correctly rounded), not np.round
+        return [round(s, 2) for s in np.minimum(score, 1.0).tolist()]
+
+    def rank_places(
+        self,
+        places: List[Place],
+        intent: UserIntent,
+        user_preferences: Optional[Dict] = None,
+        top_k: Optional[int] = None
+    ) -> List[Place]:
+        """
+        Scores every place and returns them best first; with `top_k`
+        only the first k, chosen by partial sort. Ties keep input
+        order, exactly as the stable full sort did.
+        """
+        scores = self.score_places(places, intent, user_preferences=user_preferences)
+
+        for place, score in zip(places, scores):
+            place.final_score = score
+
+        if not places:
+            return []
+
+        keys = -np.asarray(scores)
 
-        for place in places:
-            place["final_score"] = self.score_place(
-                place,
-                intent,
-                user_preferences=user_preferences
-            )
+        if top_k is None or top_k >= len(places):
+            order = np.argsort(keys, kind="stable")
+        elif top_k <= 0:
+            return []
+        else:
+            # Everything at or above the k-th best score, ties included,
+            # then a stable sort of just that slice
+            kth = np.partition(keys, top_k - 1)[top_k - 1]
+            candidates = np.flatnonzero(keys <= kth)
+            order = candidates[np.argsort(keys[candidates], kind="stable")][:top_k]
 
-        return sorted(places, key=lambda x: x["final_score"], reverse=True)
+        return [places[i] for i in order.tolist()]
@@ -0,0 +1,50 @@
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from backend.schemas.place import Place
+from backend.utils.geo import haversine_km_many
+
+
+class SpatialFilterAgent:
+    """
+    Local radius filter run before any per-place network call.
+    Keeps in-radius candidates, nearest first, capped at the plan's
+    max_candidates.
+    """
+
+    def filter(
+        self,
+        places: List[Place],
+        latitude: float,
+        longitude: float,
+        radius_km: float,
+        max_candidates: Optional[int] = None
+    ) -> Tuple[List[Place], int]:
+        """
+        Returns (kept places, number dropped as out of radius).
+        Each kept place gets its straight_line_km.
+        """
+        if not places:
+            return [], 0
+
+        distances = haversine_km_many(
+            latitude,
+            longitude,
+            [p.latitude for p in places],
+            [p.longitude for p in places]
+        )
+
+        inside = np.flatnonzero(distances <= radius_km)
+        # Stable, so equidistant places keep search order
+        order = inside[np.argsort(distances[inside], kind="stable")]
+        if max_candidates is not None:
+            order = order[:max_candidates]
+
+        kept = []
+        for i in order.tolist():
+            place = places[i]
+            place.straight_line_km = float(distances[i])
+            kept.append(place)
+
+        return kept, len(places) - len(inside)
@@ -1,5 +1,7 @@
 from typing import Dict
 
+from backend.schemas.place import Place
+
 class TrafficAgent:
     """
     Normalizes travel time using traffic heuristics.
@@ -7,12 +9,12 @@ class TrafficAgent:
 
     def analyze_traffic(
         self,
-        place: Dict,
+        place: Place,
         max_acceptable_time: int = 30
     ) -> Dict:
 
-        travel_time = place.get("travel_time")
-        base_time = place.get("travel_time_no_traffic")
+        travel_time = place.travel_time
+        base_time = place.travel_time_no_traffic
 
         penalty = 0.0
         traffic_level = "low"
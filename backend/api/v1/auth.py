@@ -1,10 +1,17 @@
-from backend.auth.security import create_access_token, hash_password, verify_password
+from backend.auth.security import create_access_token
+from backend.auth.password_service import password_service, PasswordServiceBusy
 from fastapi import APIRouter, HTTPException, status, Depends
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from backend.api.v1.deps import get_db
-from backend.db.models import User, UserPreference
-from backend.db.crud import create_or_update_user_preference
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.v1.deps import get_async_db
+from backend.db.async_crud import (
+    create_or_update_user_preference,
+    create_user,
+    get_user,
+    get_user_by_email,
+    get_user_by_login,
+    update_user_password
+)
 import uuid
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
@@ -27,38 +34,55 @@ class TokenResponse(BaseModel):
     user_id: str
 
 
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests, please retry",
+        headers={"Retry-After": "1"}
+    )
+
+
 @router.post("/signup", response_model=TokenResponse)
-def signup(request: SignupRequest, db: Session = Depends(get_db)):
+async def signup(request: SignupRequest, db: AsyncSession = Depends(get_async_db)):
     # Check if user already exists
-    existing = db.query(User).filter(User.id == request.username).first()
+    existing = await get_user(db, request.username)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Username already exists"
         )
         
-    existing_email = db.query(User).filter(User.email == request.email).first()
+    existing_email = await get_user_by_email(db, request.email)
     if existing_email:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
 
-    # Hash the password
-    hashed_pw = hash_password(request.password)
+    # End the read transaction: the connection goes back to the
+    # pool instead of idling through bcrypt
+    await db.commit()
+
+    # Hash the password (bounded bcrypt pool, off the event loop)
+    try:
+        hashed_pw = await password_service.ahash(request.password)
+    except PasswordServiceBusy:
+        raise _busy()
 
     # Create user record
-    new_user = User(
-        id=request.username,   # or str(uuid.uuid4()) if you want random IDs
-        email=request.email,
-        hashed_password=hashed_pw
+    new_user = await create_user(
+        db,
+        request.username,   # or str(uuid.uuid4()) if you want random IDs
+        request.email,
+        hashed_pw
     )
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
 
     # Initialize empty preferences for this user
-    create_or_update_user_preference(db, user_id=new_user.id, preferences={"place_type_affinity": {}})
+    await create_or_update_user_preference(
+        db,
+        new_user.id,
+        {"place_type_affinity": {}}
+    )
 
     # Create JWT token
     access_token = create_access_token(data={"sub": new_user.id})
@@ -66,11 +90,9 @@ def signup(request: SignupRequest, db: Session = Depends(get_db)):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(request: LoginRequest, db: Session = Depends(get_db)):
+async def login(request: LoginRequest, db: AsyncSession = Depends(get_async_db)):
     # Check if user exists (by username OR email)
-    user = db.query(User).filter(
-        (User.id == request.username) | (User.email == request.username)
-    ).first()
+    user = await get_user_by_login(db, request.username)
 
     if not user:
         print(f"DEBUG: User '{request.username}' not found in database (checked by username and email)")
@@ -79,8 +101,17 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
             detail="Invalid username or password"
         )
     
-    # Verify password
-    password_correct = verify_password(request.password, user.hashed_password)
+    # Release the connection while bcrypt runs (user stays loaded)
+    await db.commit()
+
+    # Verify password; hashes made at an outdated cost are upgraded
+    try:
+        password_correct, new_hash = await password_service.averify_and_rehash(
+            request.password,
+            user.hashed_password
+        )
+    except PasswordServiceBusy:
+        raise _busy()
     print(f"DEBUG: User '{request.username}' found (id={user.id}). Password correct: {password_correct}")
     
     if not password_correct:
@@ -89,6 +120,9 @@ def login(request: LoginRequest, db: Session = Depends(get_db)):
             detail="Invalid username or password"
         )
 
+    if new_hash:
+        await update_user_password(db, user, new_hash)
+
     # Create JWT token
     access_token = create_access_token(data={"sub": user.id})
 
@@ -1,5 +1,7 @@
 # api/deps.py
-from backend.db.session import SessionLocal
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.db.session import AsyncSessionLocal, SessionLocal
 from fastapi import HTTPException, status, Depends
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from backend.auth.security import get_user_id_from_token
@@ -18,6 +20,15 @@ def get_db():
         db.close()
 
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """
+    FastAPI dependency to get an async database session
+    (request handlers; waits on the DB do not hold a thread)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
 def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)) -> str:
     """
     FastAPI dependency to extract and validate user from JWT token
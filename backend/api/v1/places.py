@@ -1,12 +1,18 @@
-from typing import List, Optional, Any, Dict
+import json
+import logging
+from typing import AsyncIterator, List, Optional, Any, Dict
 from fastapi import APIRouter, Depends
-from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from backend.api.v1.deps import get_db, get_current_user
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.v1.deps import get_async_db, get_current_user
 from backend.agents.orchestrator import OrchestratorAgent
+from backend.utils.providers import provider
 
 router = APIRouter(prefix="/places", tags=["Places"])
 
+logger = logging.getLogger(__name__)
+
 # --- SCHEMAS ---
 
 class PlaceRequest(BaseModel):
@@ -14,7 +20,15 @@ class PlaceRequest(BaseModel):
     latitude: float
     longitude: float
 
+    # Paging: later pages are ranked and explained on request
+    offset: int = Field(0, ge=0)
+    limit: int = Field(OrchestratorAgent.MAX_RESULTS, ge=1, le=OrchestratorAgent.MAX_PAGE_SIZE)
+
 class PlaceResponse(BaseModel):
+    # Validated field by field from Place attributes; each result is
+    # still copied into this model (not zero-copy)
+    model_config = ConfigDict(from_attributes=True)
+
     place_id: str
     name: str
     address: Optional[str] = None
@@ -38,21 +52,27 @@ class PlaceResponse(BaseModel):
     price: Optional[str] = "₹₹"
     explanation: Optional[str] = None 
 
-orchestrator = OrchestratorAgent()
+orchestrator_provider = provider("orchestrator", OrchestratorAgent)
+
+def get_orchestrator() -> OrchestratorAgent:
+    return orchestrator_provider.get()
 
 @router.post("/recommend", response_model=List[PlaceResponse])
-def recommend_places(
+async def recommend_places(
     request: PlaceRequest,
-    db: Session = Depends(get_db),
-    current_user: str = Depends(get_current_user)
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user),
+    orchestrator: OrchestratorAgent = Depends(get_orchestrator)
 ):
     try:
-        orchestrator_output = orchestrator.get_recommendations(
+        orchestrator_output = await orchestrator.aget_recommendations(
             user_query=request.query,
             latitude=request.latitude,
             longitude=request.longitude,
             db=db,
-            user_id=current_user
+            user_id=current_user,
+            offset=request.offset,
+            limit=request.limit
         )
         
         # Extract list logic
@@ -61,6 +81,49 @@ def recommend_places(
             
         return orchestrator_output
         
-    except Exception as e:
-        print(f"Error getting recommendations: {e}")
-        return []
\ No newline at end of file
+    except Exception:
+        logger.exception("Error getting recommendations")
+        return []
+
+
+def _ndjson_event(event: Dict) -> str:
+    if "results" in event:
+        event = {
+            **event,
+            "results": [
+                PlaceResponse.model_validate(place).model_dump(mode="json")
+                for place in event["results"]
+            ]
+        }
+    return json.dumps(event) + "\n"
+
+
+@router.post("/recommend/stream")
+async def stream_recommendations(
+    request: PlaceRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user),
+    orchestrator: OrchestratorAgent = Depends(get_orchestrator)
+):
+    """
+    NDJSON stream: plan, provisional results (before routing),
+    updates as travel times arrive, then the final response.
+    """
+    async def events() -> AsyncIterator[str]:
+        try:
+            async for event in orchestrator.astream_recommendations(
+                user_query=request.query,
+                latitude=request.latitude,
+                longitude=request.longitude,
+                db=db,
+                user_id=current_user,
+                offset=request.offset,
+                limit=request.limit
+            ):
+                yield _ndjson_event(event)
+
+        except Exception:
+            logger.exception("Error streaming recommendations")
+            yield _ndjson_event({"event": "error", "detail": "recommendation failed"})
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException, status
+from typing import Optional
 from pydantic import BaseModel
-from sqlalchemy.orm import Session
-from datetime import datetime
-from backend.api.v1.deps import get_db, get_current_user
-from backend.db.models import UserPreference
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.api.v1.deps import get_async_db, get_current_user
+from backend.db.async_crud import add_visited_place, get_user_preferences as load_preferences
+from backend.db.interaction_buffer import (
+    interaction_buffer, InteractionBufferClosed, InteractionBufferFull
+)
 
 
 router = APIRouter(prefix="/user", tags=["User"])
@@ -12,65 +15,44 @@ class UserInteraction(BaseModel):
     signal: str
     place_type: str
 
+class VisitRequest(BaseModel):
+    place_id: str
+    place_name: Optional[str] = None
+
 @router.post("/interact")
 def record_user_interaction(
     interaction: UserInteraction,
-    db: Session = Depends(get_db),
     current_user: str = Depends(get_current_user)
 ):
     """
-    Records user preference signals for authenticated user
+    Records user preference signals for authenticated user.
+    Signals are buffered and written in batches (write-behind).
     """
-
-    record = (
-        db.query(UserPreference)
-        .filter(UserPreference.user_id == current_user)
-        .first()
-    )
-
-    # Case 1: first time user
-    if not record:
-        record = UserPreference(
-            user_id=current_user,
-            preferences={
-                "place_type_affinity": {
-                    interaction.place_type: 1.0
-                }
-            },
-            last_updated=datetime.utcnow()
+    try:
+        interaction_buffer.record(current_user, interaction.place_type)
+    except InteractionBufferFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many interactions, please retry",
+            headers={"Retry-After": "1"}
+        )
+    except InteractionBufferClosed:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is shutting down, please retry"
         )
-        db.add(record)
-
-    # Case 2: returning user
-    else:
-        prefs = record.preferences
-        affinity = prefs.get("place_type_affinity", {})
-
-        affinity[interaction.place_type] = affinity.get(
-            interaction.place_type, 0.0
-        ) + 0.1   # simple increment (EMA later)
-
-        prefs["place_type_affinity"] = affinity
-        record.preferences = prefs
-        record.last_updated = datetime.utcnow()
-
-    db.commit()
 
-    return {"status": "stored", "user_id": current_user}
+    return {"status": "queued", "user_id": current_user}
 
 @router.get("/preferences")
-def get_user_preferences(
-    db: Session = Depends(get_db),
+async def get_user_preferences(
+    db: AsyncSession = Depends(get_async_db),
     current_user: str = Depends(get_current_user)
 ):
     """
     Get preferences for authenticated user
     """
-    record = (
-        db.query(UserPreference)
-        .filter(UserPreference.user_id == current_user)
-        .first()
-    )
+    record = await load_preferences(db, current_user)
 
     if not record:
         return {"user_id": current_user, "preferences": {}}
@@ -81,3 +63,15 @@ def get_user_preferences(
         "last_updated": record.last_updated
     }
 
+
+@router.post("/visited")
+async def record_visit(
+    visit: VisitRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: str = Depends(get_current_user)
+):
+    """
+    Marks a place as visited; it is left out of later recommendations
+    """
+    await add_visited_place(db, current_user, visit.place_id, visit.place_name)
+    return {"status": "stored", "user_id": current_user, "place_id": visit.place_id}
@@ -0,0 +1,114 @@
+"""
+Runs bcrypt off the request path.
+
+bcrypt is deliberately CPU-heavy (~250 ms at cost 12). Hashing inline
+in a handler lets a burst of logins pin the worker's cores and starve
+every other endpoint. PasswordService confines that work to a small
+dedicated pool with a bounded queue; when the queue is full, callers
+get PasswordServiceBusy straight away instead of piling up.
+
+A thread pool is enough here: the bcrypt package releases the GIL while
+hashing, so workers run truly in parallel without process overhead.
+"""
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from backend.auth.security import (
+    BCRYPT_ROUNDS,
+    get_hash_rounds,
+    hash_password,
+    verify_password
+)
+
+
+class PasswordServiceBusy(RuntimeError):
+    """
+    Raised when the bcrypt queue is full.
+    """
+
+
+class PasswordService:
+
+    def __init__(
+        self,
+        rounds: int = BCRYPT_ROUNDS,
+        max_workers: Optional[int] = None,
+        max_queue: Optional[int] = None
+    ):
+        self.rounds = rounds
+        self.max_workers = max_workers or int(
+            os.getenv("BCRYPT_WORKERS", str(max(1, (os.cpu_count() or 2) // 2)))
+        )
+        self.max_queue = max_queue if max_queue is not None else int(
+            os.getenv("BCRYPT_MAX_QUEUE", "32")
+        )
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="bcrypt"
+        )
+        # Running + waiting jobs
+        self._slots = threading.BoundedSemaphore(self.max_workers + self.max_queue)
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordServiceBusy("Password hashing queue is full")
+
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        return get_hash_rounds(hashed_password) != self.rounds
+
+    # -----------------
+    # Blocking API (scripts, sync handlers)
+    # -----------------
+
+    def hash(self, plain_password: str) -> str:
+        return self._submit(hash_password, plain_password, self.rounds).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return self._submit(verify_password, plain_password, hashed_password).result()
+
+    # -----------------
+    # Async API (request handlers)
+    # -----------------
+
+    async def ahash(self, plain_password: str) -> str:
+        return await asyncio.wrap_future(
+            self._submit(hash_password, plain_password, self.rounds)
+        )
+
+    async def averify(self, plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.wrap_future(
+            self._submit(verify_password, plain_password, hashed_password)
+        )
+
+    async def averify_and_rehash(
+        self,
+        plain_password: str,
+        hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verifies the password and, when it matches but was hashed at a
+        different cost, returns a fresh hash at the target cost.
+        """
+        if not await self.averify(plain_password, hashed_password):
+            return False, None
+
+        if self.needs_rehash(hashed_password):
+            return True, await self.ahash(plain_password)
+
+        return True, None
+
+
+password_service = PasswordService()
@@ -1,11 +1,15 @@
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 import os
+import threading
+import time
 from dotenv import load_dotenv
 import jwt
 import bcrypt
 from fastapi import HTTPException, status
 
+from backend.utils.cache import make_cache
+
 # Load environment variables
 load_dotenv()
 
@@ -14,6 +18,40 @@ SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-change-in-production")
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30  
 
+# bcrypt work factor for new hashes; existing hashes with a different
+# cost are upgraded on the next successful login
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+# Verified tokens -> (user_id, exp). Only tokens that decoded cleanly
+# are stored, and each entry lives no longer than its own exp claim.
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "4096"))
+_token_cache = make_cache("verified_tokens", maxsize=TOKEN_CACHE_SIZE, ttl=None, shared=False)
+
+
+class _DecodeStats:
+    """
+    Cost of the jwt.decode calls that did run, to estimate what the
+    cache saved.
+    """
+
+    def __init__(self):
+        self.decodes = 0
+        self.total_decode_s = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_s: float):
+        with self._lock:
+            self.decodes += 1
+            self.total_decode_s += elapsed_s
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            avg_s = self.total_decode_s / self.decodes if self.decodes else 0.0
+            return {"decodes": self.decodes, "avg_decode_s": avg_s}
+
+
+_decode_stats = _DecodeStats()
+
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
     """
@@ -49,24 +87,58 @@ def verify_token(token: str) -> dict:
 def get_user_id_from_token(token: str) -> str:
     """
     Extract user_id (sub claim) from token.
+    Repeat calls with the same unexpired token skip jwt.decode.
     """
-    payload = verify_token(token)
+    cached = _token_cache.get(token)
+    if cached is not None:
+        user_id, exp = cached
+        # Same rule as PyJWT: expired once now >= exp
+        if time.time() < exp:
+            return user_id
+        _token_cache.delete(token)
+
+    started = time.perf_counter()
+    try:
+        payload = verify_token(token)
+    finally:
+        _decode_stats.record(time.perf_counter() - started)
+
     user_id = payload.get("sub")
     if not user_id:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User ID not found in token"
         )
+
+    exp = payload.get("exp")
+    if exp is not None:
+        _token_cache.set(token, (user_id, exp), ttl=max(0.0, exp - time.time()))
+
     return user_id
 
 
-def hash_password(plain_password: str) -> str:
+def token_cache_stats() -> Dict:
+    """
+    Token cache counters plus the decode time it saved
+    (hits x mean cost of a real decode).
+    """
+    cache = _token_cache.stats.snapshot()
+    decode = _decode_stats.snapshot()
+    return {
+        **cache,
+        "decodes": decode["decodes"],
+        "avg_decode_us": round(decode["avg_decode_s"] * 1e6, 1),
+        "decode_ms_saved": round(cache["hits"] * decode["avg_decode_s"] * 1000, 2)
+    }
+
+
+def hash_password(plain_password: str, rounds: Optional[int] = None) -> str:
     """
     Hash a plain-text password using bcrypt.
     """
     if isinstance(plain_password, str):
         plain_password = plain_password.encode("utf-8")
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or BCRYPT_ROUNDS)
     hashed = bcrypt.hashpw(plain_password, salt)
     return hashed.decode("utf-8")
 
@@ -85,3 +157,13 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
         # Hash format invalid - return False instead of crashing
         print(f"Password verification error: {e}")
         return False
+
+
+def get_hash_rounds(hashed_password: str) -> Optional[int]:
+    """
+    Work factor encoded in a bcrypt hash ("$2b$12$..." -> 12).
+    """
+    try:
+        return int(hashed_password.split("$")[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
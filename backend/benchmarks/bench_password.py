@@ -0,0 +1,75 @@
+"""
+Login throughput micro-benchmark.
+
+Measures bcrypt verifications per second on one core, then through
+PasswordService with concurrent logins, and reports logins/s per core.
+
+    python -m backend.benchmarks.bench_password --rounds 12 --seconds 5
+"""
+import argparse
+import asyncio
+import os
+import time
+
+from backend.auth.password_service import PasswordService, PasswordServiceBusy
+from backend.auth.security import hash_password, verify_password
+
+PASSWORD = "correct horse battery staple"
+
+
+def bench_inline(hashed: str, seconds: float) -> float:
+    done = 0
+    started = time.perf_counter()
+    while time.perf_counter() - started < seconds:
+        verify_password(PASSWORD, hashed)
+        done += 1
+    return done / (time.perf_counter() - started)
+
+
+async def bench_service(service: PasswordService, hashed: str, seconds: float, concurrency: int):
+    done = 0
+    rejected = 0
+    deadline = time.perf_counter() + seconds
+
+    async def client():
+        nonlocal done, rejected
+        while time.perf_counter() < deadline:
+            try:
+                await service.averify(PASSWORD, hashed)
+                done += 1
+            except PasswordServiceBusy:
+                rejected += 1
+                await asyncio.sleep(0.01)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return done / (time.perf_counter() - started), rejected
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rounds", type=int, default=12)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--concurrency", type=int, default=64)
+    args = parser.parse_args()
+
+    hashed = hash_password(PASSWORD, rounds=args.rounds)
+    service = PasswordService(rounds=args.rounds, max_workers=args.workers)
+
+    inline_rate = bench_inline(hashed, args.seconds)
+    service_rate, rejected = asyncio.run(
+        bench_service(service, hashed, args.seconds, args.concurrency)
+    )
+
+    print(f"bcrypt cost           : {args.rounds}")
+    print(f"cpu cores             : {os.cpu_count()}")
+    print(f"service workers       : {service.max_workers}")
+    print(f"inline (1 core)       : {inline_rate:8.1f} logins/s")
+    print(f"service               : {service_rate:8.1f} logins/s")
+    print(f"service per core      : {service_rate / service.max_workers:8.1f} logins/s/core")
+    print(f"rejected (queue full) : {rejected}")
+
+
+if __name__ == "__main__":
+    main()
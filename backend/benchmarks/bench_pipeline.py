@@ -0,0 +1,274 @@
+"""
+Offline recommendation pipeline benchmark.
+
+Runs OrchestratorAgent.get_recommendations against replayed Mapbox
+and Gemini responses (see backend.benchmarks.replay) with injected
+upstream latency, across candidate counts and concurrency levels.
+Reports throughput, end-to-end latency percentiles and per-stage
+timings from the tracing spans, and saves them as JSON so a later
+run can be compared against it.
+
+    python -m backend.benchmarks.bench_pipeline --candidates 10 40 80 --concurrency 1 8
+    python -m backend.benchmarks.bench_pipeline --compare backend/benchmarks/results/base.json
+"""
+import argparse
+import json
+import math
+import platform
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from backend.agents.orchestrator import OrchestratorAgent
+from backend.agents.planner_agent import PlannerAgent
+from backend.benchmarks.replay import (
+    FIXTURES_DIR,
+    Fixtures,
+    Latency,
+    ReplayIntentAgent,
+    ReplayMapboxMCP,
+)
+from backend.utils.tracing import trace
+
+ORIGIN = (28.6139, 77.2090)
+
+# Mapbox search returns at most this many places per category
+PER_CATEGORY = 10
+
+# Cafe first, so the recorded sample fixture is used when present
+CATEGORIES = ["cafe"] + sorted(PlannerAgent.ALLOWED_CATEGORIES - {"cafe"})
+
+# Cold requests get origins ~2.2 km apart: no shared search tile,
+# travel cache entry or coalesced candidate set
+COLD_ORIGIN_STEP = 0.02
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Stage timings compared by --compare (end-to-end is always compared)
+COMPARED_STAGES = ("intent", "search", "enrich", "score", "explain")
+
+
+def percentile(values: List[float], q: float) -> float:
+    """
+    Nearest-rank percentile, q in [0, 100].
+    """
+    ordered = sorted(values)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize_ms(seconds: List[float]) -> Dict[str, float]:
+    return {
+        "mean": round(sum(seconds) / len(seconds) * 1000, 2),
+        "p50": round(percentile(seconds, 50) * 1000, 2),
+        "p95": round(percentile(seconds, 95) * 1000, 2),
+        "p99": round(percentile(seconds, 99) * 1000, 2)
+    }
+
+
+def build_orchestrator(
+    candidates: int,
+    fixtures: Fixtures,
+    args: argparse.Namespace
+) -> Tuple[OrchestratorAgent, ReplayMapboxMCP, ReplayIntentAgent]:
+    place_types = CATEGORIES[:max(1, math.ceil(candidates / PER_CATEGORY))]
+
+    orchestrator = OrchestratorAgent(ranking_mode=args.ranking_mode)
+    orchestrator.planner = PlannerAgent(max_candidates=candidates)
+    orchestrator.maps = ReplayMapboxMCP(
+        fixtures,
+        search_latency=Latency(args.search_ms, args.jitter_ms),
+        route_latency=Latency(args.route_ms, args.jitter_ms),
+        seed=args.seed
+    )
+    orchestrator.intent_agent = ReplayIntentAgent(
+        fixtures,
+        place_types=place_types,
+        latency=Latency(args.llm_ms, args.jitter_ms),
+        use_rules=False,
+        use_cache=args.warm,
+        seed=args.seed
+    )
+    return orchestrator, orchestrator.maps, orchestrator.intent_agent
+
+
+def run_level(
+    candidates: int,
+    concurrency: int,
+    fixtures: Fixtures,
+    args: argparse.Namespace
+) -> Dict:
+    orchestrator, maps, intent_agent = build_orchestrator(candidates, fixtures, args)
+    query = args.query or f"benchmark {candidates} candidates"
+
+    def origin(i: int) -> Tuple[float, float]:
+        if args.warm:
+            return ORIGIN
+        return ORIGIN[0] + COLD_ORIGIN_STEP * i, ORIGIN[1]
+
+    def one(i: int) -> Tuple[float, Dict[str, Tuple[float, int]], int]:
+        lat, lng = origin(i)
+        with trace() as current:
+            started = time.perf_counter()
+            result = orchestrator.get_recommendations(
+                user_query=query, latitude=lat, longitude=lng, db=None
+            )
+            elapsed = time.perf_counter() - started
+        return elapsed, current.breakdown(), result["total_found"]
+
+    # Builds the sync bridge loop and lazy clients outside the timings
+    one(-1)
+    for counter in maps.calls:
+        maps.calls[counter] = 0
+    intent_agent.calls = 0
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        runs = list(pool.map(one, range(args.requests)))
+    wall_s = time.perf_counter() - started
+
+    stages: Dict[str, List[float]] = {}
+    for _, breakdown, _ in runs:
+        for name, (spent, _) in breakdown.items():
+            stages.setdefault(name, []).append(spent)
+
+    return {
+        "candidates": candidates,
+        "concurrency": concurrency,
+        "requests": args.requests,
+        "found_mean": round(sum(found for _, _, found in runs) / len(runs), 1),
+        "throughput_rps": round(args.requests / wall_s, 2),
+        "latency_ms": summarize_ms([elapsed for elapsed, _, _ in runs]),
+        "stages_ms": {name: summarize_ms(values) for name, values in sorted(stages.items())},
+        "upstream_calls": {**maps.calls, "gemini": intent_agent.calls}
+    }
+
+
+def compare(
+    current: List[Dict],
+    baseline_path: Path,
+    tolerance: float,
+    min_delta_ms: float = 2.0
+) -> List[str]:
+    """
+    Regressions: p50/p95 (end-to-end and key stages) more than
+    `tolerance` and `min_delta_ms` slower, or throughput more than
+    `tolerance` lower. The absolute floor keeps sub-millisecond
+    stages from flagging on noise.
+    """
+    baseline = {
+        (level["candidates"], level["concurrency"]): level
+        for level in json.loads(baseline_path.read_text())["levels"]
+    }
+    regressions = []
+
+    print(f"\nvs {baseline_path}")
+    print(f"{'cand':>5} {'conc':>5} {'metric':<18} {'base':>9} {'now':>9} {'change':>8}")
+
+    for level in current:
+        key = (level["candidates"], level["concurrency"])
+        base = baseline.get(key)
+        if base is None:
+            continue
+
+        # (label, baseline value, current value, higher is better)
+        metrics = [
+            ("throughput_rps", base["throughput_rps"], level["throughput_rps"], True),
+            ("e2e p50", base["latency_ms"]["p50"], level["latency_ms"]["p50"], False),
+            ("e2e p95", base["latency_ms"]["p95"], level["latency_ms"]["p95"], False)
+        ]
+        for stage in COMPARED_STAGES:
+            if stage in base["stages_ms"] and stage in level["stages_ms"]:
+                metrics.append((
+                    f"{stage} p95",
+                    base["stages_ms"][stage]["p95"],
+                    level["stages_ms"][stage]["p95"],
+                    False
+                ))
+
+        for label, before, now, higher_is_better in metrics:
+            change = (now - before) / before if before else 0.0
+            worse = -change if higher_is_better else change
+            noticeable = higher_is_better or now - before >= min_delta_ms
+            flag = " !" if worse > tolerance and noticeable else ""
+            print(f"{key[0]:>5} {key[1]:>5} {label:<18} {before:>9.1f} {now:>9.1f} {change:>+7.0%}{flag}")
+            if flag:
+                regressions.append(f"{label} at {key[0]} candidates x{key[1]}: {before} -> {now}")
+
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--candidates", type=int, nargs="+", default=[10, 25, 50])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 16])
+    parser.add_argument("--requests", type=int, default=32, help="requests per level")
+    parser.add_argument("--search-ms", type=float, default=120.0, help="Mapbox category search latency")
+    parser.add_argument("--route-ms", type=float, default=180.0, help="Mapbox matrix/directions latency")
+    parser.add_argument("--llm-ms", type=float, default=700.0, help="Gemini intent latency")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="+/- uniform jitter on every call")
+    parser.add_argument("--ranking-mode", choices=OrchestratorAgent.RANKING_MODES, default=None)
+    parser.add_argument("--warm", action="store_true",
+                        help="same query and origin for every request (caches, coalescing)")
+    parser.add_argument("--query", help="user query; recorded intents are looked up by it")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR,
+                        help="recorded responses directory")
+    parser.add_argument("--synthetic", action="store_true", help="ignore recorded fixtures")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", type=Path, help="results JSON (default: results/pipeline-<time>.json)")
+    parser.add_argument("--compare", type=Path, help="baseline results JSON")
+    parser.add_argument("--tolerance", type=float, default=0.15,
+                        help="relative slowdown reported as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=2.0,
+                        help="smallest absolute slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    fixtures = Fixtures(None if args.synthetic else args.fixtures)
+
+    print(f"{'cand':>5} {'conc':>5} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  stages p50 ms")
+    levels = []
+    for candidates in args.candidates:
+        for concurrency in args.concurrency:
+            level = run_level(candidates, concurrency, fixtures, args)
+            levels.append(level)
+
+            latency = level["latency_ms"]
+            stages = " ".join(
+                f"{name}={level['stages_ms'][name]['p50']:.0f}"
+                for name in ("intent", "search", "enrich", "score", "explain")
+                if name in level["stages_ms"]
+            )
+            print(
+                f"{candidates:>5} {concurrency:>5} {level['throughput_rps']:>8.1f} "
+                f"{latency['p50']:>8.1f} {latency['p95']:>8.1f} {latency['p99']:>8.1f}  {stages}"
+            )
+
+    now = datetime.now(timezone.utc)
+    output = args.output or RESULTS_DIR / f"pipeline-{now:%Y%m%d-%H%M%S}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "created_at": now.isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            key: str(value) if isinstance(value, Path) else value
+            for key, value in vars(args).items()
+            if key not in ("output", "compare", "tolerance", "min_delta_ms")
+        },
+        "levels": levels
+    }, indent=2) + "\n")
+    print(f"\nSaved {output}")
+
+    if args.compare:
+        regressions = compare(levels, args.compare, args.tolerance, args.min_delta_ms)
+        if regressions:
+            print("\nRegressions:\n  " + "\n  ".join(regressions))
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""
+Place record vs dict micro-benchmark.
+
+Builds N candidates the way search_places does, runs them through
+traffic/popularity enrichment and top-10 scoring, and reports peak
+memory and pipeline wall time (best of 3) for dict records, read by
+key as the agents did before, and Place records, read by attribute.
+
+    python -m backend.benchmarks.bench_place --sizes 1000 10000 50000
+"""
+import argparse
+import gc
+import random
+import time
+import tracemalloc
+
+import numpy as np
+
+from backend.agents.popularity_agent import PopularityAgent
+from backend.agents.scoring_agent import CROWD_CODES, ScoringAgent
+from backend.agents.traffic_agent import TrafficAgent
+from backend.schemas.place import Place
+from backend.schemas.user_intent import UserIntent
+
+INTENT = UserIntent(
+    descriptors=["quiet"],
+    preferences={"crowd_quietness": 0.8, "food_quality": 0.7},
+    place_types=["cafe"],
+    constraints=[],
+    time_of_day="evening"
+)
+
+
+def search_fields(i: int, rng: random.Random) -> dict:
+    return {
+        "place_id": f"poi-{i}",
+        "name": f"Place {i}",
+        "address": f"{i} Example Road",
+        "latitude": 28.6 + rng.random() / 10,
+        "longitude": 77.2 + rng.random() / 10,
+        "categories": ["cafe"],
+        "website": None,
+        "phone": None
+    }
+
+
+def build_dicts(n: int) -> list:
+    rng = random.Random(n)
+    # The dict path also carried the always-None Mapbox fields
+    return [
+        {**search_fields(i, rng), "rating": None, "user_ratings_total": None, "price_level": None}
+        for i in range(n)
+    ]
+
+
+def build_places(n: int) -> list:
+    rng = random.Random(n)
+    return [Place(**search_fields(i, rng)) for i in range(n)]
+
+
+def run_pipeline(places: list):
+    traffic, popularity, scoring = TrafficAgent(), PopularityAgent(), ScoringAgent()
+    for i, place in enumerate(places):
+        place.distance_km = 1.5
+        place.travel_time = 5 + i % 40
+        result = traffic.analyze_traffic(place)
+        place.traffic_level = result["traffic_level"]
+        place.travel_time = result["travel_time"]
+        place.travel_score = result["travel_score"]
+        pop = popularity.estimate_crowd(place=place, time_of_day=INTENT.time_of_day)
+        place.crowd_level = pop["crowd_level"]
+        place.crowd_confidence = pop["confidence"]
+    return scoring.rank_places(places, intent=INTENT, top_k=10)
+
+
+def analyze_traffic_dict(place: dict, max_acceptable_time: int = 30) -> dict:
+    # TrafficAgent.analyze_traffic as it read dicts
+    travel_time = place.get("travel_time")
+    base_time = place.get("travel_time_no_traffic")
+    penalty, traffic_level = 0.0, "low"
+    if base_time and travel_time:
+        ratio = travel_time / base_time
+        if ratio > 1.7:
+            traffic_level, penalty = "high", 0.4
+        elif ratio > 1.3:
+            traffic_level, penalty = "medium", 0.2
+    effective_time = int(travel_time * (1 + penalty)) if travel_time else travel_time
+    travel_score = max(0, 1 - effective_time / max_acceptable_time) if effective_time else None
+    return {
+        "traffic_level": traffic_level,
+        "travel_time": effective_time,
+        "travel_score": round(travel_score, 2) if travel_score else None
+    }
+
+
+def estimate_crowd_dict(place: dict, time_of_day: str = None) -> dict:
+    # PopularityAgent.estimate_crowd as it read dicts
+    score = 0.0
+    popular_times = place.get("popular_times")
+    if popular_times is not None:
+        score += popular_times / 100
+    rating_count = place.get("user_ratings_total")
+    if rating_count:
+        score += 0.4 if rating_count > 2000 else 0.2 if rating_count > 500 else 0.1
+    if time_of_day:
+        if time_of_day in ["lunch", "afternoon"]:
+            score += 0.3
+        elif time_of_day in ["evening", "night"]:
+            score += 0.4
+        else:
+            score += 0.1
+    score = min(score, 1.0)
+    crowd_level = "low" if score < 0.4 else "medium" if score < 0.7 else "high"
+    return {"crowd_level": crowd_level, "confidence": round(score, 2)}
+
+
+def rank_dicts(places: list, top_k: int) -> list:
+    # ScoringAgent.rank_places as it read dicts
+    rating = np.fromiter((p.get("rating") or 0.0 for p in places), np.float64, len(places))
+    travel = np.fromiter((p.get("travel_time") or 0.0 for p in places), np.float64, len(places))
+    crowd = np.fromiter((CROWD_CODES.get(p.get("crowd_level"), 0) for p in places), np.int8, len(places))
+    affinity = {}
+    boost = np.fromiter(
+        (affinity.get(p.get("category"), 0.0) if p.get("category") else 0.0 for p in places),
+        np.float64,
+        len(places)
+    )
+    scores = ScoringAgent._score_columns(rating, travel, crowd, boost, intent=INTENT, user_preferences=None)
+    for place, score in zip(places, scores):
+        place["final_score"] = score
+
+    keys = -np.asarray(scores)
+    kth = np.partition(keys, top_k - 1)[top_k - 1]
+    candidates = np.flatnonzero(keys <= kth)
+    order = candidates[np.argsort(keys[candidates], kind="stable")][:top_k]
+    return [places[i] for i in order.tolist()]
+
+
+def run_dict_pipeline(places: list):
+    """
+    Baseline: the same stages on dicts, with the keyed reads the
+    agents did before they switched to Place attributes.
+    """
+    for i, place in enumerate(places):
+        place["distance_km"] = 1.5
+        place["travel_time"] = 5 + i % 40
+        place.update(analyze_traffic_dict(place))
+        pop = estimate_crowd_dict(place=place, time_of_day=INTENT.time_of_day)
+        place["crowd_level"] = pop["crowd_level"]
+        place["crowd_confidence"] = pop["confidence"]
+    return rank_dicts(places, top_k=10)
+
+
+def measure(build, run, n: int):
+    # Memory and time in separate runs: tracemalloc slows every call
+    gc.collect()
+    tracemalloc.start()
+    places = build(n)
+    run(places)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del places
+
+    timings = []
+    for _ in range(3):
+        places = build(n)
+        gc.collect()
+        started = time.perf_counter()
+        run(places)
+        timings.append(time.perf_counter() - started)
+    return peak, min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 10000, 50000])
+    args = parser.parse_args()
+
+    print(f"{'n':>7} {'dict MB':>9} {'Place MB':>9} {'dict ms':>9} {'Place ms':>9}")
+    for n in args.sizes:
+        dict_peak, dict_s = measure(build_dicts, run_dict_pipeline, n)
+        place_peak, place_s = measure(build_places, run_pipeline, n)
+        print(
+            f"{n:>7} {dict_peak / 2**20:>9.1f} {place_peak / 2**20:>9.1f} "
+            f"{dict_s * 1000:>9.0f} {place_s * 1000:>9.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Offline stand-ins for Mapbox and Gemini, for benchmarks.
+
+ReplayMapboxMCP is a real MapboxMCP (caching, single-flight, parsing,
+spans) whose HTTP layer answers from fixtures instead of the network;
+ReplayIntentAgent is a real IntentExtractionAgent whose Gemini call
+returns recorded intent JSON. Both sleep for an injected latency so
+the pipeline sees realistic upstream timings.
+
+Recorded fixtures (all optional; anything missing is synthesized):
+
+    <dir>/mapbox_category/<category>.json
+        {"proximity": [lng, lat], "response": <category search response>}
+    <dir>/gemini_intent.json
+        {"<user query>": <intent JSON object>}
+
+Recorded features are shifted from the recorded proximity point to
+the request's, so one recording serves every benchmark origin.
+"""
+import asyncio
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from backend.agents.intent_extraction_agent import IntentExtractionAgent
+from backend.agents.intent_rules import RuleBasedIntentMatcher
+from backend.mcp_servers.maps_mcp import LocalMapsMCP, MapboxMCP
+from backend.schemas.user_intent import UserIntent
+from backend.utils.cache import make_cache
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+
+@dataclass
+class Latency:
+    """
+    Injected upstream latency: mean_ms +/- uniform jitter_ms.
+    """
+    mean_ms: float = 0.0
+    jitter_ms: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        jitter = rng.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        return max(0.0, self.mean_ms + jitter) / 1000
+
+
+class Fixtures:
+    """
+    Recorded responses loaded from `root`, plus synthetic fallbacks.
+    """
+
+    def __init__(self, root: Optional[Path] = FIXTURES_DIR):
+        self.categories: Dict[str, Dict] = {}
+        self.intents: Dict[str, Dict] = {}
+
+        if root is None:
+            return
+
+        for path in sorted((root / "mapbox_category").glob("*.json")):
+            self.categories[path.stem] = json.loads(path.read_text())
+
+        intents = root / "gemini_intent.json"
+        if intents.exists():
+            self.intents = json.loads(intents.read_text())
+
+    def category_response(self, category: str, lat: float, lng: float, limit: int) -> Dict:
+        recorded = self.categories.get(category)
+        if recorded is None:
+            return synthetic_category_response(category, lat, lng, limit)
+
+        rec_lng, rec_lat = recorded["proximity"]
+        features = []
+        for feature in recorded["response"]["features"][:limit]:
+            f_lng, f_lat = feature["geometry"]["coordinates"]
+            features.append({
+                **feature,
+                "geometry": {
+                    **feature["geometry"],
+                    "coordinates": [f_lng - rec_lng + lng, f_lat - rec_lat + lat]
+                }
+            })
+        return {**recorded["response"], "features": features}
+
+    def intent_json(self, user_query: str, place_types: List[str]) -> str:
+        recorded = self.intents.get(user_query)
+        if recorded is not None:
+            return json.dumps(recorded)
+        return synthetic_intent_json(place_types)
+
+
+def synthetic_category_response(category: str, lat: float, lng: float, limit: int) -> Dict:
+    """
+    Mapbox-shaped category results scattered within ~2 km of the
+    proximity point; deterministic per category and location.
+    """
+    rng = random.Random(f"{category}:{lat:.4f}:{lng:.4f}")
+    features = []
+
+    for i in range(limit):
+        radius_km = 2.0 * math.sqrt(rng.random())
+        angle = rng.uniform(0, 2 * math.pi)
+        d_lat = radius_km * math.cos(angle) / 111.0
+        d_lng = radius_km * math.sin(angle) / (111.0 * math.cos(math.radians(lat)))
+
+        features.append({
+            "type": "Feature",
+            "id": f"synthetic.{category}.{lat:.4f}.{lng:.4f}.{i}",
+            "geometry": {"type": "Point", "coordinates": [lng + d_lng, lat + d_lat]},
+            "properties": {
+                "mapbox_id": f"synthetic.{category}.{lat:.4f}.{lng:.4f}.{i}",
+                "name": f"{category.replace('_', ' ').title()} {i}",
+                "place_name": f"{i} Benchmark Road",
+                "poi_category": [category],
+                "metadata": {}
+            }
+        })
+
+    return {"type": "FeatureCollection", "features": features}
+
+
+def synthetic_intent_json(place_types: List[str]) -> str:
+    return UserIntent(
+        descriptors=["quiet"],
+        preferences={"crowd_quietness": 0.8, "food_quality": 0.6},
+        place_types=place_types,
+        constraints=[],
+        time_of_day="evening"
+    ).model_dump_json()
+
+
+def _coordinates(url: str) -> List[Tuple[float, float]]:
+    """
+    (lat, lng) pairs from a directions/matrix URL path.
+    """
+    path = urlsplit(url).path.rsplit("/", 1)[-1]
+    pairs = []
+    for point in path.split(";"):
+        lng, lat = point.split(",")
+        pairs.append((float(lat), float(lng)))
+    return pairs
+
+
+class ReplayMapboxMCP(MapboxMCP):
+    """
+    MapboxMCP answering from fixtures after an injected delay.
+    Routing is the LocalMapsMCP straight-line estimate.
+    """
+
+    def __init__(
+        self,
+        fixtures: Fixtures,
+        search_latency: Latency = Latency(),
+        route_latency: Latency = Latency(),
+        seed: int = 0
+    ):
+        # Fresh caches per run, so runs do not warm each other
+        super().__init__(
+            search_cache=make_cache("replay_search", maxsize=self.SEARCH_CACHE_SIZE,
+                                    ttl=self.SEARCH_CACHE_TTL_S, shared=False),
+            travel_cache=make_cache("replay_travel", maxsize=self.TRAVEL_CACHE_SIZE,
+                                    ttl=self.TRAVEL_TIME_BUCKET_S, shared=False)
+        )
+        self.fixtures = fixtures
+        self.search_latency = search_latency
+        self.route_latency = route_latency
+        self.local = LocalMapsMCP()
+        self.calls: Dict[str, int] = {"search": 0, "matrix": 0, "directions": 0}
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _access_token(self) -> str:
+        # Nothing is sent, and MAPBOX_TOKEN stays untouched for real clients
+        return "replay"
+
+    def _respond(self, url: str, params: Optional[Dict]) -> Tuple[Dict, float]:
+        params = params or {}
+
+        with self._lock:
+            if url.startswith(self.SEARCH_URL):
+                self.calls["search"] += 1
+                delay = self.search_latency.sample(self._rng)
+            else:
+                kind = "matrix" if url.startswith(self.MATRIX_URL) else "directions"
+                self.calls[kind] += 1
+                delay = self.route_latency.sample(self._rng)
+
+        if url.startswith(self.SEARCH_URL):
+            lng, lat = (float(v) for v in params["proximity"].split(","))
+            category = url.rsplit("/", 1)[-1]
+            return self.fixtures.category_response(category, lat, lng, int(params["limit"])), delay
+
+        origin, *destinations = _coordinates(url)
+        travel = self.local.get_travel_times(origin, destinations)
+
+        if url.startswith(self.MATRIX_URL):
+            return {
+                "code": "Ok",
+                "durations": [[t["travel_time"] * 60.0 for t in travel]],
+                "distances": [[t["distance_km"] * 1000.0 for t in travel]]
+            }, delay
+
+        return {
+            "code": "Ok",
+            "routes": [{
+                "duration": travel[0]["travel_time"] * 60.0,
+                "distance": travel[0]["distance_km"] * 1000.0
+            }]
+        }, delay
+
+    def _fetch_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        data, delay = self._respond(url, params)
+        time.sleep(delay)
+        return data
+
+    async def _afetch_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        data, delay = self._respond(url, params)
+        await asyncio.sleep(delay)
+        return data
+
+
+class ReplayIntentAgent(IntentExtractionAgent):
+    """
+    IntentExtractionAgent whose Gemini call replays recorded (or
+    synthetic) intent JSON. Rules and cache are off by default so
+    every request pays for the LLM round trip, as a cold query would.
+    """
+
+    def __init__(
+        self,
+        fixtures: Fixtures,
+        place_types: List[str],
+        latency: Latency = Latency(),
+        use_rules: bool = False,
+        use_cache: bool = False,
+        seed: int = 0
+    ):
+        # A threshold above 1 means the matcher never answers
+        rules = None if use_rules else RuleBasedIntentMatcher(threshold=2.0)
+        super().__init__(use_cache=use_cache, rules=rules)
+        self.fixtures = fixtures
+        self.place_types = place_types
+        self.latency = latency
+        self.calls = 0
+
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _replay(self, user_query: str) -> Tuple[str, float]:
+        with self._lock:
+            self.calls += 1
+            delay = self.latency.sample(self._rng)
+        return self.fixtures.intent_json(user_query, self.place_types), delay
+
+    def extract(self, user_query: str, bypass_cache: bool = False) -> UserIntent:
+        local = self._local(user_query, bypass_cache)
+        if local is not None:
+            return local
+
+        raw_output, delay = self._replay(user_query)
+        time.sleep(delay)
+        return self._remember(user_query, raw_output)
+
+    async def aextract(self, user_query: str, bypass_cache: bool = False) -> UserIntent:
+        local = self._local(user_query, bypass_cache)
+        if local is not None:
+            return local
+
+        raw_output, delay = self._replay(user_query)
+        await asyncio.sleep(delay)
+        return self._remember(user_query, raw_output)
@@ -0,0 +1,148 @@
+"""
+Async counterparts of backend.db.crud for request handlers.
+
+Same operations and the same caches (preferences, visited sets), on
+an AsyncSession; crud stays the sync API for scripts and background
+work.
+"""
+import copy
+from datetime import datetime
+from typing import Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.db.crud import _preferences_cache, _visited_cache
+from backend.db.models import User, UserPreference, VisitedPlace
+from backend.schemas.visited import VisitedSet
+
+# -------------------------
+# User (authentication)
+# -------------------------
+
+async def get_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    return await db.get(User, user_id)
+
+
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
+
+
+async def get_user_by_login(db: AsyncSession, identifier: str) -> Optional[User]:
+    """
+    Retrieve a user by ID or email (login accepts either)
+    """
+    result = await db.execute(
+        select(User).where((User.id == identifier) | (User.email == identifier))
+    )
+    return result.scalars().first()
+
+
+async def update_user_password(db: AsyncSession, user: User, hashed_password: str) -> User:
+    user.hashed_password = hashed_password
+    await db.commit()
+    return user
+
+
+async def create_user(db: AsyncSession, user_id: str, email: str, hashed_password: str) -> User:
+    user = User(
+        id=user_id,
+        email=email,
+        hashed_password=hashed_password,
+        created_at=datetime.utcnow()
+    )
+    db.add(user)
+    await db.commit()
+    return user
+
+
+# -------------------------
+# UserPreference (personalization)
+# -------------------------
+
+async def get_user_preferences(db: AsyncSession, user_id: str) -> Optional[UserPreference]:
+    return await db.get(UserPreference, user_id)
+
+
+async def get_cached_preferences(db: AsyncSession, user_id: str) -> Optional[Dict]:
+    """
+    See crud.get_cached_preferences (same cache).
+    """
+    preferences = _preferences_cache.get(user_id)
+    if preferences is None:
+        record = await get_user_preferences(db, user_id)
+        preferences = copy.deepcopy(record.preferences) if record else {}
+        _preferences_cache.set(user_id, preferences)
+    return preferences or None
+
+
+async def create_or_update_user_preference(
+    db: AsyncSession,
+    user_id: str,
+    preferences: dict
+) -> UserPreference:
+    record = await get_user_preferences(db, user_id)
+    if not record:
+        record = UserPreference(
+            user_id=user_id,
+            preferences=preferences,
+            last_updated=datetime.utcnow()
+        )
+        db.add(record)
+    else:
+        record.preferences = preferences
+        record.last_updated = datetime.utcnow()
+    await db.commit()
+    _preferences_cache.set(user_id, copy.deepcopy(preferences))
+    return record
+
+
+async def delete_user_preferences(db: AsyncSession, user_id: str) -> Optional[UserPreference]:
+    record = await get_user_preferences(db, user_id)
+    if record:
+        await db.delete(record)
+        await db.commit()
+    _preferences_cache.delete(user_id)
+    return record
+
+
+# -------------------------
+# VisitedPlace (visit history)
+# -------------------------
+
+async def get_visited_set(db: AsyncSession, user_id: str) -> VisitedSet:
+    """
+    See crud.get_visited_set (same cache).
+    """
+    visited = _visited_cache.get(user_id)
+    if visited is None:
+        result = await db.execute(
+            select(VisitedPlace.place_id).where(VisitedPlace.user_id == user_id)
+        )
+        visited = VisitedSet(place_ids=frozenset(result.scalars().all()))
+        _visited_cache.set(user_id, visited)
+    return visited
+
+
+async def add_visited_place(
+    db: AsyncSession,
+    user_id: str,
+    place_id: str,
+    place_name: str = None
+):
+    if await db.get(VisitedPlace, (user_id, place_id)) is None:
+        db.add(VisitedPlace(
+            user_id=user_id,
+            place_id=place_id,
+            place_name=place_name,
+            visited_at=datetime.utcnow()
+        ))
+        try:
+            await db.commit()
+        except IntegrityError:
+            # The same visit recorded concurrently
+            await db.rollback()
+
+    _visited_cache.delete(user_id)
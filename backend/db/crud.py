@@ -1,8 +1,16 @@
 """
 CRUD operations for database models
 """
+import copy
+import json
+import os
+from typing import Dict, Optional
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from backend.db.models import User, UserPreference
+from backend.db.models import User, UserPreference, VisitedPlace
+from backend.schemas.visited import VisitedSet
+from backend.utils.cache import make_cache
 from datetime import datetime
 
 # -------------------------
@@ -23,6 +31,24 @@ def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
 
+def get_user_by_login(db: Session, identifier: str):
+    """
+    Retrieve a user by ID or email (login accepts either)
+    """
+    return db.query(User).filter(
+        (User.id == identifier) | (User.email == identifier)
+    ).first()
+
+
+def update_user_password(db: Session, user: User, hashed_password: str):
+    """
+    Replace a user's password hash
+    """
+    user.hashed_password = hashed_password
+    db.commit()
+    return user
+
+
 def create_user(db: Session, user_id: str, email: str, hashed_password: str):
     """
     Create a new user record
@@ -50,19 +76,174 @@ def get_user_preferences(db: Session, user_id: str):
     return db.query(UserPreference).filter(UserPreference.user_id == user_id).first()
 
 
-def add_visited_place(db: Session, user_id: str, place_name: str):
+# Per-worker cache of preference dicts for the recommendation path.
+# Writes below update or drop the entry; the short TTL bounds how long
+# another worker's write can go unseen.
+PREFERENCES_CACHE_TTL_S = float(os.getenv("PREFERENCES_CACHE_TTL_S", "30"))
+PREFERENCES_CACHE_SIZE = int(os.getenv("PREFERENCES_CACHE_SIZE", "10000"))
+
+_preferences_cache = make_cache(
+    "user_preferences",
+    maxsize=PREFERENCES_CACHE_SIZE,
+    ttl=PREFERENCES_CACHE_TTL_S,
+    shared=False
+)
+
+
+def get_cached_preferences(db: Session, user_id: str) -> Optional[Dict]:
     """
-    Add a visited place to user preferences
+    A user's preferences dict, or None without any (cached).
+    The dict is shared between requests: read it, never mutate it.
     """
-    record = get_user_preferences(db, user_id)
-    if record:
-        visited = record.preferences.get("visited_places", [])
-        if place_name not in visited:
-            visited.append(place_name)
-            record.preferences["visited_places"] = visited
-            record.last_updated = datetime.utcnow()
+    preferences = _preferences_cache.get(user_id)
+    if preferences is None:
+        record = get_user_preferences(db, user_id)
+        # {} caches "no preferences" too
+        preferences = copy.deepcopy(record.preferences) if record else {}
+        _preferences_cache.set(user_id, preferences)
+    return preferences or None
+
+
+# -------------------------
+# VisitedPlace (visit history)
+# -------------------------
+
+# Per-user visited sets, dropped on every write; shared across
+# workers when CACHE_BACKEND_URL is set, so a visit is seen everywhere
+VISITED_CACHE_TTL_S = float(os.getenv("VISITED_CACHE_TTL_S", "600"))
+
+_visited_cache = make_cache("visited_places", maxsize=4096, ttl=VISITED_CACHE_TTL_S)
+
+
+def get_visited_set(db: Session, user_id: str) -> VisitedSet:
+    """
+    All place_ids a user has visited, as a set view (cached)
+    """
+    visited = _visited_cache.get(user_id)
+    if visited is None:
+        rows = db.query(VisitedPlace.place_id).filter(VisitedPlace.user_id == user_id).all()
+        visited = VisitedSet(place_ids=frozenset(place_id for place_id, in rows))
+        _visited_cache.set(user_id, visited)
+    return visited
+
+
+def add_visited_place(db: Session, user_id: str, place_id: str, place_name: str = None):
+    """
+    Record a visit (idempotent) and invalidate the user's visited set
+    """
+    if db.get(VisitedPlace, (user_id, place_id)) is None:
+        db.add(VisitedPlace(
+            user_id=user_id,
+            place_id=place_id,
+            place_name=place_name,
+            visited_at=datetime.utcnow()
+        ))
+        try:
             db.commit()
-            db.refresh(record)
+        except IntegrityError:
+            # The same visit recorded concurrently
+            db.rollback()
+
+    _visited_cache.delete(user_id)
+
+
+# Place-type affinity: a user's first signal starts its type at 1.0,
+# every later signal adds 0.1
+AFFINITY_FIRST_SIGNAL = 1.0
+AFFINITY_STEP = 0.1
+
+# One statement per user: the row lock taken by ON CONFLICT makes the
+# read-modify-write atomic, so concurrent flushes never lose increments
+_UPSERT_AFFINITY = text("""
+INSERT INTO user_preferences AS up (user_id, preferences, last_updated)
+VALUES (
+    :user_id,
+    jsonb_build_object('place_type_affinity', CAST(:initial AS JSONB)),
+    :now
+)
+ON CONFLICT (user_id) DO UPDATE SET
+    preferences = jsonb_set(
+        up.preferences,
+        '{place_type_affinity}',
+        COALESCE(up.preferences -> 'place_type_affinity', CAST('{}' AS JSONB)) || (
+            SELECT jsonb_object_agg(
+                d.key,
+                COALESCE(CAST(up.preferences -> 'place_type_affinity' ->> d.key AS FLOAT), 0)
+                    + CAST(d.value AS FLOAT)
+            )
+            FROM jsonb_each_text(CAST(:deltas AS JSONB)) AS d
+        )
+    ),
+    last_updated = :now
+""")
+
+
+def _initial_affinity(counts: Dict[str, int]) -> Dict[str, float]:
+    """
+    Affinity of a user with no preference row yet after `counts`
+    signals (in arrival order, so the first key came first).
+    """
+    affinity = {place_type: AFFINITY_STEP * count for place_type, count in counts.items()}
+    first, count = next(iter(counts.items()))
+    affinity[first] = AFFINITY_FIRST_SIGNAL + AFFINITY_STEP * (count - 1)
+    return affinity
+
+
+def apply_affinity_signals(db: Session, signals: Dict[str, Dict[str, int]]):
+    """
+    Apply buffered interaction signals ({user_id: {place_type: count}})
+    in one transaction, one upsert per user
+    """
+    if not signals:
+        return
+
+    now = datetime.utcnow()
+    # Fixed lock order across concurrent flushes (no deadlocks)
+    users = sorted(signals)
+
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(_UPSERT_AFFINITY, [
+            {
+                "user_id": user_id,
+                "initial": json.dumps(_initial_affinity(signals[user_id])),
+                "deltas": json.dumps({
+                    place_type: AFFINITY_STEP * count
+                    for place_type, count in signals[user_id].items()
+                }),
+                "now": now
+            }
+            for user_id in users
+        ])
+    else:
+        for user_id in users:
+            record = (
+                db.query(UserPreference)
+                .filter(UserPreference.user_id == user_id)
+                .with_for_update()
+                .first()
+            )
+            if record is None:
+                db.add(UserPreference(
+                    user_id=user_id,
+                    preferences={"place_type_affinity": _initial_affinity(signals[user_id])},
+                    last_updated=now
+                ))
+                continue
+
+            # JSONB is not mutation-tracked: assign a new dict
+            prefs = dict(record.preferences)
+            affinity = dict(prefs.get("place_type_affinity", {}))
+            for place_type, count in signals[user_id].items():
+                affinity[place_type] = affinity.get(place_type, 0.0) + AFFINITY_STEP * count
+            prefs["place_type_affinity"] = affinity
+            record.preferences = prefs
+            record.last_updated = now
+
+    db.commit()
+
+    # New values were computed in SQL; reload on next read
+    for user_id in users:
+        _preferences_cache.delete(user_id)
 
 
 def create_or_update_user_preference(db: Session, user_id: str, preferences: dict):
@@ -81,6 +262,7 @@ def create_or_update_user_preference(db: Session, user_id: str, preferences: dic
         record.preferences = preferences
         record.last_updated = datetime.utcnow()
     db.commit()
+    _preferences_cache.set(user_id, copy.deepcopy(preferences))
     return record
 
 
@@ -92,4 +274,5 @@ def delete_user_preferences(db: Session, user_id: str):
     if record:
         db.delete(record)
         db.commit()
+    _preferences_cache.delete(user_id)
     return record
@@ -1,8 +1,8 @@
-from backend.db.session import engine
+from backend.db.session import get_engine
 from backend.db.models import Base
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_engine())
 
 if __name__ == "__main__":
     init_db()
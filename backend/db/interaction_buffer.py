@@ -0,0 +1,239 @@
+"""
+Write-behind buffer for /user/interact preference signals.
+
+Clicks are accepted in memory and aggregated per user as
+{place_type: count}; a background thread flushes them every
+FLUSH_INTERVAL_S, or sooner once FLUSH_SIZE signals are pending, as
+one transaction with a single atomic upsert per user. That replaces a
+SELECT + full JSONB rewrite + commit per click, and the lost updates
+when one user's clicks raced each other.
+
+The buffer is bounded: past MAX_PENDING signals, record() raises
+InteractionBufferFull instead of growing without limit. Pending signals
+are flushed on shutdown (close()); after that record() raises
+InteractionBufferClosed, since no flusher would ever write them. A
+crash loses at most one interval.
+
+Only transient failures (database unreachable, pool timeout, deadlock)
+put a batch back. Otherwise the batch is retried user by user, and the
+users that still fail (constraint violation, deleted user) are dropped
+and counted instead of being retried forever.
+"""
+import logging
+import os
+import threading
+from typing import Callable, Dict, Optional
+
+from sqlalchemy.exc import DBAPIError, DisconnectionError, OperationalError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from backend.db.crud import apply_affinity_signals
+from backend.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+Signals = Dict[str, Dict[str, int]]
+
+
+class InteractionBufferFull(RuntimeError):
+    """
+    Raised when MAX_PENDING signals are waiting for a flush.
+    """
+
+
+class InteractionBufferClosed(RuntimeError):
+    """
+    Raised by record() once close() has run (shutdown).
+    """
+
+
+def _is_transient(error: Exception) -> bool:
+    if isinstance(error, (OperationalError, PoolTimeoutError, DisconnectionError, ConnectionError)):
+        return True
+    return isinstance(error, DBAPIError) and error.connection_invalidated
+
+
+def _write_signals(signals: Signals):
+    db = SessionLocal()
+    try:
+        apply_affinity_signals(db, signals)
+    finally:
+        db.close()
+
+
+class InteractionBuffer:
+
+    FLUSH_INTERVAL_S = float(os.getenv("INTERACTION_FLUSH_INTERVAL_S", "1.0"))
+    FLUSH_SIZE = int(os.getenv("INTERACTION_FLUSH_SIZE", "500"))
+    MAX_PENDING = int(os.getenv("INTERACTION_MAX_PENDING", "20000"))
+
+    def __init__(
+        self,
+        sink: Optional[Callable[[Signals], None]] = None,
+        flush_interval_s: Optional[float] = None,
+        flush_size: Optional[int] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.sink = sink or _write_signals
+        self.flush_interval_s = flush_interval_s or self.FLUSH_INTERVAL_S
+        self.flush_size = flush_size or self.FLUSH_SIZE
+        self.max_pending = max_pending or self.MAX_PENDING
+
+        self._pending: Signals = {}
+        self._count = 0
+        self._lock = threading.Lock()
+
+        # One flush at a time (timer, size trigger and close())
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+
+        self.accepted = 0
+        self.rejected = 0
+        self.flushes = 0
+        self.flush_failures = 0
+        self.dropped = 0
+
+    def record(self, user_id: str, place_type: str):
+        """
+        Queue one signal; returns without touching the database.
+        """
+        with self._lock:
+            if self._closed:
+                self.rejected += 1
+                raise InteractionBufferClosed("Interaction buffer is closed")
+            if self._count >= self.max_pending:
+                self.rejected += 1
+                raise InteractionBufferFull("Interaction buffer is full")
+
+            counts = self._pending.setdefault(user_id, {})
+            counts[place_type] = counts.get(place_type, 0) + 1
+            self._count += 1
+            self.accepted += 1
+
+            if self._count >= self.flush_size:
+                self._wake.set()
+
+        self._ensure_flusher()
+
+    def pending(self) -> int:
+        with self._lock:
+            return self._count
+
+    def flush(self) -> int:
+        """
+        Write everything pending now; returns the signals written.
+        After a transient failure the batch is put back for the next
+        attempt; any other failure is isolated per user.
+        """
+        with self._flush_lock:
+            with self._lock:
+                batch, count = self._pending, self._count
+                self._pending, self._count = {}, 0
+
+            if not batch:
+                return 0
+
+            try:
+                self.sink(batch)
+            except Exception as e:
+                self.flush_failures += 1
+                if _is_transient(e):
+                    logger.warning("Flushing %d interaction signals failed, will retry: %s", count, e)
+                    self._requeue(batch, count)
+                    return 0
+                if len(batch) == 1:
+                    self._drop(batch, e)
+                    return 0
+                logger.warning("Flushing %d interaction signals failed, retrying per user: %s", count, e)
+                return self._flush_each(batch)
+
+            self.flushes += 1
+            return count
+
+    def _flush_each(self, batch: Signals) -> int:
+        written = 0
+        retry: Signals = {}
+
+        for user_id, counts in batch.items():
+            try:
+                self.sink({user_id: counts})
+            except Exception as e:
+                if _is_transient(e):
+                    retry[user_id] = counts
+                else:
+                    self._drop({user_id: counts}, e)
+                continue
+            written += sum(counts.values())
+
+        if retry:
+            self._requeue(retry, sum(sum(c.values()) for c in retry.values()))
+        if written:
+            self.flushes += 1
+        return written
+
+    def _drop(self, batch: Signals, error: Exception):
+        count = sum(sum(c.values()) for c in batch.values())
+        logger.error(
+            "Dropping %d interaction signals for %s: %s", count, ", ".join(batch), error
+        )
+        with self._lock:
+            self.dropped += count
+
+    def _requeue(self, batch: Signals, count: int):
+        with self._lock:
+            # Older signals first, so a new user's first type stays first
+            for user_id, newer in self._pending.items():
+                counts = batch.setdefault(user_id, {})
+                for place_type, n in newer.items():
+                    counts[place_type] = counts.get(place_type, 0) + n
+            self._pending = batch
+            self._count += count
+
+    def _ensure_flusher(self):
+        if self._thread is not None or self._closed:
+            return
+        with self._lock:
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(
+                    target=self._run,
+                    name="interaction-flusher",
+                    daemon=True
+                )
+                self._thread.start()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval_s)
+            self._wake.clear()
+            self.flush()
+
+    def close(self, timeout: float = 10.0):
+        """
+        Stop the flusher and write whatever is still pending.
+        Signals recorded from here on are refused.
+        """
+        with self._lock:
+            # Under the lock: a record() either lands before the final
+            # flush or sees the flag
+            self._closed = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "pending": self._count,
+                "pending_users": len(self._pending),
+                "accepted": self.accepted,
+                "rejected": self.rejected,
+                "flushes": self.flushes,
+                "flush_failures": self.flush_failures,
+                "dropped": self.dropped
+            }
+
+
+interaction_buffer = InteractionBuffer()
@@ -26,6 +26,19 @@ class UserPreference(Base):
     last_updated = Column(DateTime, default=datetime.utcnow)
 
 
+class VisitedPlace(Base):
+    """
+    One row per place a user has visited; the composite primary key
+    makes "has user X visited place Y" an index lookup.
+    """
+    __tablename__ = "visited_places"
+
+    user_id = Column(String, ForeignKey("users.id"), primary_key=True)
+    place_id = Column(String, primary_key=True)
+    place_name = Column(String)
+    visited_at = Column(DateTime, default=datetime.utcnow)
+
+
 class Booking(Base):
     __tablename__ = "bookings"
 
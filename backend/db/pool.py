@@ -0,0 +1,126 @@
+"""
+Connection pools that report checkout waits and saturation.
+
+MeteredQueuePool / MeteredAsyncQueuePool time every checkout (the
+wait for a free connection, or for a new one to be opened) and count
+pool timeouts; PoolStats adds live occupancy from the pool itself.
+Served at /metrics/db.
+"""
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Checkouts slower than this count as having waited
+WAIT_THRESHOLD_S = 0.001
+
+
+class PoolStats:
+
+    def __init__(self, name: str):
+        self.name = name
+        self.pool: Optional[QueuePool] = None
+        self.checkouts = 0
+        self.waited = 0
+        self.timeouts = 0
+        self.total_wait_s = 0.0
+        self.max_wait_s = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, wait_s: float, timed_out: bool):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait_s += wait_s
+            self.max_wait_s = max(self.max_wait_s, wait_s)
+            if wait_s > WAIT_THRESHOLD_S:
+                self.waited += 1
+            if timed_out:
+                self.timeouts += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            stats = {
+                "checkouts": self.checkouts,
+                "waited": self.waited,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": round(self.total_wait_s / self.checkouts * 1000, 3)
+                if self.checkouts else None,
+                "max_wait_ms": round(self.max_wait_s * 1000, 3)
+            }
+
+        pool = self.pool
+        if pool is not None:
+            capacity = pool.size() + max(pool._max_overflow, 0)
+            checked_out = pool.checkedout()
+            stats.update({
+                "size": pool.size(),
+                "max_overflow": pool._max_overflow,
+                "checked_out": checked_out,
+                "idle": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+                "saturation": round(checked_out / capacity, 3) if capacity > 0 else None
+            })
+        return stats
+
+
+_stats: Dict[str, PoolStats] = {}
+_stats_lock = threading.Lock()
+
+
+def pool_stats(name: str) -> PoolStats:
+    with _stats_lock:
+        if name not in _stats:
+            _stats[name] = PoolStats(name)
+        return _stats[name]
+
+
+class _Metered:
+    """
+    Mixin timing QueuePool._do_get, i.e. the whole checkout wait.
+    Stats are looked up by STATS_NAME, so pools recreated on dispose
+    or recycle keep reporting into the same counters.
+    """
+
+    STATS_NAME = "default"
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = pool_stats(self.STATS_NAME)
+        self.stats.pool = self
+
+    def _do_get(self):
+        started = time.perf_counter()
+        timed_out = False
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            timed_out = True
+            raise
+        finally:
+            self.stats.record(time.perf_counter() - started, timed_out)
+
+
+class MeteredQueuePool(_Metered, QueuePool):
+    pass
+
+
+class MeteredAsyncQueuePool(_Metered, AsyncAdaptedQueuePool):
+    pass
+
+
+def metered(pool_class: type, name: str) -> type:
+    """
+    pool_class reporting as `name` (engines take a class, not kwargs).
+    """
+    return type(f"{pool_class.__name__}[{name}]", (pool_class,), {"STATS_NAME": name})
+
+
+def get_db_pool_metrics() -> Dict[str, Dict]:
+    """
+    Checkout waits and occupancy for every metered pool.
+    """
+    with _stats_lock:
+        stats = dict(_stats)
+    return {name: s.snapshot() for name, s in stats.items()}
@@ -1,18 +1,139 @@
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from typing import Dict, Tuple
 import os
 
+from backend.db.pool import MeteredAsyncQueuePool, MeteredQueuePool, metered
+from backend.utils.providers import provider
+
 load_dotenv()
 
-DATABASE_URL = os.getenv("DATABASE_URL")
+# Per engine and per worker: gunicorn runs 4 workers, each with a sync
+# and an async engine, so budget (size + overflow) x 8 server slots
+POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "5"))
+# Fail fast under bursts instead of queueing requests for 30 s
+POOL_TIMEOUT_S = float(os.getenv("DB_POOL_TIMEOUT_S", "5"))
+# Below typical server/proxy idle timeouts
+POOL_RECYCLE_S = int(os.getenv("DB_POOL_RECYCLE_S", "1800"))
+# asyncpg prepared statements per connection; 0 behind pgbouncer
+# in transaction mode
+STATEMENT_CACHE_SIZE = int(os.getenv("DB_STATEMENT_CACHE_SIZE", "100"))
+
+
+def _database_url() -> str:
+    database_url = os.getenv("DATABASE_URL")
+    if not database_url:
+        raise RuntimeError("DATABASE_URL not set")
+    return database_url
+
+
+def _pool_options(url: str, pool_class: type, name: str) -> Dict:
+    # SQLite (tests, local) keeps SQLAlchemy's default pool
+    if make_url(url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "poolclass": metered(pool_class, name),
+        "pool_size": POOL_SIZE,
+        "max_overflow": MAX_OVERFLOW,
+        "pool_timeout": POOL_TIMEOUT_S,
+        "pool_recycle": POOL_RECYCLE_S,
+        "pool_pre_ping": True
+    }
+
+
+def async_database_url(url: str) -> Tuple[str, Dict]:
+    """
+    DATABASE_URL rewritten for an async driver, plus connect_args.
+    postgres(ql)[+psycopg2]:// becomes postgresql+asyncpg://, with
+    libpq's sslmode mapped to asyncpg's ssl.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+
+    if backend == "sqlite":
+        return parsed.set(drivername="sqlite+aiosqlite").render_as_string(hide_password=False), {}
+
+    if backend not in ("postgres", "postgresql"):
+        raise RuntimeError(f"No async driver configured for {backend}")
+
+    query = dict(parsed.query)
+    connect_args: Dict = {"statement_cache_size": STATEMENT_CACHE_SIZE}
+    sslmode = query.pop("sslmode", None)
+    if sslmode:
+        connect_args["ssl"] = sslmode
+    query["prepared_statement_cache_size"] = str(STATEMENT_CACHE_SIZE)
+
+    parsed = parsed.set(drivername="postgresql+asyncpg", query=query)
+    return parsed.render_as_string(hide_password=False), connect_args
+
+
+def _create_engine():
+    database_url = _database_url()
+    options = _pool_options(database_url, MeteredQueuePool, "sync")
+    options.setdefault("pool_pre_ping", True)
+    return create_engine(database_url, **options)
+
+
+def _create_async_engine():
+    url, connect_args = async_database_url(_database_url())
+    return create_async_engine(
+        url,
+        connect_args=connect_args,
+        **_pool_options(url, MeteredAsyncQueuePool, "async")
+    )
 
-engine = create_engine(DATABASE_URL, pool_pre_ping=True)
 
-SessionLocal = sessionmaker(
+db_engine = provider("db_engine", _create_engine)
+async_db_engine = provider("async_db_engine", _create_async_engine)
+
+
+def get_engine():
+    return db_engine.get()
+
+
+def get_async_engine():
+    return async_db_engine.get()
+
+
+_session_factory = sessionmaker(
     autocommit=False,
+    autoflush=False
+)
+
+# expire_on_commit=False: attributes stay readable after commit
+# without another (awaited) round trip
+_async_session_factory = async_sessionmaker(
+    class_=AsyncSession,
     autoflush=False,
-    bind=engine
+    expire_on_commit=False
 )
 
-get_db = SessionLocal
\ No newline at end of file
+
+def SessionLocal():
+    """
+    Opens a session on the lazily created engine.
+    Sync path: scripts, background flushes.
+    """
+    return _session_factory(bind=get_engine())
+
+
+def AsyncSessionLocal() -> AsyncSession:
+    """
+    Opens an async session on the lazily created async engine.
+    Request path.
+    """
+    return _async_session_factory(bind=get_async_engine())
+
+
+get_db = SessionLocal
+
+
+def __getattr__(name):
+    # Keeps `from backend.db.session import engine` working
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
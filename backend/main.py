@@ -1,13 +1,39 @@
-from fastapi import FastAPI, Depends
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Request
+from fastapi.responses import PlainTextResponse
 from backend.api.router import router as api_router
 from backend.db.session import get_db
+from backend.mcp_servers.base_mcp import get_pool_metrics
+from backend.utils.cache import get_cache_stats
+from backend.utils.singleflight import get_singleflight_stats
+from backend.agents.intent_extraction_agent import intent_path_stats
+from backend.utils.providers import warm_up
+from backend.auth.security import token_cache_stats
+from backend.agents.orchestrator import ranking_stats
+from backend.db.interaction_buffer import interaction_buffer
+from backend.db.pool import get_db_pool_metrics
+from backend.utils.tracing import render_prometheus, trace
 from sqlalchemy.orm import Session
 from dotenv import load_dotenv
 from fastapi.middleware.cors import CORSMiddleware
 
 load_dotenv()
 
-app = FastAPI(title="TableScout Backend")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Clients are built on first use. EAGER_PROVIDERS (e.g.
+    # "gemini,db_engine,orchestrator") moves that cost to worker boot.
+    eager = [name for name in os.getenv("EAGER_PROVIDERS", "").split(",") if name]
+    if eager:
+        warm_up(eager)
+    yield
+    # Write-behind interaction signals must not be lost on deploys
+    interaction_buffer.close()
+
+
+app = FastAPI(title="TableScout Backend", lifespan=lifespan)
 
 # Enable CORS for frontend
 app.add_middleware(
@@ -22,6 +48,22 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Opt-in per-request stage breakdown: with TRACE_TIMING_HEADER=1, a
+# request sending "X-Trace-Timing: 1" gets a Server-Timing header
+TRACE_TIMING_HEADER = os.getenv("TRACE_TIMING_HEADER", "0") == "1"
+
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    with trace() as current:
+        response = await call_next(request)
+        # Streaming bodies are still running here; their header only
+        # covers the stages finished before the first byte
+        if TRACE_TIMING_HEADER and request.headers.get("x-trace-timing") == "1":
+            response.headers["Server-Timing"] = current.server_timing()
+    return response
+
+
 app.include_router(api_router)
 
 @app.get("/health")
@@ -32,3 +74,69 @@ def health(db: Session = Depends(get_db)):
         return {"status": "ok", "db": "connected"}
     except Exception as e:
         return {"status": "error", "db": "not connected", "detail": str(e)}
+
+
+@app.get("/metrics/mcp")
+def mcp_metrics():
+    """
+    Per-host upstream pool metrics and circuit breaker state
+    """
+    return get_pool_metrics()
+
+
+@app.get("/metrics/cache")
+def cache_metrics():
+    """
+    Hit/miss counters for the in-process and shared caches,
+    plus calls coalesced by single-flight
+    """
+    return {**get_cache_stats(), "singleflight": get_singleflight_stats()}
+
+
+@app.get("/metrics/intent")
+def intent_metrics():
+    """
+    Share of intent extractions served by rules, cache, or the LLM
+    """
+    return intent_path_stats.snapshot()
+
+
+@app.get("/metrics/auth")
+def auth_metrics():
+    """
+    Verified-token cache hits and the JWT decode work they saved
+    """
+    return token_cache_stats()
+
+
+@app.get("/metrics/ranking")
+def ranking_metrics():
+    """
+    Candidates ranked vs routed; enrichment skipped by branch-and-bound
+    """
+    return ranking_stats.snapshot()
+
+
+@app.get("/metrics/db")
+def db_metrics():
+    """
+    Connection pool checkout waits, timeouts and saturation
+    (sync and async engines, once each is in use)
+    """
+    return get_db_pool_metrics()
+
+
+@app.get("/metrics/interactions")
+def interaction_metrics():
+    """
+    Buffered /user/interact signals: pending, rejected, flushes
+    """
+    return interaction_buffer.snapshot()
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """
+    Per-stage and per-upstream latency histograms (Prometheus text format)
+    """
+    return PlainTextResponse(render_prometheus(), media_type="text/plain; version=0.0.4")
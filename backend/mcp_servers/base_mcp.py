@@ -0,0 +1,381 @@
+"""
+Shared HTTP transport for MCP servers.
+
+Every MCP talks to its upstream through BaseMCP._get_json / _aget_json,
+which provide:
+- pooled keep-alive connections (one requests.Session per process,
+  one httpx.AsyncClient per event loop)
+- bounded retries with jittered exponential backoff on 429/5xx
+- a per-host circuit breaker that fails fast while a host is down
+- per-host request metrics (see get_pool_metrics)
+"""
+import asyncio
+import random
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from backend.utils.tracing import span
+
+
+class MCPError(RuntimeError):
+    """
+    Raised when an upstream call fails after all retries.
+    """
+
+
+class CircuitOpenError(MCPError):
+    """
+    Raised without touching the network while a host's breaker is open.
+    """
+
+
+class CircuitBreaker:
+    """
+    Classic closed → open → half-open breaker.
+    Opens after `failure_threshold` consecutive failures and lets a
+    single trial request through once `reset_timeout_s` has passed.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout_s = reset_timeout_s
+
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_started_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == self.OPEN and self._cooled_down():
+                return self.HALF_OPEN
+            return self._state
+
+    def _cooled_down(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.reset_timeout_s
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN and self._cooled_down():
+                self._state = self.HALF_OPEN
+                self._trial_started_at = None
+
+            if self._state == self.HALF_OPEN:
+                now = time.monotonic()
+                # A trial that never reported back (e.g. its task was
+                # cancelled) must not wedge the breaker half-open
+                trial_stale = (
+                    self._trial_started_at is not None
+                    and now - self._trial_started_at >= self.reset_timeout_s
+                )
+                if self._trial_started_at is None or trial_stale:
+                    self._trial_started_at = now
+                    return True
+
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._trial_started_at = None
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_started_at = None
+
+            if self._state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class HostMetrics:
+    """
+    Counters for one upstream host. Updated from request threads
+    and event loops alike, hence the lock.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.retries = 0
+        self.short_circuited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.total_latency_s = 0.0
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+    def finish(self, latency_s: float, failed: bool):
+        with self._lock:
+            self.in_flight -= 1
+            self.total_latency_s += latency_s
+            if failed:
+                self.failures += 1
+
+    def retry(self):
+        with self._lock:
+            self.retries += 1
+
+    def short_circuit(self):
+        with self._lock:
+            self.short_circuited += 1
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "retries": self.retries,
+                "short_circuited": self.short_circuited,
+                "in_flight": self.in_flight,
+                "max_in_flight": self.max_in_flight,
+                "avg_latency_ms": (
+                    round(self.total_latency_s / self.requests * 1000, 1)
+                    if self.requests else None
+                )
+            }
+
+
+class BaseMCP:
+    """
+    Base class for MCP servers that call HTTP APIs.
+    Transport state is shared across all instances in the process.
+    """
+
+    REQUEST_TIMEOUT_S = 5
+
+    MAX_RETRIES = 2
+    BACKOFF_BASE_S = 0.2
+    BACKOFF_MAX_S = 2.0
+    RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+    POOL_CONNECTIONS = 10   # distinct hosts kept in the sync pool
+    POOL_MAXSIZE = 32       # keep-alive connections per host
+
+    _session: Optional[requests.Session] = None
+    _async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+        weakref.WeakKeyDictionary()
+    )
+    _breakers: Dict[str, CircuitBreaker] = {}
+    _metrics: Dict[str, HostMetrics] = {}
+    _state_lock = threading.Lock()
+
+    # -----------------
+    # Shared clients
+    # -----------------
+
+    @classmethod
+    def _sync_session(cls) -> requests.Session:
+        with BaseMCP._state_lock:
+            if BaseMCP._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=cls.POOL_CONNECTIONS,
+                    pool_maxsize=cls.POOL_MAXSIZE,
+                    max_retries=0   # retries are handled below, with backoff
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                BaseMCP._session = session
+            return BaseMCP._session
+
+    @classmethod
+    def _async_client(cls) -> httpx.AsyncClient:
+        # httpx clients are bound to the loop they were first used on
+        loop = asyncio.get_running_loop()
+        with BaseMCP._state_lock:
+            client = BaseMCP._async_clients.get(loop)
+            if client is None:
+                client = httpx.AsyncClient(
+                    timeout=cls.REQUEST_TIMEOUT_S,
+                    limits=httpx.Limits(
+                        max_connections=cls.POOL_CONNECTIONS * cls.POOL_MAXSIZE,
+                        max_keepalive_connections=cls.POOL_MAXSIZE
+                    )
+                )
+                BaseMCP._async_clients[loop] = client
+            return client
+
+    @staticmethod
+    def _host_state(url: str):
+        host = urlsplit(url).netloc
+        with BaseMCP._state_lock:
+            if host not in BaseMCP._breakers:
+                BaseMCP._breakers[host] = CircuitBreaker()
+                BaseMCP._metrics[host] = HostMetrics()
+            return BaseMCP._breakers[host], BaseMCP._metrics[host]
+
+    # -----------------
+    # Retry policy
+    # -----------------
+
+    def _backoff_s(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """
+        Full-jitter exponential backoff, honoring Retry-After when sent.
+        """
+        if retry_after:
+            try:
+                return min(float(retry_after), self.BACKOFF_MAX_S)
+            except ValueError:
+                pass
+        cap = min(self.BACKOFF_MAX_S, self.BACKOFF_BASE_S * (2 ** attempt))
+        return random.uniform(0, cap)
+
+    def _get_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """
+        GET `url` and decode JSON, with retries and circuit breaking.
+        Raises MCPError (or CircuitOpenError) on failure.
+        """
+        with span("upstream", upstream=urlsplit(url).netloc):
+            return self._fetch_json(url, params)
+
+    async def _aget_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        """
+        Async variant of _get_json on the per-loop httpx client.
+        """
+        with span("upstream", upstream=urlsplit(url).netloc):
+            return await self._afetch_json(url, params)
+
+    def _fetch_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        breaker, metrics = self._host_state(url)
+
+        if not breaker.allow_request():
+            metrics.short_circuit()
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+
+        session = self._sync_session()
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            if attempt:
+                metrics.retry()
+
+            started = time.perf_counter()
+            metrics.start()
+            retry_after = None
+            res = None
+            failed = True
+
+            try:
+                res = session.get(url, params=params, timeout=self.REQUEST_TIMEOUT_S)
+                failed = res.status_code >= 400
+            except requests.RequestException as e:
+                last_error = e
+            finally:
+                metrics.finish(time.perf_counter() - started, failed=failed)
+
+            if res is not None:
+                if res.status_code not in self.RETRY_STATUSES:
+                    if failed:
+                        # 4xx other than 429 will not get better on retry,
+                        # and says nothing about the host's health
+                        breaker.record_success()
+                        raise MCPError(f"HTTP {res.status_code} from {url}")
+                    try:
+                        data = res.json()
+                    except ValueError as e:
+                        breaker.record_failure()
+                        raise MCPError(f"Invalid JSON from {url}") from e
+                    breaker.record_success()
+                    return data
+
+                last_error = MCPError(f"HTTP {res.status_code} from {url}")
+                retry_after = res.headers.get("Retry-After")
+
+            if attempt < self.MAX_RETRIES:
+                time.sleep(self._backoff_s(attempt, retry_after))
+
+        breaker.record_failure()
+        raise MCPError(str(last_error)) from last_error
+
+    async def _afetch_json(self, url: str, params: Optional[Dict] = None) -> Dict:
+        breaker, metrics = self._host_state(url)
+
+        if not breaker.allow_request():
+            metrics.short_circuit()
+            raise CircuitOpenError(f"Circuit open for {urlsplit(url).netloc}")
+
+        client = self._async_client()
+        last_error: Optional[Exception] = None
+
+        for attempt in range(self.MAX_RETRIES + 1):
+            if attempt:
+                metrics.retry()
+
+            started = time.perf_counter()
+            metrics.start()
+            retry_after = None
+            res = None
+            failed = True
+
+            try:
+                res = await client.get(url, params=params)
+                failed = res.status_code >= 400
+            except httpx.HTTPError as e:
+                last_error = e
+            finally:
+                metrics.finish(time.perf_counter() - started, failed=failed)
+
+            if res is not None:
+                if res.status_code not in self.RETRY_STATUSES:
+                    if failed:
+                        # 4xx other than 429 will not get better on retry,
+                        # and says nothing about the host's health
+                        breaker.record_success()
+                        raise MCPError(f"HTTP {res.status_code} from {url}")
+                    try:
+                        data = res.json()
+                    except ValueError as e:
+                        breaker.record_failure()
+                        raise MCPError(f"Invalid JSON from {url}") from e
+                    breaker.record_success()
+                    return data
+
+                last_error = MCPError(f"HTTP {res.status_code} from {url}")
+                retry_after = res.headers.get("Retry-After")
+
+            if attempt < self.MAX_RETRIES:
+                await asyncio.sleep(self._backoff_s(attempt, retry_after))
+
+        breaker.record_failure()
+        raise MCPError(str(last_error)) from last_error
+
+
+def get_pool_metrics() -> Dict[str, Dict]:
+    """
+    Per-host transport metrics and breaker state for all MCPs.
+    """
+    with BaseMCP._state_lock:
+        hosts = list(BaseMCP._metrics)
+
+    return {
+        host: {
+            **BaseMCP._metrics[host].snapshot(),
+            "circuit": BaseMCP._breakers[host].state,
+            "pool_maxsize": BaseMCP.POOL_MAXSIZE
+        }
+        for host in hosts
+    }
@@ -1,74 +1,226 @@
-import requests
-from requests.exceptions import RequestException, Timeout
-from typing import List, Dict, Optional
+import asyncio
+import logging
+from typing import List, Dict, Optional, Tuple
 import os
+import time
 from dotenv import load_dotenv
 
+from backend.mcp_servers.base_mcp import BaseMCP, MCPError
+from backend.schemas.place import Place
+from backend.utils.cache import CacheBackend, make_cache
+from backend.utils.geo import geohash_encode, haversine_km
+from backend.utils.providers import provider
+from backend.utils.singleflight import AsyncSingleFlight, SingleFlight
+from backend.utils.tracing import span
+
 load_dotenv()
 
-MAPBOX_TOKEN = os.getenv("MAPBOX_TOKEN")
-if not MAPBOX_TOKEN:
-    raise RuntimeError("MAPBOX_TOKEN not set")
+logger = logging.getLogger(__name__)
+
+
+def _load_mapbox_token() -> str:
+    token = os.getenv("MAPBOX_TOKEN")
+    if not token:
+        raise RuntimeError("MAPBOX_TOKEN not set")
+    return token
+
+
+# Validated on first request rather than at import
+mapbox_token = provider("mapbox", _load_mapbox_token)
 
-class MapboxMCP:
+LatLng = Tuple[float, float]
+
+
+class MapboxMCP(BaseMCP):
 
     DIRECTIONS_URL = "https://api.mapbox.com/directions/v5/mapbox/driving-traffic"
+    MATRIX_URL = "https://api.mapbox.com/directions-matrix/v1/mapbox/driving-traffic"
 
-    def search_places(
+    # driving-traffic matrices accept at most 10 coordinates,
+    # one of which is the shared origin.
+    MATRIX_MAX_DESTINATIONS = 9
+
+    SEARCH_URL = "https://api.mapbox.com/search/v1/category"
+    SEARCH_LANGUAGE = "en"
+
+    # Category results are cached per geohash tile of the proximity
+    # point: precision 6 tiles are ~1.2 km x 0.6 km, so nearby users
+    # share POIs. Results change slowly, hence the long TTL.
+    SEARCH_TILE_PRECISION = 6
+    SEARCH_CACHE_TTL_S = float(os.getenv("PLACES_CACHE_TTL_S", "3600"))
+    SEARCH_CACHE_SIZE = 2048
+
+    # Travel times are cached per quantized origin/destination pair
+    # (3 decimals is ~110 m) and per time bucket, so traffic-aware
+    # values are reused within a bucket and refetched in the next.
+    TRAVEL_CACHE_PRECISION = 3
+    TRAVEL_TIME_BUCKET_S = float(os.getenv("TRAVEL_TIME_BUCKET_S", "900"))
+    TRAVEL_CACHE_SIZE = 8192
+
+    def __init__(
+        self,
+        search_cache: Optional[CacheBackend] = None,
+        travel_cache: Optional[CacheBackend] = None
+    ):
+        self.search_cache = search_cache or make_cache(
+            "mapbox_search",
+            maxsize=self.SEARCH_CACHE_SIZE,
+            ttl=self.SEARCH_CACHE_TTL_S
+        )
+        self.travel_cache = travel_cache or make_cache(
+            "mapbox_travel",
+            maxsize=self.TRAVEL_CACHE_SIZE,
+            ttl=self.TRAVEL_TIME_BUCKET_S
+        )
+        # Concurrent lookups of the same pair share one upstream call
+        self._travel_flight = SingleFlight("mapbox_travel")
+        self._atravel_flight = AsyncSingleFlight("mapbox_travel_async")
+
+    def _search_cache_key(
         self,
         lat: float,
         lng: float,
         category: str,
-        limit: int = 15
-    ):
-        url = f"https://api.mapbox.com/search/v1/category/{category}"
+        limit: int
+    ) -> str:
+        tile = geohash_encode(lat, lng, self.SEARCH_TILE_PRECISION)
+        return f"{category}:{tile}:{limit}:{self.SEARCH_LANGUAGE}"
+
+    def _cached_places(self, key: str) -> Optional[List[Place]]:
+        cached = self.search_cache.get(key)
+        if cached is None:
+            return None
+        # Callers enrich places in place, so hand out copies
+        return [Place.from_dict(p).copy() for p in cached]
+
+    def _store_places(self, key: str, places: List[Place]):
+        self.search_cache.set(key, [p.copy() for p in places])
+
+    def _access_token(self) -> str:
+        return mapbox_token.get()
+
+    def _search_request(
+        self,
+        lat: float,
+        lng: float,
+        category: str,
+        limit: int
+    ) -> Tuple[str, Dict]:
+        url = f"{self.SEARCH_URL}/{category}"
 
         params = {
             "proximity": f"{lng},{lat}", 
             "limit": limit,
-            "language": "en",
-            "access_token": MAPBOX_TOKEN
+            "language": self.SEARCH_LANGUAGE,
+            "access_token": self._access_token()
         }
 
-        try:
-            res = requests.get(url, params=params, timeout=5)
-            res.raise_for_status()
-            data = res.json()
-            
-            features = data.get("features", [])
-            if not isinstance(features, list):
+        return url, params
+
+    @staticmethod
+    def _parse_places(data: Dict) -> List[Place]:
+        features = data.get("features", [])
+        if not isinstance(features, list):
+            return []
+
+        places = []
+
+        for f in features:
+            coords = f["geometry"]["coordinates"]
+            props = f.get("properties", {})
+            metadata = props.get("metadata", {})
+
+            # Extract useful booking info
+            # rating / user_ratings_total / price_level are not in
+            # Mapbox results, so they are left unset
+            places.append(Place(
+                place_id=props.get("mapbox_id") or f.get("id"),
+                name=props.get("feature_name") or props.get("name"),
+                address=props.get("place_name") or props.get("description"),
+                latitude=coords[1],
+                longitude=coords[0],
+                categories=props.get("poi_category") or [],
+
+                # Added these fields for the Booking Button logic
+                website=metadata.get("website"),
+                phone=metadata.get("phone")
+            ))
+
+        return places
+
+    def search_places(
+        self,
+        lat: float,
+        lng: float,
+        category: str,
+        limit: int = 15
+    ):
+        with span("search.category", category=category) as search_span:
+            key = self._search_cache_key(lat, lng, category, limit)
+            cached = self._cached_places(key)
+            search_span.tag(cache_hit=cached is not None)
+            if cached is not None:
+                return cached
+
+            url, params = self._search_request(lat, lng, category, limit)
+
+            try:
+                places = self._parse_places(self._get_json(url, params))
+                self._store_places(key, places)
+                return places
+
+            except Exception:
+                logger.exception("Error fetching %s places", category)
+                search_span.tag(error="fetch")
                 return []
 
-            places = []
-
-            for f in features:
-                coords = f["geometry"]["coordinates"]
-                props = f.get("properties", {})
-                metadata = props.get("metadata", {})
-
-                # Extract useful booking info
-                places.append({
-                    "place_id": props.get("mapbox_id") or f.get("id"),
-                    "name": props.get("feature_name") or props.get("name"),
-                    "address": props.get("place_name") or props.get("description"),
-                    "latitude": coords[1],
-                    "longitude": coords[0],
-                    "categories": props.get("poi_category") or [],
-                    
-                    # Added these fields for the Booking Button logic
-                    "website": metadata.get("website"), 
-                    "phone": metadata.get("phone"),
-                    
-                    "rating": None,             
-                    "user_ratings_total": None, 
-                    "price_level": None         
-                })
+    async def asearch_places(
+        self,
+        lat: float,
+        lng: float,
+        category: str,
+        limit: int = 15
+    ):
+        """
+        Async variant of search_places on the pooled httpx client.
+        """
+        with span("search.category", category=category) as search_span:
+            key = self._search_cache_key(lat, lng, category, limit)
+            cached = self._cached_places(key)
+            search_span.tag(cache_hit=cached is not None)
+            if cached is not None:
+                return cached
 
-            return places
+            url, params = self._search_request(lat, lng, category, limit)
 
-        except Exception as e:
-            print(f"Error fetching places: {e}")
-            return []
+            try:
+                places = self._parse_places(await self._aget_json(url, params))
+                self._store_places(key, places)
+                return places
+
+            except Exception:
+                logger.exception("Error fetching %s places", category)
+                search_span.tag(error="fetch")
+                return []
+
+    def _travel_key(self, origin: LatLng, destination: LatLng) -> str:
+        q = self.TRAVEL_CACHE_PRECISION
+        bucket = int(time.time() // self.TRAVEL_TIME_BUCKET_S)
+        return (
+            f"{origin[0]:.{q}f},{origin[1]:.{q}f}:"
+            f"{destination[0]:.{q}f},{destination[1]:.{q}f}:{bucket}"
+        )
+
+    @staticmethod
+    def _hit_tag(total: int, missing: int) -> str:
+        return "none" if missing == total else "partial"
+
+    def _cached_travel(self, keys: List[str]) -> List[Optional[Dict]]:
+        return [self.travel_cache.get(key) for key in keys]
+
+    def _store_travel(self, origin: LatLng, destinations: List[LatLng], travel: List[Dict]):
+        for destination, result in zip(destinations, travel):
+            self.travel_cache.set(self._travel_key(origin, destination), result)
 
     def get_travel_time(
         self,
@@ -80,35 +232,258 @@ class MapboxMCP:
         """
         Returns distance (km) and traffic-aware travel time (minutes).
         """
+        origin, destination = (origin_lat, origin_lng), (dest_lat, dest_lng)
+        key = self._travel_key(origin, destination)
+
+        cached = self.travel_cache.get(key)
+        if cached is None:
+            cached = self._travel_flight.do(
+                key, lambda: self._route(origin, destination)
+            )
+        return dict(cached)
+
+    def _route(self, origin: LatLng, destination: LatLng) -> Dict:
         url = (
             f"{self.DIRECTIONS_URL}/"
-            f"{origin_lng},{origin_lat};{dest_lng},{dest_lat}"
+            f"{origin[1]},{origin[0]};{destination[1]},{destination[0]}"
         )
 
+        # Only distance and duration are read; skip the route geometry
         params = {
-            "geometries": "geojson",
-            "overview": "simplified",
-            "access_token": MAPBOX_TOKEN
+            "overview": "false",
+            "access_token": self._access_token()
         }
 
         try:
-            res = requests.get(url, params=params, timeout=5)
-            res.raise_for_status()
-            data = res.json()
+            travel = self._parse_route(self._get_json(url, params))
+
+        except MCPError as e:
+            # Degraded mode: straight-line estimate instead of nothing
+            # (not cached, so the next bucket lookup retries Mapbox)
+            logger.warning("Directions unavailable, using local estimate: %s", e)
+            return LocalMapsMCP().get_travel_time(*origin, *destination)
+
+        self._store_travel(origin, [destination], [travel])
+        return travel
 
+    @staticmethod
+    def _parse_route(data: Dict) -> Dict:
+        # An empty or malformed answer is an upstream failure like any
+        # other, so callers fall back instead of crashing
+        try:
             routes = data.get("routes")
             if not routes:
-                raise RuntimeError("No routes returned")
+                raise MCPError("No routes returned")
 
             route = routes[0]
-
             return {
                 "distance_km": round(route["distance"] / 1000, 2),
                 "travel_time": int(route["duration"] // 60)
             }
+        except (AttributeError, KeyError, IndexError, TypeError, ValueError) as e:
+            raise MCPError(f"Malformed directions response: {e!r}") from e
 
-        except (Timeout, RequestException):
-            return {
-                "distance_km": None,
-                "travel_time": None
-            }
\ No newline at end of file
+    def get_travel_times(
+        self,
+        origin: LatLng,
+        destinations: List[LatLng]
+    ) -> List[Dict]:
+        """
+        Batched get_travel_time: cached pairs are served locally, the
+        rest go through one-to-many Matrix API calls, chunked at
+        MATRIX_MAX_DESTINATIONS. Results are aligned with `destinations`.
+        """
+        keys = [self._travel_key(origin, d) for d in destinations]
+        results = self._cached_travel(keys)
+
+        missing = {keys[i]: destinations[i] for i, r in enumerate(results) if r is None}
+        if missing:
+            with span("travel_times", cache_hit=self._hit_tag(len(keys), len(missing))):
+                fetched = self._travel_flight.do_many(
+                    list(missing),
+                    lambda owned: self._route_many(origin, [missing[k] for k in owned])
+                )
+            by_key = dict(zip(missing, fetched))
+            results = [r if r is not None else by_key[k] for r, k in zip(results, keys)]
+
+        return [dict(r) for r in results]
+
+    def _route_many(self, origin: LatLng, destinations: List[LatLng]) -> List[Dict]:
+        results: List[Dict] = []
+
+        for start in range(0, len(destinations), self.MATRIX_MAX_DESTINATIONS):
+            chunk = destinations[start:start + self.MATRIX_MAX_DESTINATIONS]
+            results.extend(self._get_matrix_chunk(origin, chunk))
+
+        return results
+
+    def _matrix_request(
+        self,
+        origin: LatLng,
+        destinations: List[LatLng]
+    ) -> Tuple[str, Dict]:
+        coords = ";".join(
+            f"{lng},{lat}" for lat, lng in [origin, *destinations]
+        )
+        url = f"{self.MATRIX_URL}/{coords}"
+
+        params = {
+            "sources": "0",
+            "destinations": ";".join(str(i) for i in range(1, len(destinations) + 1)),
+            "annotations": "distance,duration",
+            "access_token": self._access_token()
+        }
+
+        return url, params
+
+    def _get_matrix_chunk(
+        self,
+        origin: LatLng,
+        destinations: List[LatLng]
+    ) -> List[Dict]:
+        url, params = self._matrix_request(origin, destinations)
+
+        try:
+            travel = self._parse_matrix(self._get_json(url, params), len(destinations))
+
+        except MCPError as e:
+            logger.warning("Matrix unavailable, using local estimates: %s", e)
+            return LocalMapsMCP().get_travel_times(origin, destinations)
+
+        self._store_travel(origin, destinations, travel)
+        return travel
+
+    async def aget_travel_times(
+        self,
+        origin: LatLng,
+        destinations: List[LatLng]
+    ) -> List[Dict]:
+        """
+        Async variant of get_travel_times; matrix chunks run concurrently.
+        """
+        keys = [self._travel_key(origin, d) for d in destinations]
+        results = self._cached_travel(keys)
+
+        missing = {keys[i]: destinations[i] for i, r in enumerate(results) if r is None}
+        if missing:
+            async def fetch(owned):
+                return await self._aroute_many(origin, [missing[k] for k in owned])
+
+            with span("travel_times", cache_hit=self._hit_tag(len(keys), len(missing))):
+                fetched = await self._atravel_flight.do_many(list(missing), fetch)
+            by_key = dict(zip(missing, fetched))
+            results = [r if r is not None else by_key[k] for r, k in zip(results, keys)]
+
+        return [dict(r) for r in results]
+
+    async def _aroute_many(self, origin: LatLng, destinations: List[LatLng]) -> List[Dict]:
+        chunks = [
+            destinations[start:start + self.MATRIX_MAX_DESTINATIONS]
+            for start in range(0, len(destinations), self.MATRIX_MAX_DESTINATIONS)
+        ]
+
+        chunk_results = await asyncio.gather(
+            *(self._aget_matrix_chunk(origin, chunk) for chunk in chunks)
+        )
+
+        return [travel for chunk in chunk_results for travel in chunk]
+
+    async def _aget_matrix_chunk(
+        self,
+        origin: LatLng,
+        destinations: List[LatLng]
+    ) -> List[Dict]:
+        url, params = self._matrix_request(origin, destinations)
+
+        try:
+            travel = self._parse_matrix(await self._aget_json(url, params), len(destinations))
+
+        except MCPError as e:
+            # Degraded mode: straight-line estimates instead of nothing
+            logger.warning("Matrix unavailable, using local estimates: %s", e)
+            return LocalMapsMCP().get_travel_times(origin, destinations)
+
+        self._store_travel(origin, destinations, travel)
+        return travel
+
+    @staticmethod
+    def _parse_matrix(data: Dict, count: int) -> List[Dict]:
+        try:
+            durations = (data.get("durations") or [[]])[0]
+            distances = (data.get("distances") or [[]])[0]
+
+            results = []
+            for i in range(count):
+                duration = durations[i] if i < len(durations) else None
+                distance = distances[i] if i < len(distances) else None
+
+                # Mapbox returns null for unroutable pairs
+                results.append({
+                    "distance_km": round(distance / 1000, 2) if distance is not None else None,
+                    "travel_time": int(duration // 60) if duration is not None else None
+                })
+        except (AttributeError, KeyError, IndexError, TypeError, ValueError) as e:
+            raise MCPError(f"Malformed matrix response: {e!r}") from e
+
+        return results
+
+
+class LocalMapsMCP:
+    """
+    Offline stand-in for MapboxMCP routing.
+    Estimates travel from straight-line distance, so it needs
+    no token or network (tests, benchmarks, degraded mode).
+    """
+
+    # Straight-line distance understates road distance
+    DETOUR_FACTOR = 1.3
+    AVERAGE_SPEED_KMH = 25.0
+
+    def search_places(
+        self,
+        lat: float,
+        lng: float,
+        category: str,
+        limit: int = 15
+    ):
+        return []
+
+    def get_travel_time(
+        self,
+        origin_lat: float,
+        origin_lng: float,
+        dest_lat: float,
+        dest_lng: float
+    ) -> Dict:
+        distance_km = haversine_km(origin_lat, origin_lng, dest_lat, dest_lng) * self.DETOUR_FACTOR
+
+        return {
+            "distance_km": round(distance_km, 2),
+            "travel_time": int(distance_km / self.AVERAGE_SPEED_KMH * 60)
+        }
+
+    def get_travel_times(
+        self,
+        origin: LatLng,
+        destinations: List[LatLng]
+    ) -> List[Dict]:
+        return [
+            self.get_travel_time(origin[0], origin[1], lat, lng)
+            for lat, lng in destinations
+        ]
+
+    async def asearch_places(
+        self,
+        lat: float,
+        lng: float,
+        category: str,
+        limit: int = 15
+    ):
+        return self.search_places(lat, lng, category, limit)
+
+    async def aget_travel_times(
+        self,
+        origin: LatLng,
+        destinations: List[LatLng]
+    ) -> List[Dict]:
+        return self.get_travel_times(origin, destinations)
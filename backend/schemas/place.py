@@ -1,5 +1,6 @@
 from pydantic import BaseModel
-from typing import Optional, List
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional
 
 # 1. Keep your existing Request model
 class PlaceRequest(BaseModel):
@@ -28,4 +29,93 @@ class PlaceResponse(BaseModel):
     time: Optional[str] = None
     crowd: Optional[str] = "moderate"
     price: Optional[str] = "₹₹"
-    categories: List[str] = []
\ No newline at end of file
+    categories: List[str] = []
+
+# 3. Pipeline record
+# Candidates move search -> enrichment -> scoring -> explanation as
+# Place objects. Slots keep them small (no per-instance __dict__);
+# fields nobody set stay None, the shared singleton, so an unknown
+# rating or phone costs nothing beyond its slot.
+@dataclass(slots=True)
+class Place:
+    # Search (Mapbox)
+    place_id: Optional[str] = None
+    name: Optional[str] = None
+    address: Optional[str] = None
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    categories: Optional[List[str]] = None
+    category: Optional[str] = None
+    website: Optional[str] = None
+    phone: Optional[str] = None
+    rating: Optional[float] = None
+    user_ratings_total: Optional[int] = None
+    price_level: Optional[int] = None
+    popular_times: Optional[float] = None
+
+    # Routing / traffic
+    straight_line_km: Optional[float] = None
+    distance_km: Optional[float] = None
+    travel_time: Optional[int] = None
+    travel_time_no_traffic: Optional[int] = None
+    traffic_level: Optional[str] = None
+    travel_score: Optional[float] = None
+
+    # Popularity
+    crowd_level: Optional[str] = None
+    crowd_confidence: Optional[float] = None
+
+    # Ranking
+    final_score: Optional[float] = None
+    explanation: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Place":
+        return data if isinstance(data, cls) else cls(**data)
+
+    # --- Mapping-style access for dict-shaped callers at the API
+    # edge. Pipeline agents read attributes directly: this
+    # shim costs a Python-level call per field. A None field reads as
+    # missing. ---
+
+    def __getitem__(self, key: str) -> Any:
+        value = getattr(self, key) if key in PLACE_FIELDS else None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        if key not in PLACE_FIELDS:
+            raise KeyError(f"Unknown place field: {key}")
+        setattr(self, key, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in PLACE_FIELDS and getattr(self, key) is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = getattr(self, key) if key in PLACE_FIELDS else None
+        return default if value is None else value
+
+    def update(self, fields: Dict[str, Any]):
+        if not PLACE_FIELDS.issuperset(fields):
+            raise KeyError(f"Unknown place fields: {set(fields) - PLACE_FIELDS}")
+        for key, value in fields.items():
+            setattr(self, key, value)
+
+    def keys(self) -> List[str]:
+        return [f for f in self.__slots__ if getattr(self, f) is not None]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {f: getattr(self, f) for f in self.keys()}
+
+    def copy(self) -> "Place":
+        """
+        Copy safe to enrich independently (categories list included).
+        """
+        clone = replace(self)
+        if self.categories is not None:
+            clone.categories = list(self.categories)
+        return clone
+
+
+PLACE_FIELDS = frozenset(Place.__slots__)
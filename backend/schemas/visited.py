@@ -0,0 +1,28 @@
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, Optional
+
+from backend.schemas.place import Place
+
+
+@dataclass(frozen=True)
+class VisitedSet:
+    """
+    Read-only view of a user's visit history for the recommendation
+    path: `place in visited` is a set lookup, whatever the history size.
+
+    place_ids come from the visited_places table; names only from
+    the legacy preferences["visited_places"] list, which predates it.
+    """
+    place_ids: FrozenSet[str] = frozenset()
+    names: FrozenSet[str] = frozenset()
+
+    def __contains__(self, place: Place) -> bool:
+        return place.place_id in self.place_ids or place.name in self.names
+
+    def __len__(self) -> int:
+        return len(self.place_ids) + len(self.names)
+
+    def with_names(self, names: Optional[Iterable[str]]) -> "VisitedSet":
+        if not names:
+            return self
+        return VisitedSet(place_ids=self.place_ids, names=self.names | frozenset(names))
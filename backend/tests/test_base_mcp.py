@@ -0,0 +1,92 @@
+import requests
+
+from backend.mcp_servers.base_mcp import BaseMCP, CircuitBreaker, CircuitOpenError, MCPError
+
+
+class FakeResponse:
+
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self.headers = {}
+        self._payload = payload or {}
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+
+    def __init__(self, responses):
+        self.responses = list(responses)
+        self.calls = 0
+
+    def get(self, url, params=None, timeout=None):
+        self.calls += 1
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+class QuickMCP(BaseMCP):
+    BACKOFF_BASE_S = 0.0
+
+
+def use_session(monkeypatch, responses):
+    session = FakeSession(responses)
+    monkeypatch.setattr(BaseMCP, "_sync_session", classmethod(lambda cls: session))
+    monkeypatch.setattr(BaseMCP, "_breakers", {})
+    monkeypatch.setattr(BaseMCP, "_metrics", {})
+    return session
+
+
+def test_retries_transient_errors_then_succeeds(monkeypatch):
+    session = use_session(monkeypatch, [
+        FakeResponse(503),
+        requests.ConnectionError("reset"),
+        FakeResponse(200, {"ok": True})
+    ])
+
+    assert QuickMCP()._get_json("https://api.example.com/x") == {"ok": True}
+    assert session.calls == 3
+
+
+def test_client_errors_are_not_retried(monkeypatch):
+    session = use_session(monkeypatch, [FakeResponse(404), FakeResponse(200)])
+
+    try:
+        QuickMCP()._get_json("https://api.example.com/x")
+        assert False, "expected MCPError"
+    except MCPError:
+        pass
+
+    assert session.calls == 1
+
+
+def test_breaker_opens_and_fails_fast(monkeypatch):
+    session = use_session(monkeypatch, [FakeResponse(500)] * 15)
+    mcp = QuickMCP()
+
+    for _ in range(5):
+        try:
+            mcp._get_json("https://api.example.com/x")
+        except MCPError:
+            pass
+
+    calls_before = session.calls
+    try:
+        mcp._get_json("https://api.example.com/x")
+        assert False, "expected CircuitOpenError"
+    except CircuitOpenError:
+        pass
+
+    assert session.calls == calls_before
+
+
+def test_half_open_breaker_allows_single_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=0.0)
+    breaker.record_failure()
+
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
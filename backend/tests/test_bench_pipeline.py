@@ -0,0 +1,59 @@
+import json
+import os
+
+from backend.benchmarks import bench_pipeline
+from backend.benchmarks.replay import Fixtures, ReplayMapboxMCP
+from backend.mcp_servers.maps_mcp import LocalMapsMCP
+
+ORIGIN = (28.7041, 77.1025)
+
+
+def test_recorded_category_is_replayed_at_request_origin():
+    maps = ReplayMapboxMCP(Fixtures())
+
+    places = maps.search_places(*ORIGIN, category="cafe", limit=5)
+
+    assert len(places) == 5
+    assert places[0]["name"] == "Blue Tokai Coffee"
+    assert all(abs(p["latitude"] - ORIGIN[0]) < 0.02 for p in places)
+    assert maps.calls["search"] == 1
+
+
+def test_replay_leaves_the_mapbox_token_alone(monkeypatch):
+    monkeypatch.delenv("MAPBOX_TOKEN", raising=False)
+    maps = ReplayMapboxMCP(Fixtures())
+
+    maps.search_places(*ORIGIN, category="cafe", limit=5)
+
+    assert "MAPBOX_TOKEN" not in os.environ
+
+
+def test_replayed_matrix_matches_local_estimate():
+    maps = ReplayMapboxMCP(Fixtures(None))
+    destinations = [(ORIGIN[0] + 0.01 * i, ORIGIN[1]) for i in range(1, 12)]
+
+    travel = maps.get_travel_times(ORIGIN, destinations)
+
+    assert travel == LocalMapsMCP().get_travel_times(ORIGIN, destinations)
+    assert maps.calls["matrix"] == 2
+
+
+def test_benchmark_saves_results_and_compares(tmp_path):
+    args = [
+        "--candidates", "10", "25", "--concurrency", "2", "--requests", "3",
+        "--search-ms", "0", "--route-ms", "0", "--llm-ms", "0"
+    ]
+    baseline = tmp_path / "base.json"
+
+    assert bench_pipeline.main(args + ["--output", str(baseline)]) == 0
+
+    levels = json.loads(baseline.read_text())["levels"]
+    assert [level["candidates"] for level in levels] == [10, 25]
+    assert levels[1]["found_mean"] == 25
+    assert levels[1]["upstream_calls"]["gemini"] == 3
+    assert {"intent", "search", "enrich", "score"} <= set(levels[1]["stages_ms"])
+
+    # Tolerance far above any noise: comparing a run to itself passes
+    again = args + ["--output", str(tmp_path / "now.json"), "--compare", str(baseline),
+                    "--tolerance", "100"]
+    assert bench_pipeline.main(again) == 0
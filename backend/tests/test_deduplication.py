@@ -0,0 +1,38 @@
+from backend.agents.deduplication_agent import DeduplicationAgent
+from backend.schemas.place import Place
+
+
+def make_place(place_id, name, lat=28.6139, lng=77.2090, categories=(), **extra):
+    return Place(
+        place_id=place_id, name=name, latitude=lat, longitude=lng,
+        categories=list(categories), **extra
+    )
+
+
+def test_same_id_is_merged_with_categories():
+    places = [
+        make_place("poi-1", "Haldiram's", categories=["restaurant"]),
+        make_place("poi-2", "Sagar Ratna", lat=28.62, categories=["restaurant"]),
+        make_place("poi-1", "Haldiram's", categories=["fast_food"], phone="011-1234"),
+    ]
+
+    unique, merged = DeduplicationAgent().merge(places)
+
+    assert merged == 1
+    assert [p["place_id"] for p in unique] == ["poi-1", "poi-2"]
+    assert unique[0]["categories"] == ["restaurant", "fast_food"]
+    assert unique[0]["phone"] == "011-1234"
+
+
+def test_name_and_distance_fallback_for_different_ids():
+    places = [
+        make_place("a", "Café Coffee Day", categories=["cafe"]),
+        make_place("b", "cafe coffee day", lat=28.6142, categories=["food_court"]),
+        make_place("c", "Cafe Coffee Day", lat=28.6300, categories=["cafe"]),
+    ]
+
+    unique, merged = DeduplicationAgent().merge(places)
+
+    assert merged == 1
+    assert [p["place_id"] for p in unique] == ["a", "c"]
+    assert unique[0]["categories"] == ["cafe", "food_court"]
@@ -0,0 +1,44 @@
+from backend.agents.explanation_agent import ExplanationAgent
+from backend.schemas.place import Place
+from backend.schemas.user_intent import UserIntent
+
+INTENT = UserIntent(
+    descriptors=["quiet", "cozy", "cheap"],
+    preferences={"crowd_quietness": 0.8},
+    place_types=["cafe"],
+    constraints=[],
+    time_of_day="evening"
+)
+
+PREFERENCES = {"place_type_affinity": {"cafe": 0.6}}
+
+
+def test_shared_context_matches_one_off_explanations():
+    agent = ExplanationAgent()
+    visited = ["Cafe 1"]
+    places = [
+        Place(name="Cafe 1", category="cafe", travel_time=7, rating=4.5, crowd_level="low"),
+        Place(name="Bar 2", category="bar", crowd_level="high"),
+        Place(name="Cafe 3", category="cafe"),
+    ]
+
+    context = agent.build_context(INTENT, PREFERENCES, visited)
+
+    for place in places:
+        assert agent.explain(place, context) == agent.generate_explanation(
+            place, INTENT, user_preferences=PREFERENCES, visited_places=visited
+        )
+
+
+def test_context_fragments():
+    agent = ExplanationAgent()
+    context = agent.build_context(INTENT, PREFERENCES, ["Cafe 1"])
+
+    explanation = agent.explain(Place(name="Cafe 1", category="cafe", travel_time=7), context)
+
+    assert explanation == (
+        "I recommended this place because you have already visited this place before, "
+        "it is about 7 minutes away considering traffic, "
+        "it matches your preference for quiet, cozy, "
+        "your affinity for cafe boosted this recommendation."
+    )
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Generous enough for slow CI machines; importing google.genai alone
+# used to blow well past it
+IMPORT_BUDGET_S = 3.0
+
+SCRIPT = """
+import sys, time
+started = time.perf_counter()
+import backend.main
+elapsed = time.perf_counter() - started
+print(elapsed)
+print("google.genai" in sys.modules)
+"""
+
+
+def test_app_imports_without_credentials_or_sdks():
+    env = {
+        k: v for k, v in os.environ.items()
+        if k not in ("GEMINI_API_KEY", "MAPBOX_TOKEN", "DATABASE_URL")
+    }
+
+    result = subprocess.run(
+        [sys.executable, "-c", SCRIPT],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=60
+    )
+
+    assert result.returncode == 0, result.stderr
+    elapsed, genai_loaded = result.stdout.split()
+
+    assert genai_loaded == "False"
+    assert float(elapsed) < IMPORT_BUDGET_S
@@ -0,0 +1,108 @@
+from backend.agents import intent_extraction_agent
+from backend.agents.intent_cache import IntentCache, normalize_query
+from backend.agents.intent_extraction_agent import IntentExtractionAgent
+from backend.agents.intent_rules import RuleBasedIntentMatcher
+from backend.utils.cache import InMemoryTTLCache
+
+
+INTENT_JSON = """
+{"descriptors": ["quiet"], "preferences": {"crowd_quietness": 0.8},
+ "place_types": ["cafe"], "constraints": [], "time_of_day": null,
+ "booking_required": false}
+"""
+
+
+def make_agent(monkeypatch, similarity_threshold=0.85, output=INTENT_JSON):
+    calls = []
+
+    def fake_call_gemini(prompt):
+        calls.append(prompt)
+        return output
+
+    monkeypatch.setattr(intent_extraction_agent, "call_gemini", fake_call_gemini)
+    cache = IntentCache(
+        similarity_threshold=similarity_threshold,
+        backend=InMemoryTTLCache(maxsize=32, ttl=60)
+    )
+    # Threshold above 1 keeps the rule fast path out of the way
+    rules = RuleBasedIntentMatcher(threshold=2.0)
+    return IntentExtractionAgent(cache=cache, rules=rules), calls
+
+
+def test_normalize_query_folds_case_accents_and_stop_words():
+    assert normalize_query("Quiet  Café nearby!") == "quiet cafe"
+    assert normalize_query("I want a quiet cafe") == "quiet cafe"
+    assert normalize_query("not crowded bar") == "not crowded bar"
+
+
+def test_equivalent_phrasings_hit_the_exact_tier(monkeypatch):
+    agent, calls = make_agent(monkeypatch, similarity_threshold=None)
+
+    first = agent.extract("quiet cafe")
+    second = agent.extract("Quiet café nearby")
+
+    assert len(calls) == 1
+    assert first == second
+
+
+def test_near_duplicates_hit_the_similarity_tier(monkeypatch):
+    agent, calls = make_agent(monkeypatch)
+
+    agent.extract("quiet cafe with good coffee")
+    agent.extract("good coffee, quiet cafe")
+
+    assert len(calls) == 1
+    assert agent.cache.stats()["similar_hits"] == 1
+
+
+def test_similarity_tier_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("INTENT_CACHE_SIMILARITY", raising=False)
+
+    assert IntentCache().similar is None
+    assert IntentCache.from_env().similar is None
+
+
+def test_near_duplicates_with_different_words_or_numbers_miss(monkeypatch):
+    agent, calls = make_agent(monkeypatch, similarity_threshold=0.5)
+
+    agent.extract("romantic dinner under 2000 rupees")
+    agent.extract("romantic dinner under 5000 rupees")
+    agent.extract("south indian restaurant for family lunch")
+    agent.extract("north indian restaurant for family lunch")
+    agent.extract("quiet cozy cafe with good coffee")
+    agent.extract("quiet cosy cafe with good coffee")
+
+    assert len(calls) == 6
+    assert agent.cache.stats()["similar_hits"] == 0
+
+
+def test_bypass_and_failures_are_not_cached(monkeypatch):
+    agent, calls = make_agent(monkeypatch, output="not json")
+
+    agent.extract("quiet cafe")
+    agent.extract("quiet cafe")
+    assert len(calls) == 2
+
+    agent, calls = make_agent(monkeypatch)
+    agent.extract("quiet cafe")
+    agent.extract("quiet cafe", bypass_cache=True)
+    assert len(calls) == 2
+
+
+def test_negated_queries_skip_the_similarity_tier(monkeypatch):
+    agent, calls = make_agent(monkeypatch)
+
+    agent.extract("cafe where smoking is allowed")
+    agent.extract("cafe where smoking is not allowed")
+    agent.extract("cafe where no smoking is allowed")
+
+    assert len(calls) == 3
+    assert agent.cache.stats()["similar_hits"] == 0
+
+    # Negated entries are not offered to plain queries either
+    agent, calls = make_agent(monkeypatch)
+
+    agent.extract("cafe where smoking is not allowed")
+    agent.extract("cafe where smoking is allowed")
+
+    assert len(calls) == 2
@@ -0,0 +1,44 @@
+from backend.agents import intent_extraction_agent
+from backend.agents.intent_extraction_agent import IntentExtractionAgent, IntentPathStats
+from backend.agents.intent_rules import RuleBasedIntentMatcher
+
+
+def test_trivial_queries_resolve_locally():
+    rules = RuleBasedIntentMatcher()
+
+    assert rules.extract("cafe").place_types == ["cafe"]
+    assert rules.extract("bar near me").place_types == ["bar"]
+
+    intent = rules.extract("Quiet café for dinner")
+    assert intent.place_types == ["cafe"]
+    assert intent.time_of_day == "evening"
+    assert intent.preferences == {"crowd_quietness": 0.8}
+
+
+def test_unsure_queries_escalate():
+    rules = RuleBasedIntentMatcher()
+
+    assert rules.extract("a cozy sushi spot with a rooftop view") is None
+    assert rules.extract("no bars please") is None
+    assert rules.extract("somewhere calm with amazing food") is None
+
+
+def test_agent_only_calls_llm_when_rules_are_unsure(monkeypatch):
+    calls = []
+
+    def fake_call_gemini(prompt):
+        calls.append(prompt)
+        return '{"descriptors": [], "preferences": {}, "place_types": ["restaurant"], "constraints": []}'
+
+    monkeypatch.setattr(intent_extraction_agent, "call_gemini", fake_call_gemini)
+
+    agent = IntentExtractionAgent(use_cache=False)
+    agent.stats = IntentPathStats()
+
+    agent.extract("cafe")
+    agent.extract("a cozy sushi spot with a rooftop view")
+
+    stats = agent.path_stats()
+    assert len(calls) == 1
+    assert stats["rules"]["count"] == 1
+    assert stats["llm"]["count"] == 1
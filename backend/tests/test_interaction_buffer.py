@@ -0,0 +1,125 @@
+import threading
+import time
+
+import pytest
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from backend.db.crud import _initial_affinity
+from backend.db.interaction_buffer import (
+    InteractionBuffer, InteractionBufferClosed, InteractionBufferFull
+)
+
+
+class RecordingSink:
+
+    def __init__(self, fail_times=0):
+        self.batches = []
+        self.fail_times = fail_times
+        self.flushed = threading.Event()
+
+    def __call__(self, signals):
+        if self.fail_times:
+            self.fail_times -= 1
+            raise OperationalError("UPSERT", {}, ConnectionError("database down"))
+        self.batches.append(signals)
+        self.flushed.set()
+
+
+def test_signals_are_aggregated_per_user():
+    sink = RecordingSink()
+    buffer = InteractionBuffer(sink=sink, flush_interval_s=60)
+
+    for place_type in ["cafe", "bar", "cafe"]:
+        buffer.record("alice", place_type)
+    buffer.record("bob", "bakery")
+
+    assert buffer.flush() == 4
+    assert sink.batches == [{"alice": {"cafe": 2, "bar": 1}, "bob": {"bakery": 1}}]
+    assert buffer.pending() == 0
+
+
+def test_size_trigger_flushes_in_background():
+    sink = RecordingSink()
+    buffer = InteractionBuffer(sink=sink, flush_interval_s=60, flush_size=3)
+
+    for _ in range(3):
+        buffer.record("alice", "cafe")
+
+    assert sink.flushed.wait(2)
+    assert sink.batches == [{"alice": {"cafe": 3}}]
+    buffer.close()
+
+
+def test_buffer_is_bounded():
+    buffer = InteractionBuffer(sink=RecordingSink(), flush_interval_s=60, max_pending=2)
+    buffer.record("alice", "cafe")
+    buffer.record("bob", "bar")
+
+    with pytest.raises(InteractionBufferFull):
+        buffer.record("carol", "cafe")
+    assert buffer.snapshot()["rejected"] == 1
+
+
+def test_failed_flush_keeps_signals_in_order():
+    sink = RecordingSink(fail_times=1)
+    buffer = InteractionBuffer(sink=sink, flush_interval_s=60)
+
+    buffer.record("alice", "cafe")
+    assert buffer.flush() == 0
+    buffer.record("alice", "bar")
+    buffer.record("alice", "cafe")
+
+    assert buffer.flush() == 3
+    assert list(sink.batches[0]["alice"].items()) == [("cafe", 2), ("bar", 1)]
+
+
+def test_permanent_failures_are_dropped_per_user():
+    attempts = []
+
+    def sink(signals):
+        attempts.append(signals)
+        if "ghost" in signals:
+            raise IntegrityError("UPSERT", {}, ValueError("user ghost does not exist"))
+
+    buffer = InteractionBuffer(sink=sink, flush_interval_s=60)
+    buffer.record("alice", "cafe")
+    buffer.record("ghost", "bar")
+    buffer.record("ghost", "cafe")
+
+    assert buffer.flush() == 1
+    assert {"alice": {"cafe": 1}} in attempts
+    assert buffer.pending() == 0
+    assert buffer.snapshot()["dropped"] == 2
+
+    # Nothing left to retry on the next flush
+    assert buffer.flush() == 0
+    assert len(attempts) == 3
+
+
+def test_close_flushes_pending_signals():
+    sink = RecordingSink()
+    buffer = InteractionBuffer(sink=sink, flush_interval_s=60)
+    buffer.record("alice", "cafe")
+
+    started = time.perf_counter()
+    buffer.close()
+
+    assert sink.batches == [{"alice": {"cafe": 1}}]
+    assert time.perf_counter() - started < 5
+
+
+def test_signals_after_close_are_refused():
+    sink = RecordingSink()
+    buffer = InteractionBuffer(sink=sink, flush_interval_s=60)
+    buffer.close()
+
+    with pytest.raises(InteractionBufferClosed):
+        buffer.record("alice", "cafe")
+
+    assert buffer.pending() == 0
+    assert buffer.snapshot()["rejected"] == 1
+
+
+def test_new_user_affinity_matches_per_click_updates():
+    # Per click: the first signal creates the row at 1.0, later ones add 0.1
+    assert _initial_affinity({"cafe": 3, "bar": 1}) == pytest.approx({"cafe": 1.2, "bar": 0.1})
@@ -0,0 +1,272 @@
+import asyncio
+import random
+
+from backend.agents.orchestrator import OrchestratorAgent
+from backend.mcp_servers.maps_mcp import LocalMapsMCP
+from backend.schemas.user_intent import UserIntent
+
+
+ORIGIN = (28.6139, 77.2090)
+
+
+class FakeMaps(LocalMapsMCP):
+    """
+    LocalMapsMCP routing plus canned search results per category.
+    """
+
+    def __init__(self, per_category=5, slow_categories=()):
+        self.per_category = per_category
+        self.slow_categories = set(slow_categories)
+
+    def search_places(self, lat, lng, category, limit=15):
+        return [
+            {
+                "place_id": f"{category}-{i}",
+                "name": f"{category.title()} {i}",
+                "address": None,
+                "latitude": lat + 0.002 * (i + 1),
+                "longitude": lng + 0.001 * i,
+                "categories": [category],
+                "rating": None,
+                "user_ratings_total": None,
+                "price_level": None
+            }
+            for i in range(min(limit, self.per_category))
+        ]
+
+    async def asearch_places(self, lat, lng, category, limit=15):
+        if category in self.slow_categories:
+            await asyncio.sleep(5)
+        return self.search_places(lat, lng, category, limit)
+
+
+class FakeIntentAgent:
+
+    def __init__(self, place_types, preferences=None):
+        self.place_types = place_types
+        self.preferences = preferences or {"crowd_quietness": 0.8}
+
+    async def aextract(self, user_query):
+        return UserIntent(
+            descriptors=["quiet"],
+            preferences=dict(self.preferences),
+            place_types=self.place_types,
+            constraints=[],
+            time_of_day="evening"
+        )
+
+
+def make_orchestrator(place_types, **maps_kwargs):
+    orchestrator = OrchestratorAgent(search_deadline_s=0.5)
+    orchestrator.intent_agent = FakeIntentAgent(place_types)
+    orchestrator.maps = FakeMaps(**maps_kwargs)
+    return orchestrator
+
+
+def test_sync_wrapper_matches_async_pipeline():
+    orchestrator = make_orchestrator(["cafe", "bar"])
+
+    sync_result = orchestrator.get_recommendations(
+        user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+    )
+    async_result = asyncio.run(orchestrator.aget_recommendations(
+        user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+    ))
+
+    assert sync_result == async_result
+    assert sync_result["total_found"] == 10
+    assert all(p["travel_time"] is not None for p in sync_result["results"])
+
+
+def test_slow_category_is_dropped_at_deadline():
+    orchestrator = make_orchestrator(["cafe", "bar"], slow_categories=["bar"])
+
+    result = orchestrator.get_recommendations(
+        user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+    )
+
+    assert result["timed_out_categories"] == ["bar"]
+    assert {p["place_id"].split("-")[0] for p in result["results"]} == {"cafe"}
+
+
+def test_failed_category_is_reported():
+    orchestrator = make_orchestrator(["cafe", "bar"])
+
+    async def search(lat, lng, category, limit=15):
+        if category == "bar":
+            raise ConnectionError("provider down")
+        return FakeMaps.search_places(orchestrator.maps, lat, lng, category, limit)
+
+    orchestrator.maps.asearch_places = search
+
+    result = orchestrator.get_recommendations(
+        user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+    )
+
+    assert result["failed_categories"] == ["bar"]
+    assert result["timed_out_categories"] == []
+    assert {p["place_id"].split("-")[0] for p in result["results"]} == {"cafe"}
+
+
+def test_overlapping_categories_are_enriched_once():
+    orchestrator = make_orchestrator(["restaurant", "fast_food"], per_category=3)
+
+    def shared_ids(lat, lng, category, limit=15):
+        places = FakeMaps.search_places(orchestrator.maps, lat, lng, category, limit)
+        for place in places:
+            place["place_id"] = place["place_id"].split("-")[1]
+            place["name"] = f"Place {place['place_id']}"
+        return places
+
+    orchestrator.maps.search_places = shared_ids
+
+    result = orchestrator.get_recommendations(
+        user_query="dinner", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+    )
+
+    assert result["duplicates_merged"] == 3
+    assert result["total_found"] == 3
+    assert result["results"][0]["categories"] == ["restaurant", "fast_food"]
+
+
+class RatedMaps(FakeMaps):
+    """
+    FakeMaps with varied ratings and review counts, spread over ~2 km.
+    """
+
+    def search_places(self, lat, lng, category, limit=15):
+        rng = random.Random(category)
+        places = super().search_places(lat, lng, category, limit)
+        for i, place in enumerate(places):
+            place["latitude"] = lat + rng.uniform(-0.015, 0.015)
+            place["longitude"] = lng + rng.uniform(-0.015, 0.015)
+            place["rating"] = rng.choice([None, 2.5, 3.8, 4.2, 4.9])
+            place["user_ratings_total"] = rng.choice([None, 120, 800, 3000])
+        return places
+
+
+def test_bound_ranking_matches_exhaustive():
+    results = {}
+    for mode in ("bound", "exhaustive"):
+        orchestrator = make_orchestrator(["cafe", "bar", "bakery"], per_category=10)
+        orchestrator.maps = RatedMaps(per_category=10)
+        orchestrator.ranking_mode = mode
+        results[mode] = orchestrator.get_recommendations(
+            user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+        )
+
+    bound = results["bound"]
+    exhaustive = results["exhaustive"]
+
+    assert bound["results"] == exhaustive["results"]
+    assert exhaustive["enrichment_calls_avoided"] == 0
+    assert bound["enrichment_calls_avoided"] > 0
+
+
+def test_identical_requests_share_one_candidate_set():
+    orchestrator = make_orchestrator(["cafe", "bar"])
+    searches = []
+    search = orchestrator.maps.asearch_places
+
+    async def counting_search(lat, lng, category, limit=15):
+        searches.append(category)
+        await asyncio.sleep(0.05)
+        return await search(lat, lng, category, limit)
+
+    orchestrator.maps.asearch_places = counting_search
+
+    visited = {"alice": ["Cafe 0"], "bob": []}
+
+    async def load_preferences(db, user_id):
+        return {"visited_places": visited[user_id]}
+
+    orchestrator._load_preferences = load_preferences
+
+    async def run():
+        return await asyncio.gather(*(
+            orchestrator.aget_recommendations(
+                user_query="Quiet cafe", latitude=ORIGIN[0] + 0.0001 * i,
+                longitude=ORIGIN[1], db=None, user_id=user
+            )
+            for i, user in enumerate(["alice", "bob", "alice"])
+        ))
+
+    alice, bob, alice_again = asyncio.run(run())
+
+    assert sorted(searches) == ["bar", "cafe"]
+    assert "Cafe 0" not in [p["name"] for p in alice["results"]]
+    assert "Cafe 0" in [p["name"] for p in bob["results"]]
+    assert alice == alice_again
+    # Per-request copies: personalization never leaks into the shared set
+    assert alice["results"][0] is not bob["results"][0]
+
+
+def test_only_the_returned_page_is_explained():
+    orchestrator = make_orchestrator(["cafe", "bar", "bakery"], per_category=10)
+    orchestrator.maps = RatedMaps(per_category=10)
+    explained = []
+    explain = orchestrator.explainer.explain
+
+    def counting_explain(place, context):
+        explained.append(place["place_id"])
+        return explain(place, context)
+
+    orchestrator.explainer.explain = counting_explain
+
+    first = orchestrator.get_recommendations(
+        user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None, limit=5
+    )
+    second = orchestrator.get_recommendations(
+        user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None,
+        offset=5, limit=5
+    )
+
+    orchestrator.ranking_mode = "exhaustive"
+    both = orchestrator.get_recommendations(
+        user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None, limit=10
+    )
+
+    assert len(explained) == 5 + 5 + 10
+    assert first["next_offset"] == 5 and second["next_offset"] == 10
+    assert first["results"] + second["results"] == both["results"]
+    assert all(p["explanation"] for p in second["results"])
+
+
+class ClusteredMaps(FakeMaps):
+    """
+    Mapbox-shaped candidates (no rating, no reviews): cafes within
+    ~0.6 km, everything else near the edge of a 2 km radius.
+    """
+
+    def search_places(self, lat, lng, category, limit=15):
+        places = super().search_places(lat, lng, category, limit)
+        start, step = (0.0036, 0.0002) if category == "cafe" else (0.0158, 0.0001)
+        for i, place in enumerate(places):
+            place["latitude"] = lat + start + step * i
+            place["longitude"] = lng
+        return places
+
+
+def test_bound_ranking_never_prunes_on_distance_alone():
+    results = {}
+    for mode in ("bound", "exhaustive"):
+        orchestrator = make_orchestrator([])
+        # Travel weighs most: the only term that differs here
+        orchestrator.intent_agent = FakeIntentAgent(
+            ["cafe", "bar", "bakery"], {"crowd_quietness": 0.8, "travel_tolerance": 0.0}
+        )
+        orchestrator.maps = ClusteredMaps(per_category=10)
+        orchestrator.ranking_mode = mode
+        results[mode] = orchestrator.get_recommendations(
+            user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+        )
+
+    # Straight-line distance does not bound road time, so far
+    # candidates are still routed rather than assumed slow
+    assert results["bound"]["results"] == results["exhaustive"]["results"]
+    assert results["bound"]["total_found"] == 25
+    assert results["bound"]["enrichment_calls_avoided"] == 0
+
+
+def test_exhaustive_is_the_default_ranking_mode():
+    assert OrchestratorAgent().ranking_mode == "exhaustive"
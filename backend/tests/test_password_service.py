@@ -0,0 +1,44 @@
+import asyncio
+import threading
+
+from backend.auth.password_service import PasswordService, PasswordServiceBusy
+from backend.auth.security import get_hash_rounds, hash_password
+
+
+def test_rehashes_when_cost_differs():
+    service = PasswordService(rounds=5, max_workers=1, max_queue=4)
+    old_hash = hash_password("secret", rounds=4)
+
+    ok, new_hash = asyncio.run(service.averify_and_rehash("secret", old_hash))
+
+    assert ok
+    assert get_hash_rounds(new_hash) == 5
+    assert service.verify("secret", new_hash)
+
+
+def test_no_rehash_on_wrong_password_or_current_cost():
+    service = PasswordService(rounds=4, max_workers=1, max_queue=4)
+    current = hash_password("secret", rounds=4)
+
+    assert asyncio.run(service.averify_and_rehash("wrong", current)) == (False, None)
+    assert asyncio.run(service.averify_and_rehash("secret", current)) == (True, None)
+
+
+def test_rejects_when_queue_is_full():
+    service = PasswordService(rounds=4, max_workers=1, max_queue=0)
+    release = threading.Event()
+
+    blocker = service._submit(release.wait)
+    try:
+        service.hash("secret")
+        assert False, "expected PasswordServiceBusy"
+    except PasswordServiceBusy:
+        pass
+    finally:
+        release.set()
+        blocker.result()
+        # The slot is released by a done-callback on the worker thread;
+        # a no-op job on the same single worker runs after it
+        service._executor.submit(lambda: None).result()
+
+    assert service.hash("secret").startswith("$2b$04$")
@@ -0,0 +1,39 @@
+import pickle
+
+import pytest
+
+from backend.schemas.place import Place
+
+
+def test_unset_fields_behave_like_missing_keys():
+    place = Place(place_id="poi-1", name="Blue Tokai", categories=["cafe"])
+
+    assert place.get("rating") is None
+    assert "rating" not in place
+    with pytest.raises(KeyError):
+        place["rating"]
+
+    place.update({"travel_time": 12, "traffic_level": "low"})
+    assert place["travel_time"] == 12
+    assert place.keys() == ["place_id", "name", "categories", "travel_time", "traffic_level"]
+
+
+def test_unknown_fields_are_rejected():
+    with pytest.raises(TypeError):
+        Place(place_id="poi-1", not_a_field=1)
+    with pytest.raises(KeyError):
+        Place().update({"not_a_field": 1})
+
+    assert Place().get("get") is None
+
+
+def test_copy_is_independent_and_picklable():
+    place = Place(place_id="poi-1", categories=["cafe"])
+    clone = place.copy()
+    clone["categories"].append("bar")
+    clone["travel_time"] = 3
+
+    assert place.categories == ["cafe"]
+    assert "travel_time" not in place
+    assert pickle.loads(pickle.dumps(place)) == place
+    assert Place.from_dict({"place_id": "poi-1", "categories": ["cafe"]}) == place
@@ -0,0 +1,68 @@
+from sqlalchemy import create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+
+from backend.db import crud
+from backend.db.models import User, UserPreference
+
+
+@compiles(JSONB, "sqlite")
+def _jsonb_on_sqlite(type_, compiler, **kw):
+    return "JSON"
+
+
+def make_session():
+    engine = create_engine("sqlite://")
+    User.__table__.create(engine)
+    UserPreference.__table__.create(engine)
+    crud._preferences_cache.clear()
+
+    selects = []
+    event.listen(
+        engine, "before_cursor_execute",
+        lambda conn, cursor, statement, *args: selects.append(statement)
+        if statement.lstrip().upper().startswith("SELECT") else None
+    )
+    return sessionmaker(bind=engine)(), selects
+
+
+def test_reads_are_served_from_cache():
+    db, selects = make_session()
+    crud.create_or_update_user_preference(db, "alice", {"place_type_affinity": {"cafe": 1.0}})
+    selects.clear()
+
+    for _ in range(3):
+        assert crud.get_cached_preferences(db, "alice") == {"place_type_affinity": {"cafe": 1.0}}
+    assert crud.get_cached_preferences(db, "nobody") is None
+    assert crud.get_cached_preferences(db, "nobody") is None
+
+    # Written through for alice, one miss for nobody
+    assert len(selects) == 1
+
+
+def test_write_paths_refresh_the_cache():
+    db, _ = make_session()
+    crud.create_or_update_user_preference(db, "alice", {"place_type_affinity": {"cafe": 1.0}})
+    assert crud.get_cached_preferences(db, "alice")["place_type_affinity"] == {"cafe": 1.0}
+
+    crud.apply_affinity_signals(db, {"alice": {"cafe": 1, "bar": 2}})
+    db.expire_all()
+    affinity = crud.get_cached_preferences(db, "alice")["place_type_affinity"]
+    assert affinity["cafe"] == 1.1 and round(affinity["bar"], 6) == 0.2
+
+    crud.create_or_update_user_preference(db, "alice", {"visited_places": ["Cafe 1"]})
+    assert crud.get_cached_preferences(db, "alice") == {"visited_places": ["Cafe 1"]}
+
+    crud.delete_user_preferences(db, "alice")
+    assert crud.get_cached_preferences(db, "alice") is None
+
+
+def test_cached_value_is_detached_from_the_caller():
+    db, _ = make_session()
+    preferences = {"place_type_affinity": {"cafe": 1.0}}
+    crud.create_or_update_user_preference(db, "alice", preferences)
+
+    preferences["place_type_affinity"]["cafe"] = 99.0
+
+    assert crud.get_cached_preferences(db, "alice")["place_type_affinity"]["cafe"] == 1.0
@@ -0,0 +1,118 @@
+import os
+
+os.environ.setdefault("MAPBOX_TOKEN", "test-token")
+
+from backend.mcp_servers.maps_mcp import MapboxMCP
+from backend.utils.cache import InMemoryTTLCache, RedisCacheBackend
+from backend.utils.geo import geohash_encode
+
+
+FEATURES = {
+    "features": [
+        {
+            "id": "poi-1",
+            "geometry": {"coordinates": [77.2090, 28.6139]},
+            "properties": {"name": "Blue Tokai", "poi_category": ["cafe"]}
+        }
+    ]
+}
+
+
+def make_mcp(monkeypatch):
+    mcp = MapboxMCP(search_cache=InMemoryTTLCache(maxsize=16, ttl=60))
+    calls = []
+
+    def fake_get_json(url, params=None):
+        calls.append(url)
+        return FEATURES
+
+    monkeypatch.setattr(mcp, "_get_json", fake_get_json)
+    return mcp, calls
+
+
+def test_nearby_searches_share_a_tile(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch)
+
+    first = mcp.search_places(28.6139, 77.2090, "cafe", limit=10)
+    second = mcp.search_places(28.6141, 77.2092, "cafe", limit=10)
+
+    assert len(calls) == 1
+    assert first == second
+    assert mcp.search_cache.stats.snapshot()["hits"] == 1
+
+
+def test_cache_key_includes_category_and_limit(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch)
+
+    mcp.search_places(28.6139, 77.2090, "cafe", limit=10)
+    mcp.search_places(28.6139, 77.2090, "bar", limit=10)
+    mcp.search_places(28.6139, 77.2090, "cafe", limit=5)
+
+    assert len(calls) == 3
+
+
+def test_cached_places_are_copies(monkeypatch):
+    mcp, _ = make_mcp(monkeypatch)
+
+    first = mcp.search_places(28.6139, 77.2090, "cafe")
+    first[0]["travel_time"] = 12
+    first[0]["categories"].append("mutated")
+
+    second = mcp.search_places(28.6139, 77.2090, "cafe")
+    assert "travel_time" not in second[0]
+    assert second[0]["categories"] == ["cafe"]
+
+
+def test_lru_and_ttl_eviction():
+    cache = InMemoryTTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("d", 4, ttl=0)
+    assert cache.get("d") is None
+    assert cache.stats.snapshot()["expirations"] == 1
+
+
+def test_geohash_matches_reference():
+    # Reference value from the original geohash spec examples
+    assert geohash_encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+class DownRedis:
+    """
+    A redis client whose server is unreachable.
+    """
+
+    def get(self, key):
+        raise ConnectionError("redis down")
+
+    set = delete = get
+
+
+def test_shared_cache_outage_reads_as_misses(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch)
+    mcp.search_cache = RedisCacheBackend("redis://down", namespace="mapbox_search", client=DownRedis())
+
+    first = mcp.search_places(28.6139, 77.2090, "cafe", limit=10)
+    second = mcp.search_places(28.6139, 77.2090, "cafe", limit=10)
+
+    assert first == second and first[0]["name"] == "Blue Tokai"
+    assert len(calls) == 2
+    stats = mcp.search_cache.stats.snapshot()
+    assert stats["misses"] == 2 and stats["errors"] == 4
+
+
+def test_unreadable_shared_entry_is_a_miss():
+    class GarbageRedis:
+        def get(self, key):
+            return b"not a pickle"
+
+    cache = RedisCacheBackend("redis://x", namespace="t", client=GarbageRedis())
+
+    assert cache.get("k", "default") == "default"
+    assert cache.stats.snapshot()["errors"] == 1
@@ -0,0 +1,45 @@
+import pytest
+
+from backend.agents.spatial_filter_agent import SpatialFilterAgent
+from backend.schemas.place import Place
+from backend.utils.geo import haversine_km, haversine_km_many
+
+ORIGIN = (28.6139, 77.2090)
+
+
+def test_vectorized_haversine_matches_scalar():
+    lats = [28.6200, 28.7041, 19.0760]
+    lngs = [77.2100, 77.1025, 72.8777]
+
+    batched = haversine_km_many(*ORIGIN, lats, lngs)
+
+    for got, lat, lng in zip(batched, lats, lngs):
+        assert got == pytest.approx(haversine_km(*ORIGIN, lat, lng), rel=1e-12)
+
+
+def test_filter_drops_far_places_and_sorts_by_distance():
+    places = [
+        Place(place_id="far", latitude=28.70, longitude=77.30),
+        Place(place_id="mid", latitude=28.625, longitude=77.2090),
+        Place(place_id="near", latitude=28.615, longitude=77.2090),
+    ]
+
+    kept, out_of_radius = SpatialFilterAgent().filter(places, *ORIGIN, radius_km=3.0)
+
+    assert out_of_radius == 1
+    assert [p["place_id"] for p in kept] == ["near", "mid"]
+    assert kept[0]["straight_line_km"] < kept[1]["straight_line_km"]
+
+
+def test_filter_caps_candidates():
+    places = [
+        Place(place_id=str(i), latitude=ORIGIN[0] + 0.001 * i, longitude=ORIGIN[1])
+        for i in range(10, 0, -1)
+    ]
+
+    kept, out_of_radius = SpatialFilterAgent().filter(
+        places, *ORIGIN, radius_km=5.0, max_candidates=3
+    )
+
+    assert out_of_radius == 0
+    assert [p["place_id"] for p in kept] == ["1", "2", "3"]
@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend.api.v1 import places
+from backend.tests.test_orchestrator_pipeline import ORIGIN, RatedMaps, make_orchestrator
+
+
+def make_rated_orchestrator():
+    orchestrator = make_orchestrator(["cafe", "bar", "bakery"])
+    orchestrator.maps = RatedMaps(per_category=10)
+    return orchestrator
+
+
+async def collect(orchestrator):
+    return [
+        event async for event in orchestrator.astream_recommendations(
+            user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+        )
+    ]
+
+
+def test_stream_emits_plan_then_provisional_then_final():
+    events = asyncio.run(collect(make_rated_orchestrator()))
+    kinds = [e["event"] for e in events]
+
+    assert kinds[:2] == ["plan", "provisional"]
+    assert kinds[-1] == "final"
+    assert set(kinds[2:-1]) <= {"update"}
+    assert all(p.get("travel_time") is None for p in events[1]["results"])
+
+
+def test_final_event_matches_blocking_response():
+    events = asyncio.run(collect(make_rated_orchestrator()))
+    final = {k: v for k, v in events[-1].items() if k != "event"}
+
+    blocking = make_rated_orchestrator().get_recommendations(
+        user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+    )
+
+    assert final == blocking
+
+
+def test_stream_endpoint_writes_ndjson():
+    app = FastAPI()
+    app.include_router(places.router)
+    orchestrator = make_rated_orchestrator()
+    app.dependency_overrides[places.get_async_db] = lambda: None
+    app.dependency_overrides[places.get_current_user] = lambda: None
+    app.dependency_overrides[places.get_orchestrator] = lambda: orchestrator
+
+    response = TestClient(app).post(
+        "/places/recommend/stream",
+        json={"query": "quiet cafe", "latitude": ORIGIN[0], "longitude": ORIGIN[1]}
+    )
+    events = [json.loads(line) for line in response.text.splitlines()]
+
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert events[0]["event"] == "plan"
+    assert events[-1]["event"] == "final"
+    assert len(events[-1]["results"]) == 10
+    assert all("explanation" in p for p in events[-1]["results"])
+
+
+def test_update_is_sent_as_soon_as_its_round_is_routed():
+    orchestrator = make_rated_orchestrator()
+
+    async def two_rounds(shared, indices, user_preferences, k):
+        half = len(indices) // 2
+        await shared.enrich(indices[:half], orchestrator._enrich)
+        yield list(range(half)), False
+        await asyncio.sleep(0.3)
+        await shared.enrich(indices[half:], orchestrator._enrich)
+        yield list(range(len(indices))), True
+
+    orchestrator._routing_rounds = two_rounds
+
+    async def timed():
+        loop = asyncio.get_running_loop()
+        return [
+            (event["event"], loop.time())
+            async for event in orchestrator.astream_recommendations(
+                user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+            )
+        ]
+
+    events = dict(asyncio.run(timed()))
+
+    assert list(events) == ["plan", "provisional", "update", "final"]
+    assert events["final"] - events["update"] >= 0.25
@@ -0,0 +1,50 @@
+import time
+from datetime import timedelta
+
+import jwt
+import pytest
+from fastapi import HTTPException
+
+from backend.auth import security
+from backend.auth.security import create_access_token, get_user_id_from_token
+
+
+@pytest.fixture
+def decode_calls(monkeypatch):
+    calls = []
+    real_decode = jwt.decode
+
+    def counting_decode(*args, **kwargs):
+        calls.append(args[0])
+        return real_decode(*args, **kwargs)
+
+    monkeypatch.setattr(security.jwt, "decode", counting_decode)
+    security._token_cache.clear()
+    return calls
+
+
+def test_repeat_tokens_skip_decode(decode_calls):
+    token = create_access_token({"sub": "alice"})
+
+    assert get_user_id_from_token(token) == "alice"
+    assert get_user_id_from_token(token) == "alice"
+    assert len(decode_calls) == 1
+
+
+def test_expired_tokens_are_not_served_from_cache(decode_calls):
+    token = create_access_token({"sub": "alice"}, expires_delta=timedelta(seconds=1))
+    assert get_user_id_from_token(token) == "alice"
+
+    time.sleep(1.1)
+    with pytest.raises(HTTPException):
+        get_user_id_from_token(token)
+
+
+def test_invalid_tokens_are_never_cached(decode_calls):
+    token = create_access_token({"sub": "alice"}) + "tampered"
+
+    for _ in range(2):
+        with pytest.raises(HTTPException):
+            get_user_id_from_token(token)
+
+    assert len(decode_calls) == 2
@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from backend.tests.test_orchestrator_pipeline import ORIGIN, make_orchestrator
+from backend.utils.tracing import render_prometheus, span, trace
+
+
+def test_spans_feed_labelled_histograms():
+    with span("unit_stage", category="cafe") as s:
+        s.tag(cache_hit=True)
+
+    text = render_prometheus()
+
+    assert 'span="unit_stage",cache_hit="true",category="cafe",le="+Inf"' in text
+    assert 'tablescout_span_duration_seconds_count{span="unit_stage",cache_hit="true",category="cafe"}' in text
+
+
+def test_failed_span_is_tagged_with_error():
+    with trace() as current:
+        with pytest.raises(ValueError):
+            with span("unit_failing"):
+                raise ValueError("boom")
+
+    (name, labels, _), = current.spans
+    assert name == "unit_failing"
+    assert ("error", "ValueError") in labels
+
+
+def test_trace_collects_pipeline_stages_across_sync_bridge():
+    orchestrator = make_orchestrator(["cafe", "bar"])
+
+    with trace() as current:
+        orchestrator.get_recommendations(
+            user_query="quiet cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+        )
+
+    breakdown = current.breakdown()
+    for stage in ("intent", "plan", "search", "dedup", "spatial_filter",
+                  "crowd", "enrich", "score", "explain"):
+        assert stage in breakdown
+
+    header = current.server_timing()
+    assert "search;dur=" in header
+    assert 'enrich;dur=' in header
+
+
+def test_traces_do_not_leak_between_requests():
+    orchestrator = make_orchestrator(["cafe"])
+
+    async def one(query):
+        with trace() as current:
+            await orchestrator.aget_recommendations(
+                user_query=query, latitude=ORIGIN[0], longitude=ORIGIN[1], db=None
+            )
+        return current
+
+    async def run():
+        return await asyncio.gather(one("cafe a"), one("cafe b"))
+
+    first, second = asyncio.run(run())
+
+    assert first.breakdown()["search"][1] == 1
+    assert second.breakdown()["search"][1] == 1
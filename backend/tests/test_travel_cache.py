@@ -0,0 +1,196 @@
+import asyncio
+import os
+import threading
+import time
+
+os.environ.setdefault("MAPBOX_TOKEN", "test-token")
+
+from backend.mcp_servers import maps_mcp
+from backend.mcp_servers.base_mcp import MCPError
+from backend.mcp_servers.maps_mcp import MapboxMCP
+from backend.utils.cache import InMemoryTTLCache
+from backend.utils.singleflight import AsyncSingleFlight, SingleFlight
+
+ORIGIN = (28.6139, 77.2090)
+DESTINATIONS = [(28.6200, 77.2100), (28.6300, 77.2200)]
+
+
+def matrix_response(count):
+    return {
+        "durations": [[600.0 + 60 * i for i in range(count)]],
+        "distances": [[3000.0 + 100 * i for i in range(count)]]
+    }
+
+
+def make_mcp(monkeypatch, fail=False, delay=0.0):
+    mcp = MapboxMCP(
+        search_cache=InMemoryTTLCache(maxsize=16, ttl=60),
+        travel_cache=InMemoryTTLCache(maxsize=64, ttl=900)
+    )
+    calls = []
+
+    def fake_get_json(url, params=None):
+        calls.append((url, params))
+        time.sleep(delay)
+        if fail:
+            raise MCPError("upstream down")
+        if "directions-matrix" in url:
+            return matrix_response(url.count(";"))
+        return {"routes": [{"distance": 3000.0, "duration": 600.0}]}
+
+    async def fake_aget_json(url, params=None):
+        await asyncio.sleep(delay)
+        return fake_get_json(url, params)
+
+    monkeypatch.setattr(mcp, "_get_json", fake_get_json)
+    monkeypatch.setattr(mcp, "_aget_json", fake_aget_json)
+    return mcp, calls
+
+
+def test_nearby_origin_reuses_cached_pairs(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch)
+
+    first = mcp.get_travel_times(ORIGIN, DESTINATIONS)
+    # ~10 m away: same quantized origin
+    second = mcp.get_travel_times((28.61392, 77.20904), DESTINATIONS)
+
+    assert len(calls) == 1
+    assert first == second
+    assert first[0] == {"distance_km": 3.0, "travel_time": 10}
+
+
+def test_only_missing_pairs_are_fetched(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch)
+
+    mcp.get_travel_times(ORIGIN, DESTINATIONS[:1])
+    mcp.get_travel_times(ORIGIN, DESTINATIONS)
+
+    assert len(calls) == 2
+    assert calls[1][0].count(";") == 1
+
+
+def test_new_time_bucket_refetches(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch)
+    now = [1_000_000.0]
+    monkeypatch.setattr(maps_mcp.time, "time", lambda: now[0])
+
+    mcp.get_travel_times(ORIGIN, DESTINATIONS)
+    now[0] += mcp.TRAVEL_TIME_BUCKET_S
+    mcp.get_travel_times(ORIGIN, DESTINATIONS)
+
+    assert len(calls) == 2
+
+
+def test_degraded_estimates_are_not_cached(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch, fail=True)
+
+    mcp.get_travel_times(ORIGIN, DESTINATIONS)
+    mcp.get_travel_times(ORIGIN, DESTINATIONS)
+
+    assert len(calls) == 2
+
+
+def test_directions_request_skips_geometry(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch)
+
+    mcp.get_travel_time(*ORIGIN, *DESTINATIONS[0])
+    mcp.get_travel_time(*ORIGIN, *DESTINATIONS[0])
+
+    assert len(calls) == 1
+    assert "geometries" not in calls[0][1]
+    assert calls[0][1]["overview"] == "false"
+
+
+def test_concurrent_async_lookups_share_one_call(monkeypatch):
+    mcp, calls = make_mcp(monkeypatch, delay=0.05)
+
+    async def run():
+        return await asyncio.gather(
+            *(mcp.aget_travel_times(ORIGIN, DESTINATIONS) for _ in range(5))
+        )
+
+    results = asyncio.run(run())
+
+    assert len(calls) == 1
+    assert all(r == results[0] for r in results)
+
+
+def test_sync_singleflight_runs_once_for_concurrent_callers():
+    flight = SingleFlight("test")
+    started = threading.Event()
+    runs = []
+
+    def slow():
+        runs.append(1)
+        started.set()
+        time.sleep(0.1)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(flight.do("k", slow)))]
+    threads[0].start()
+    started.wait()
+    threads += [threading.Thread(target=lambda: results.append(flight.do("k", slow))) for _ in range(3)]
+    for t in threads[1:]:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert runs == [1]
+    assert results == ["value"] * 4
+    assert flight.stats.snapshot()["shared"] == 3
+
+
+def test_cancelled_leader_does_not_fail_followers():
+    flight = AsyncSingleFlight()
+    runs = []
+
+    async def slow():
+        runs.append(1)
+        await asyncio.sleep(0.05)
+        return "value"
+
+    async def run():
+        leader = asyncio.create_task(flight.do("k", slow))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(flight.do("k", slow)) for _ in range(3)]
+        await asyncio.sleep(0)
+
+        # e.g. the leader's client disconnected
+        leader.cancel()
+        results = await asyncio.gather(*followers)
+        return leader.cancelled(), results
+
+    leader_cancelled, results = asyncio.run(run())
+
+    assert leader_cancelled
+    assert results == ["value"] * 3
+    assert runs == [1]
+
+
+def test_fetch_is_cancelled_once_nobody_waits():
+    flight = AsyncSingleFlight()
+
+    async def run():
+        cancelled = asyncio.Event()
+
+        async def slow():
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                cancelled.set()
+                raise
+
+        callers = [asyncio.create_task(flight.do("k", slow)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for caller in callers:
+            caller.cancel()
+        await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+        # The abandoned fetch is not joined by later callers
+        async def fast():
+            return "fresh"
+
+        return await flight.do("k", fast)
+
+    assert asyncio.run(run()) == "fresh"
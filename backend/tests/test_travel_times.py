@@ -0,0 +1,68 @@
+from backend.mcp_servers.maps_mcp import MapboxMCP, LocalMapsMCP
+
+
+def test_get_travel_times_chunks_at_matrix_limit(monkeypatch):
+    mcp = MapboxMCP()
+    chunks = []
+
+    def fake_chunk(origin, destinations):
+        chunks.append(len(destinations))
+        return [{"distance_km": 1.0, "travel_time": i} for i, _ in enumerate(destinations)]
+
+    monkeypatch.setattr(mcp, "_get_matrix_chunk", fake_chunk)
+
+    destinations = [(28.6 + i * 0.001, 77.2) for i in range(20)]
+    results = mcp.get_travel_times(origin=(28.6, 77.2), destinations=destinations)
+
+    assert chunks == [9, 9, 2]
+    assert len(results) == 20
+
+
+def test_parse_matrix_handles_unroutable_destinations():
+    data = {
+        "durations": [[754.0, None]],
+        "distances": [[4210.0, None]]
+    }
+
+    results = MapboxMCP._parse_matrix(data, 2)
+
+    assert results[0] == {"distance_km": 4.21, "travel_time": 12}
+    assert results[1] == {"distance_km": None, "travel_time": None}
+
+
+def test_local_maps_matches_single_call():
+    local = LocalMapsMCP()
+    origin = (28.6139, 77.2090)
+    destinations = [(28.6200, 77.2100), (28.6500, 77.2300)]
+
+    batched = local.get_travel_times(origin, destinations)
+    single = [local.get_travel_time(*origin, lat, lng) for lat, lng in destinations]
+
+    assert batched == single
+    assert batched[0]["travel_time"] < batched[1]["travel_time"]
+
+
+def test_empty_or_malformed_directions_fall_back_to_local(monkeypatch):
+    mcp = MapboxMCP()
+    monkeypatch.setattr(mcp, "_access_token", lambda: "test")
+    origin = (12.9716, 77.5946)
+
+    for i, response in enumerate([{"routes": []}, {"routes": [{"distance": 900}]}, {"routes": None}]):
+        monkeypatch.setattr(mcp, "_get_json", lambda url, params, data=response: data)
+        destination = (12.98 + 0.001 * i, 77.6)
+
+        travel = mcp.get_travel_time(*origin, *destination)
+
+        assert travel == LocalMapsMCP().get_travel_time(*origin, *destination)
+
+
+def test_malformed_matrix_falls_back_to_local(monkeypatch):
+    mcp = MapboxMCP()
+    monkeypatch.setattr(mcp, "_access_token", lambda: "test")
+    monkeypatch.setattr(mcp, "_get_json", lambda url, params: {"durations": [None]})
+    origin = (12.9716, 77.5946)
+    destinations = [(12.99, 77.61), (13.0, 77.62)]
+
+    travel = mcp.get_travel_times(origin, destinations)
+
+    assert travel == LocalMapsMCP().get_travel_times(origin, destinations)
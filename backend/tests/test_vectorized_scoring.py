@@ -0,0 +1,76 @@
+import random
+
+from backend.agents.scoring_agent import ScoringAgent
+from backend.schemas.place import Place
+from backend.schemas.user_intent import UserIntent
+
+
+def make_intent(**preferences):
+    return UserIntent(
+        descriptors=[],
+        preferences=preferences,
+        place_types=["cafe"],
+        constraints=[],
+        time_of_day=None
+    )
+
+
+def random_places(n, seed=7):
+    rng = random.Random(seed)
+    return [
+        Place(
+            place_id=str(i),
+            rating=rng.choice([None, 0, 3, 4.5, rng.uniform(1, 5)]),
+            travel_time=rng.choice([None, 0, 5, 45, rng.randint(1, 60)]),
+            crowd_level=rng.choice([None, "low", "medium", "high"]),
+            category=rng.choice([None, "cafe", "bar", "bakery"])
+        )
+        for i in range(n)
+    ]
+
+
+def test_batch_scores_are_bit_identical():
+    agent = ScoringAgent()
+    intent = make_intent(food_quality=0.9, travel_tolerance=0.3, crowd_quietness=0.7)
+    prefs = {"place_type_affinity": {"cafe": 0.6, "bar": -0.2}}
+    places = random_places(2000)
+
+    for user_preferences in (None, prefs):
+        expected = [agent.score_place(p, intent, user_preferences) for p in places]
+        assert agent.score_places(places, intent, user_preferences) == expected
+
+
+def test_top_k_matches_stable_full_sort():
+    agent = ScoringAgent()
+    intent = make_intent()
+    places = random_places(500, seed=11)
+
+    full = agent.rank_places([p.copy() for p in places], intent)
+    for k in (1, 10, 37, 500, 600):
+        top = agent.rank_places([p.copy() for p in places], intent, top_k=k)
+        assert [p.place_id for p in top] == [p.place_id for p in full[:k]]
+
+
+def test_empty_input():
+    assert ScoringAgent().rank_places([], make_intent(), top_k=10) == []
+
+
+def test_upper_bounds_never_undercut_real_scores():
+    agent = ScoringAgent()
+    prefs = {"place_type_affinity": {"cafe": 0.6}}
+    places = random_places(1000, seed=3)
+
+    for tolerance in (0.1, 0.5, 1.4):
+        intent = make_intent(travel_tolerance=tolerance)
+        bounds = agent.upper_bounds(places, intent, user_preferences=prefs)
+        scores = agent.score_places(places, intent, user_preferences=prefs)
+        assert all(b >= s for b, s in zip(bounds, scores))
+
+
+def test_score_place_still_accepts_dicts():
+    agent = ScoringAgent()
+    intent = make_intent(food_quality=0.9, travel_tolerance=0.3)
+    prefs = {"place_type_affinity": {"cafe": 0.6}}
+    fields = {"place_id": "1", "rating": 4.5, "travel_time": 12, "crowd_level": "low", "category": "cafe"}
+
+    assert agent.score_place(fields, intent, prefs) == agent.score_place(Place(**fields), intent, prefs)
@@ -0,0 +1,70 @@
+import asyncio
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from backend.db import crud
+from backend.db.models import User, VisitedPlace
+from backend.schemas.place import Place
+from backend.schemas.visited import VisitedSet
+from backend.tests.test_orchestrator_pipeline import ORIGIN, make_orchestrator
+
+
+def make_session():
+    # One shared connection: lookups run in a worker thread
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    # preferences is JSONB (Postgres only); visits need just these two
+    User.__table__.create(engine)
+    VisitedPlace.__table__.create(engine)
+    crud._visited_cache.clear()
+    return sessionmaker(bind=engine)()
+
+
+def test_visits_are_idempotent_and_invalidate_the_set():
+    db = make_session()
+
+    assert len(crud.get_visited_set(db, "alice")) == 0
+
+    crud.add_visited_place(db, "alice", "cafe-1", "Cafe 1")
+    crud.add_visited_place(db, "alice", "cafe-1", "Cafe 1")
+    crud.add_visited_place(db, "bob", "bar-2")
+
+    visited = crud.get_visited_set(db, "alice")
+    assert visited.place_ids == {"cafe-1"}
+    assert db.query(VisitedPlace).count() == 2
+    # Cached until the next write
+    assert crud.get_visited_set(db, "alice") is visited
+
+
+def test_visited_set_matches_ids_and_legacy_names():
+    visited = VisitedSet(place_ids=frozenset({"cafe-1"})).with_names(["Old Haunt"])
+
+    assert Place(place_id="cafe-1", name="Renamed Cafe") in visited
+    assert Place(place_id="x", name="Old Haunt") in visited
+    assert Place(place_id="cafe-2", name="Cafe 2") not in visited
+
+
+def test_recorded_visits_are_filtered_from_recommendations():
+    db = make_session()
+    orchestrator = make_orchestrator(["cafe"])
+
+    async def no_preferences(db, user_id):
+        return None
+
+    orchestrator._load_preferences = no_preferences
+
+    crud.add_visited_place(db, "alice", "cafe-0", "Cafe 0")
+    before = asyncio.run(orchestrator.aget_recommendations(
+        user_query="cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=db, user_id="alice"
+    ))
+    crud.add_visited_place(db, "alice", "cafe-1", "Cafe 1")
+    after = asyncio.run(orchestrator.aget_recommendations(
+        user_query="cafe", latitude=ORIGIN[0], longitude=ORIGIN[1], db=db, user_id="alice"
+    ))
+
+    assert "cafe-0" not in [p["place_id"] for p in before["results"]]
+    assert "cafe-1" in [p["place_id"] for p in before["results"]]
+    assert {"cafe-0", "cafe-1"}.isdisjoint(p["place_id"] for p in after["results"])
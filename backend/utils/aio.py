@@ -0,0 +1,49 @@
+"""
+Helpers for running the async pipeline from sync call sites
+"""
+import asyncio
+import contextvars
+import threading
+from typing import Any, Coroutine, Optional, TypeVar
+
+T = TypeVar("T")
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def _background_loop() -> asyncio.AbstractEventLoop:
+    """
+    One long-lived event loop per process, running in a daemon thread.
+    Reusing it keeps pooled async clients alive between sync calls
+    (asyncio.run would build and tear down a loop every time).
+    """
+    global _loop
+
+    with _loop_lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=loop.run_forever,
+                name="sync-bridge-loop",
+                daemon=True
+            )
+            thread.start()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+    """
+    Block the calling thread until `coro` completes on the
+    background loop. Must not be called from that loop itself.
+    The caller's context variables (e.g. the request trace) carry over.
+    """
+    future = asyncio.run_coroutine_threadsafe(
+        _in_context(coro, contextvars.copy_context()), _background_loop()
+    )
+    return future.result(timeout)
+
+
+async def _in_context(coro: Coroutine[Any, Any, T], context: contextvars.Context) -> T:
+    return await asyncio.get_running_loop().create_task(coro, context=context)
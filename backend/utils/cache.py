@@ -0,0 +1,264 @@
+"""
+Small TTL + LRU caches with pluggable backends.
+
+InMemoryTTLCache is the per-process default. RedisCacheBackend shares
+entries across gunicorn workers when CACHE_BACKEND_URL is set
+(the `redis` package is only needed in that case). A shared backend
+that is down or returns unreadable entries behaves as an empty cache.
+"""
+import logging
+import os
+import pickle
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStats:
+    """
+    Hit/miss counters for one cache.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.errors = 0
+        self._lock = threading.Lock()
+
+    def record(self, field: str, count: int = 1):
+        with self._lock:
+            setattr(self, field, getattr(self, field) + count)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+                "sets": self.sets,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "errors": self.errors
+            }
+
+
+class CacheBackend:
+    """
+    Interface shared by all cache backends.
+    `ttl` is in seconds; None means the backend default.
+    """
+
+    def __init__(self):
+        self.stats = CacheStats()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        raise NotImplementedError
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        raise NotImplementedError
+
+    def delete(self, key: Hashable):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+
+class InMemoryTTLCache(CacheBackend):
+    """
+    Thread-safe LRU cache with per-entry expiry.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = 300.0):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None:
+                self.stats.record("misses")
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.stats.record("expirations")
+                self.stats.record("misses")
+                return default
+
+            self._data.move_to_end(key)
+            self.stats.record("hits")
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            self.stats.record("sets")
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.stats.record("evictions")
+
+    def delete(self, key: Hashable):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Shared cache backed by Redis. Values are pickled, keys are
+    stringified under `namespace`. LRU eviction is Redis' job
+    (maxmemory-policy allkeys-lru).
+
+    Never fails the caller: connection and (un)pickling errors are
+    logged (once per outage), counted, and read as misses; writes
+    are skipped.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        namespace: str,
+        ttl: Optional[float] = 300.0,
+        client: Any = None
+    ):
+        super().__init__()
+        try:
+            import redis
+        except ImportError as e:
+            if client is None:
+                raise RuntimeError("redis package is required for a shared cache backend") from e
+            redis = None
+
+        self.client = client if client is not None else redis.Redis.from_url(url)
+        self.namespace = namespace
+        self.ttl = ttl
+
+        # Unpickling a stale or truncated entry can raise almost anything
+        # from this list; OSError covers sockets below the client
+        self._errors = (
+            pickle.PickleError, EOFError, AttributeError, ImportError, TypeError, OSError
+        ) + ((redis.RedisError,) if redis is not None else ())
+        self._failing = False
+
+    def _key(self, key: Hashable) -> str:
+        return f"{self.namespace}:{key}"
+
+    def _failed(self, operation: str, error: Exception):
+        self.stats.record("errors")
+        if not self._failing:
+            self._failing = True
+            logger.warning(
+                "Shared cache %s: %s failed, treating as a miss: %r",
+                self.namespace, operation, error
+            )
+
+    def _recovered(self):
+        if self._failing:
+            self._failing = False
+            logger.info("Shared cache %s is reachable again", self.namespace)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        try:
+            raw = self.client.get(self._key(key))
+            value = pickle.loads(raw) if raw is not None else None
+        except self._errors as e:
+            self._failed("get", e)
+            self.stats.record("misses")
+            return default
+
+        self._recovered()
+        if raw is None:
+            self.stats.record("misses")
+            return default
+        self.stats.record("hits")
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        try:
+            self.client.set(
+                self._key(key),
+                pickle.dumps(value),
+                px=int(ttl * 1000) if ttl is not None else None
+            )
+        except self._errors as e:
+            self._failed("set", e)
+            return
+
+        self._recovered()
+        self.stats.record("sets")
+
+    def delete(self, key: Hashable):
+        try:
+            self.client.delete(self._key(key))
+        except self._errors as e:
+            self._failed("delete", e)
+
+    def clear(self):
+        try:
+            for key in self.client.scan_iter(f"{self.namespace}:*"):
+                self.client.delete(key)
+        except self._errors as e:
+            self._failed("clear", e)
+
+
+_registry: Dict[str, CacheBackend] = {}
+_registry_lock = threading.Lock()
+
+
+def make_cache(
+    name: str,
+    maxsize: int = 1024,
+    ttl: Optional[float] = 300.0,
+    shared: bool = True
+) -> CacheBackend:
+    """
+    Builds the cache called `name` and registers it for metrics.
+    CACHE_BACKEND_URL (e.g. redis://host:6379/0) switches every
+    `shared` cache to the shared backend; per-process caches
+    pass shared=False.
+    """
+    url = os.getenv("CACHE_BACKEND_URL")
+
+    if url and shared:
+        cache: CacheBackend = RedisCacheBackend(url, namespace=name, ttl=ttl)
+    else:
+        cache = InMemoryTTLCache(maxsize=maxsize, ttl=ttl)
+
+    with _registry_lock:
+        _registry[name] = cache
+
+    return cache
+
+
+def get_cache_stats() -> Dict[str, Dict]:
+    """
+    Hit/miss counters for every cache built through make_cache.
+    """
+    with _registry_lock:
+        caches = dict(_registry)
+    return {name: cache.stats.snapshot() for name, cache in caches.items()}
@@ -0,0 +1,85 @@
+"""
+Geo helpers shared by MCPs and agents
+"""
+import math
+from typing import Sequence
+
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+
+_GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Great-circle distance between two points in kilometres.
+    """
+    lat1, lng1, lat2, lng2 = map(math.radians, (lat1, lng1, lat2, lng2))
+    a = (
+        math.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * math.cos(lat2) * math.sin((lng2 - lng1) / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * math.asin(math.sqrt(a))
+
+
+def haversine_km_many(
+    lat: float,
+    lng: float,
+    lats: Sequence[float],
+    lngs: Sequence[float]
+) -> np.ndarray:
+    """
+    Vectorized haversine_km from one point to many.
+    """
+    lat1, lng1 = math.radians(lat), math.radians(lng)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    lng2 = np.radians(np.asarray(lngs, dtype=np.float64))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + math.cos(lat1) * np.cos(lat2) * np.sin((lng2 - lng1) / 2) ** 2
+    )
+    return EARTH_RADIUS_KM * 2 * np.arcsin(np.sqrt(a))
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 6) -> str:
+    """
+    Standard base-32 geohash of a point.
+    Precision 6 is a ~1.2 km x 0.6 km tile, precision 7 ~150 m.
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_range[0] + lng_range[1]) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_range[0] = mid
+            else:
+                bits <<= 1
+                lng_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+
+        even = not even
+        bit_count += 1
+
+        if bit_count == 5:
+            chars.append(_GEOHASH_ALPHABET[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
@@ -0,0 +1,61 @@
+"""
+Lazily constructed process-wide clients.
+
+Heavy SDK clients (Gemini, DB engine, ...) are registered here and only
+built on first use, or eagerly from the app's startup hook. Importing a
+module never needs credentials or pulls in an SDK.
+"""
+import threading
+from typing import Callable, Dict, Generic, Iterable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class LazyProvider(Generic[T]):
+    """
+    Thread-safe build-once holder. A failed build is not cached,
+    so a later call can succeed once configuration is fixed.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._instance: Optional[T] = None
+        self._lock = threading.Lock()
+
+    @property
+    def initialized(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is None:
+            with self._lock:
+                if self._instance is None:
+                    self._instance = self._factory()
+                instance = self._instance
+        return instance
+
+    def reset(self):
+        with self._lock:
+            self._instance = None
+
+
+_providers: Dict[str, LazyProvider] = {}
+
+
+def provider(name: str, factory: Callable[[], T]) -> LazyProvider[T]:
+    """
+    Registers (or returns the already registered) provider `name`.
+    """
+    if name not in _providers:
+        _providers[name] = LazyProvider(name, factory)
+    return _providers[name]
+
+
+def warm_up(names: Optional[Iterable[str]] = None):
+    """
+    Builds the given providers (all registered ones by default).
+    """
+    for name in (names if names is not None else list(_providers)):
+        _providers[name].get()
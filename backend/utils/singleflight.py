@@ -0,0 +1,248 @@
+"""
+Request coalescing ("single-flight").
+
+Concurrent calls for the same key share one execution: the first
+caller (the leader) runs the work, everyone else waits for its result
+or its exception. Nothing is cached once the call finishes; pair it
+with a cache for that.
+
+do_many() coalesces per key but lets the leader fetch all of its keys
+in one batch (e.g. one matrix request for several destinations).
+The async variant runs that fetch as a detached task, so cancelling
+the leader does not fail the callers that joined it.
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+
+KeysFetch = Callable[[List[Hashable]], List[Any]]
+AsyncKeysFetch = Callable[[List[Hashable]], Awaitable[List[Any]]]
+
+
+class FlightStats:
+    """
+    Calls that ran upstream (led) vs. joined one already running (shared).
+    """
+
+    def __init__(self):
+        self.led = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+
+    def record(self, led: int, shared: int):
+        with self._lock:
+            self.led += led
+            self.shared += shared
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            total = self.led + self.shared
+            return {
+                "led": self.led,
+                "shared": self.shared,
+                "shared_rate": round(self.shared / total, 3) if total else None
+            }
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Thread-based single-flight for sync callers.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.stats = FlightStats()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+        _register(self)
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        return self.do_many([key], lambda keys: [fn()])[0]
+
+    def do_many(self, keys: List[Hashable], fetch: KeysFetch) -> List[Any]:
+        """
+        Values for `keys`; `fetch` is called once with the keys
+        nobody else is already fetching and must return values
+        aligned with them.
+        """
+        calls: Dict[Hashable, _Call] = {}
+        owned: List[Hashable] = []
+
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    owned.append(key)
+                calls[key] = call
+
+        self.stats.record(led=len(owned), shared=len(calls) - len(owned))
+
+        if owned:
+            try:
+                for key, value in zip(owned, fetch(owned)):
+                    calls[key].value = value
+            except BaseException as e:
+                for key in owned:
+                    calls[key].error = e
+            finally:
+                with self._lock:
+                    for key in owned:
+                        self._calls.pop(key, None)
+                for key in owned:
+                    calls[key].done.set()
+
+        results = []
+        for key in keys:
+            call = calls[key]
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            results.append(call.value)
+        return results
+
+
+class _Build:
+    """
+    One detached fetch shared by every caller waiting on its keys.
+    """
+    __slots__ = ("keys", "task", "waiters")
+
+    def __init__(self, keys: List[Hashable]):
+        self.keys = keys
+        self.task: Optional[asyncio.Task] = None
+        self.waiters = 0
+
+
+class AsyncSingleFlight:
+    """
+    asyncio single-flight. In-flight calls are tracked per event
+    loop, since futures cannot be awaited across loops.
+
+    The fetch runs in its own task, not in the leader: a caller that
+    is cancelled (e.g. its client disconnected) just stops waiting,
+    and the fetch is cancelled only once nobody is waiting on it.
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name
+        self.stats = FlightStats()
+        self._calls: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict]" = (
+            weakref.WeakKeyDictionary()
+        )
+        _register(self)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        async def fetch(keys):
+            return [await fn()]
+
+        return (await self.do_many([key], fetch))[0]
+
+    async def do_many(self, keys: List[Hashable], fetch: AsyncKeysFetch) -> List[Any]:
+        loop = asyncio.get_running_loop()
+        in_flight = self._calls.setdefault(loop, {})
+
+        futures: Dict[Hashable, asyncio.Future] = {}
+        builds: Dict[int, _Build] = {}
+        owned: List[Hashable] = []
+
+        # No await between lookup and registration, so this is atomic
+        for key in dict.fromkeys(keys):
+            entry = in_flight.get(key)
+            if entry is None:
+                owned.append(key)
+                continue
+            futures[key], build = entry
+            builds[id(build)] = build
+
+        self.stats.record(led=len(owned), shared=len(futures))
+
+        if owned:
+            build = _Build(owned)
+            for key in owned:
+                futures[key] = loop.create_future()
+                in_flight[key] = (futures[key], build)
+            build.task = loop.create_task(self._run(build, fetch, futures, in_flight))
+            builds[id(build)] = build
+
+        for build in builds.values():
+            build.waiters += 1
+
+        try:
+            # shield: cancelling a caller must not cancel the shared future
+            results = [await asyncio.shield(futures[key]) for key in keys]
+        except BaseException:
+            for build in builds.values():
+                build.waiters -= 1
+                if build.waiters == 0 and not build.task.done():
+                    self._abandon(build, in_flight)
+            raise
+
+        for build in builds.values():
+            build.waiters -= 1
+        return results
+
+    @staticmethod
+    async def _run(
+        build: _Build,
+        fetch: AsyncKeysFetch,
+        futures: Dict[Hashable, asyncio.Future],
+        in_flight: Dict
+    ):
+        try:
+            for key, value in zip(build.keys, await fetch(build.keys)):
+                futures[key].set_result(value)
+        except asyncio.CancelledError:
+            for key in build.keys:
+                futures[key].cancel()
+            raise
+        except Exception as e:
+            for key in build.keys:
+                if not futures[key].done():
+                    futures[key].set_exception(e)
+        finally:
+            AsyncSingleFlight._release(build, in_flight)
+
+    @staticmethod
+    def _abandon(build: _Build, in_flight: Dict):
+        # Later callers start a fresh fetch instead of joining this one
+        AsyncSingleFlight._release(build, in_flight)
+        build.task.cancel()
+
+    @staticmethod
+    def _release(build: _Build, in_flight: Dict):
+        for key in build.keys:
+            entry = in_flight.get(key)
+            if entry is not None and entry[1] is build:
+                del in_flight[key]
+
+
+_registry: Dict[str, Any] = {}
+_registry_lock = threading.Lock()
+
+
+def _register(flight):
+    # Unnamed flights (e.g. per-object ones) stay out of metrics
+    if flight.name is None:
+        return
+    with _registry_lock:
+        _registry[flight.name] = flight
+
+
+def get_singleflight_stats() -> Dict[str, Dict]:
+    """
+    Led/shared counters for every single-flight group.
+    """
+    with _registry_lock:
+        flights = dict(_registry)
+    return {name: flight.stats.snapshot() for name, flight in flights.items()}
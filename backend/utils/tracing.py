@@ -0,0 +1,174 @@
+"""
+Lightweight tracing: timed spans, per-span latency histograms and an
+optional per-request breakdown.
+
+    with span("search", category="cafe") as s:
+        ...
+        s.tag(cache_hit=True)
+
+Every finished span feeds a histogram labelled by its name and tags
+(keep tags low-cardinality: categories, upstream hosts, flags).
+Inside a request started with trace(), spans are also collected so
+the breakdown can be sent back as a Server-Timing header.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Tuple
+
+# Seconds; Prometheus-style cumulative buckets plus +Inf
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class Histogram:
+
+    def __init__(self, buckets: Tuple[float, ...] = BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.counts[i] += 1
+                    break
+            else:
+                self.counts[-1] += 1
+            self.sum += value
+            self.count += 1
+
+    def cumulative(self) -> Tuple[List[int], float, int]:
+        with self._lock:
+            total, running = [], 0
+            for c in self.counts:
+                running += c
+                total.append(running)
+            return total, self.sum, self.count
+
+
+class Trace:
+    """
+    Spans finished while this trace was current.
+    """
+
+    def __init__(self):
+        self.spans: List[Tuple[str, Labels, float]] = []
+        self._lock = threading.Lock()
+
+    def add(self, name: str, labels: Labels, duration_s: float):
+        with self._lock:
+            self.spans.append((name, labels, duration_s))
+
+    def breakdown(self) -> Dict[str, Tuple[float, int]]:
+        """
+        Total seconds and count per span name.
+        """
+        totals: Dict[str, Tuple[float, int]] = {}
+        with self._lock:
+            for name, _, duration in self.spans:
+                spent, count = totals.get(name, (0.0, 0))
+                totals[name] = (spent + duration, count + 1)
+        return totals
+
+    def server_timing(self) -> str:
+        parts = []
+        for name, (spent, count) in self.breakdown().items():
+            part = f"{name};dur={spent * 1000:.1f}"
+            if count > 1:
+                part += f';desc="x{count}"'
+            parts.append(part)
+        return ", ".join(parts)
+
+
+_current: ContextVar[Optional[Trace]] = ContextVar("trace", default=None)
+
+_histograms: Dict[Tuple[str, Labels], Histogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def _histogram(name: str, labels: Labels) -> Histogram:
+    key = (name, labels)
+    histogram = _histograms.get(key)
+    if histogram is None:
+        with _histograms_lock:
+            histogram = _histograms.setdefault(key, Histogram())
+    return histogram
+
+
+class Span:
+
+    __slots__ = ("name", "tags", "started")
+
+    def __init__(self, name: str, tags: Dict):
+        self.name = name
+        self.tags = tags
+        self.started = 0.0
+
+    def tag(self, **tags):
+        self.tags.update(tags)
+
+    def __enter__(self) -> "Span":
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = time.perf_counter() - self.started
+        if exc_type is not None:
+            self.tags.setdefault("error", exc_type.__name__)
+
+        labels = tuple(sorted((k, str(v).lower() if isinstance(v, bool) else str(v))
+                              for k, v in self.tags.items()))
+        _histogram(self.name, labels).observe(duration)
+
+        current = _current.get()
+        if current is not None:
+            current.add(self.name, labels, duration)
+        return False
+
+
+def span(name: str, **tags) -> Span:
+    return Span(name, tags)
+
+
+@contextmanager
+def trace() -> Iterator[Trace]:
+    """
+    Collect spans for the current request (and tasks it spawns).
+    """
+    current = Trace()
+    token = _current.set(current)
+    try:
+        yield current
+    finally:
+        _current.reset(token)
+
+
+def render_prometheus(prefix: str = "tablescout_span") -> str:
+    """
+    All span histograms in the Prometheus text exposition format.
+    """
+    with _histograms_lock:
+        items = sorted(_histograms.items())
+
+    lines = [
+        f"# HELP {prefix}_duration_seconds Duration of traced spans",
+        f"# TYPE {prefix}_duration_seconds histogram"
+    ]
+
+    for (name, labels), histogram in items:
+        label_text = ",".join([f'span="{name}"', *(f'{k}="{v}"' for k, v in labels)])
+        cumulative, total, count = histogram.cumulative()
+
+        for bound, value in zip(histogram.buckets, cumulative):
+            lines.append(f'{prefix}_duration_seconds_bucket{{{label_text},le="{bound}"}} {value}')
+        lines.append(f'{prefix}_duration_seconds_bucket{{{label_text},le="+Inf"}} {cumulative[-1]}')
+        lines.append(f"{prefix}_duration_seconds_sum{{{label_text}}} {total}")
+        lines.append(f"{prefix}_duration_seconds_count{{{label_text}}} {count}")
+
+    return "\n".join(lines) + "\n"